@@ -0,0 +1,72 @@
+"""index overhaul for the real query shapes
+
+Revision ID: 14fd8a4965ad
+Revises: 38ddbadc49a5
+Create Date: 2026-10-19 15:42:08.310274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '14fd8a4965ad'
+down_revision: Union[str, None] = '38ddbadc49a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Índices sobre id que duplican el índice de la primary key
+REDUNDANT_ID_INDEXES = (
+    ('ix_courses_id', 'courses'),
+    ('ix_teachers_id', 'teachers'),
+    ('ix_lessons_id', 'lessons'),
+    ('ix_course_ratings_id', 'course_ratings'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema - Drop PK-duplicate indexes, add partial indexes for active rows."""
+
+    for index_name, table_name in REDUNDANT_ID_INDEXES:
+        op.drop_index(index_name, table_name=table_name)
+
+    # Stats de un curso (avg, count, distribución): index-only scan sin tocar el heap
+    op.create_index(
+        'ix_course_ratings_course_active',
+        'course_ratings',
+        ['course_id'],
+        unique=False,
+        postgresql_include=['rating'],
+        postgresql_where=sa.text('deleted_at IS NULL')
+    )
+
+    # GET /courses/{slug}: búsqueda de cursos activos
+    op.create_index(
+        'ix_courses_slug_active',
+        'courses',
+        ['slug'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL')
+    )
+
+    # Lecciones activas de un curso (join del detalle), en orden de id
+    op.create_index(
+        'ix_lessons_course_active',
+        'lessons',
+        ['course_id', 'id'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - Restore id indexes, drop partial indexes."""
+
+    op.drop_index('ix_lessons_course_active', table_name='lessons')
+    op.drop_index('ix_courses_slug_active', table_name='courses')
+    op.drop_index('ix_course_ratings_course_active', table_name='course_ratings')
+
+    for index_name, table_name in REDUNDANT_ID_INDEXES:
+        op.create_index(index_name, table_name, ['id'], unique=False)
@@ -0,0 +1,37 @@
+"""add active (user_id, course_id) index on course_ratings
+
+Revision ID: 38ddbadc49a5
+Revises: 3b26a4a891cc
+Create Date: 2026-10-19 12:03:26.551870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '38ddbadc49a5'
+down_revision: Union[str, None] = '3b26a4a891cc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Partial composite index for per-user rating lookups."""
+
+    # GET /users/{user_id}/ratings: ratings activos de un usuario ordenados por curso
+    op.create_index(
+        'ix_course_ratings_user_course_active',
+        'course_ratings',
+        ['user_id', 'course_id'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - Drop per-user rating lookup index."""
+
+    op.drop_index('ix_course_ratings_user_course_active', table_name='course_ratings')
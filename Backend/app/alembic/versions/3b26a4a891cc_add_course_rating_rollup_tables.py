@@ -0,0 +1,48 @@
+"""add course rating rollup tables
+
+Revision ID: 3b26a4a891cc
+Revises: b28302467026
+Create Date: 2026-10-19 10:47:05.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b26a4a891cc'
+down_revision: Union[str, None] = 'b28302467026'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ROLLUP_TABLES = ('course_rating_rollups_hourly', 'course_rating_rollups_daily')
+
+
+def upgrade() -> None:
+    """Upgrade schema - Create hourly and daily rating rollup tables.
+
+    After upgrading, load the history with:
+        python -m app.db.backfill rollups
+    """
+
+    for table_name in ROLLUP_TABLES:
+        op.create_table(
+            table_name,
+            sa.Column('course_id', sa.Integer(), nullable=False),
+            sa.Column('bucket_start', sa.DateTime(), nullable=False),
+            sa.Column('submitted_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('submitted_sum', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('removed_count', sa.Integer(), nullable=False, server_default='0'),
+            # La PK (course_id, bucket_start) sirve las consultas de tendencia por rango
+            sa.PrimaryKeyConstraint('course_id', 'bucket_start')
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema - Drop rating rollup tables."""
+
+    for table_name in reversed(ROLLUP_TABLES):
+        op.drop_table(table_name)
@@ -0,0 +1,38 @@
+"""add active (course_id, created_at, id) index for paginated rating listing
+
+Revision ID: 5c1f0e9b7d42
+Revises: 14fd8a4965ad
+Create Date: 2026-10-19 19:12:44.107391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1f0e9b7d42'
+down_revision: Union[str, None] = '14fd8a4965ad'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Partial composite index for keyset pages of a course's ratings."""
+
+    # GET /courses/{course_id}/ratings: (created_at DESC, id DESC) con cursor,
+    # recorriendo el índice hacia atrás
+    op.create_index(
+        'ix_course_ratings_course_created_active',
+        'course_ratings',
+        ['course_id', 'created_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - Drop keyset index for course rating pages."""
+
+    op.drop_index('ix_course_ratings_course_created_active', table_name='course_ratings')
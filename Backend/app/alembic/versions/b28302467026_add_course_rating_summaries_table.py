@@ -0,0 +1,61 @@
+"""add course_rating_summaries table
+
+Revision ID: b28302467026
+Revises: 0e3a8766f785
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b28302467026'
+down_revision: Union[str, None] = '0e3a8766f785'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Create course_rating_summaries table.
+
+    After upgrading, populate the table with:
+        python -m app.db.backfill summaries
+    """
+
+    op.create_table(
+        'course_rating_summaries',
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('total_ratings', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_1_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_2_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_3_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_4_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_5_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('bayesian_score', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('course_id'),
+        sa.ForeignKeyConstraint(
+            ['course_id'],
+            ['courses.id'],
+            name='fk_course_rating_summaries_course_id'
+        )
+    )
+
+    # Índice del leaderboard: lectura por rango ordenada por score
+    op.create_index(
+        'ix_course_rating_summaries_score',
+        'course_rating_summaries',
+        [sa.text('bayesian_score DESC'), 'course_id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - Drop course_rating_summaries table."""
+
+    op.drop_index('ix_course_rating_summaries_score', table_name='course_rating_summaries')
+    op.drop_table('course_rating_summaries')
@@ -0,0 +1,33 @@
+"""
+Access control for the operational /admin endpoints.
+
+They expose SQL text, query plans and pool/cache internals, so they only
+answer requests carrying `Authorization: Bearer <admin_token>`; without
+an admin_token in settings they are disabled (404). Every answer is the
+state of the worker process that served it, named in X-Worker-Pid.
+"""
+import os
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException, Response, status
+
+from app.core.config import settings
+
+
+def require_admin(response: Response, authorization: Optional[str] = Header(None)) -> None:
+    """Dependency of the admin router: check the bearer token and tag the worker."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    response.headers["X-Worker-Pid"] = str(os.getpid())
@@ -0,0 +1,750 @@
+"""
+Two-tier cache for CourseService reads.
+
+- L1: per-process LRU holding the Python values (no serialization). Each
+  uvicorn worker has its own.
+- L2: optional shared backend (CacheBackend protocol, e.g. RedisCache)
+  holding msgpack-encoded bytes, so a value loaded by one worker is a hit
+  for the others.
+
+Lookups go L1 -> L2 -> loader; an L2 hit refills L1. Keys are versioned
+("{prefix}:v{version}:{namespace}:{key}"): bumping cache_key_version when
+the shape of cached values changes orphans every old entry at once. TTLs
+are per namespace. L2 failures count as misses, so an unavailable backend
+never fails a request.
+
+Misses are coalesced per key (single-flight): when many callers miss the
+same key at once, one of them runs the loader and the rest wait for its
+result (or exception) instead of repeating the query. SingleFlight covers
+the threadpool path, AsyncSingleFlight the event loop.
+
+Namespaces with a stale TTL use stale-while-revalidate: the TTL is soft,
+and until TTL + stale TTL (hard expiry) an expired value is still served
+at once while a background refresh recomputes it (one per key). Past the
+hard expiry callers block on the load. L2 stores [fresh_until, value] so
+every worker agrees on when a value went stale.
+
+After a write, invalidated and evicted entries are refilled from the
+primary for primary_window seconds (read_your_writes_window): a replica
+still replaying the write would otherwise put the old value back for a
+whole TTL.
+
+Cached values are shared between callers and must be treated as
+read-only.
+"""
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Set, Tuple, TypeVar
+
+import msgpack
+
+from app.core.config import Settings, settings
+from app.core.redis_cache import RedisCache
+from app.db.routing import primary_reads
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+MISSING = object()
+
+
+class CacheBackend(Protocol):
+    """Shared (L2) cache storing bytes under string keys."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    def delete(self, *keys: str) -> None:
+        ...
+
+
+class LocalCache:
+    """Thread-safe in-process LRU with per-entry soft and hard expiry."""
+
+    def __init__(self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # clave -> (stale_at, expires_at, valor)
+        self._entries: "OrderedDict[str, Tuple[float, float, Any]]" = OrderedDict()
+
+    def lookup(self, key: str) -> Tuple[Any, bool]:
+        """
+        (value, fresh). value is MISSING when absent or past the hard
+        expiry; fresh is False once the soft TTL has elapsed.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING, False
+            stale_at, expires_at, value = entry
+            now = self._clock()
+            if expires_at <= now:
+                del self._entries[key]
+                return MISSING, False
+            self._entries.move_to_end(key)
+            return value, now < stale_at
+
+    def get(self, key: str) -> Any:
+        """Cached value (fresh or stale), or MISSING when absent or expired."""
+        return self.lookup(key)[0]
+
+    def set(self, key: str, value: Any, ttl: float, stale_ttl: float = 0.0) -> None:
+        with self._lock:
+            now = self._clock()
+            self._entries[key] = (now + ttl, now + ttl + stale_ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CacheStats:
+    """Thread-safe hits, misses, errors and lookup latency per tier."""
+
+    TIERS = ("l1", "l2")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.tiers: Dict[str, Dict[str, float]] = {
+                tier: {"hits": 0, "misses": 0, "errors": 0, "latency_ms": 0.0, "max_latency_ms": 0.0}
+                for tier in self.TIERS
+            }
+            self.loads = 0
+            self.coalesced = 0
+            self.stale_served = 0
+            self.refreshes = 0
+            self.refresh_errors = 0
+            self.refresh_latency_ms = 0.0
+            self.last_refresh_error: Optional[str] = None
+
+    def record(self, tier: str, hit: bool, latency_ms: float, error: bool = False) -> None:
+        with self._lock:
+            counters = self.tiers[tier]
+            counters["hits" if hit else "misses"] += 1
+            if error:
+                counters["errors"] += 1
+            counters["latency_ms"] += latency_ms
+            counters["max_latency_ms"] = max(counters["max_latency_ms"], latency_ms)
+
+    def record_load(self) -> None:
+        with self._lock:
+            self.loads += 1
+
+    def record_coalesced(self) -> None:
+        with self._lock:
+            self.coalesced += 1
+
+    def record_stale(self) -> None:
+        with self._lock:
+            self.stale_served += 1
+
+    def record_refresh(self, latency_ms: float, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.refreshes += 1
+            self.refresh_latency_ms += latency_ms
+            if error is not None:
+                self.refresh_errors += 1
+                self.last_refresh_error = error
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            result: Dict[str, Any] = {
+                "loads": self.loads,
+                "coalesced": self.coalesced,
+                "stale_served": self.stale_served,
+                "refresh": {
+                    "completed": self.refreshes - self.refresh_errors,
+                    "errors": self.refresh_errors,
+                    "avg_latency_ms": (
+                        round(self.refresh_latency_ms / self.refreshes, 3) if self.refreshes else 0.0
+                    ),
+                    "last_error": self.last_refresh_error,
+                },
+            }
+            for tier, counters in self.tiers.items():
+                lookups = counters["hits"] + counters["misses"]
+                result[tier] = {
+                    "hits": counters["hits"],
+                    "misses": counters["misses"],
+                    "errors": counters["errors"],
+                    "hit_ratio": round(counters["hits"] / lookups, 3) if lookups else 0.0,
+                    "avg_latency_ms": round(counters["latency_ms"] / lookups, 3) if lookups else 0.0,
+                    "max_latency_ms": round(counters["max_latency_ms"], 3),
+                }
+            return result
+
+
+class _Call:
+    """One in-flight load: followers wait on done."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Thread-safe call coalescing: concurrent do() calls with the same key
+    run fn once; the callers that arrive while it runs get its result or
+    re-raise its exception.
+    """
+
+    def __init__(self, on_coalesced: Optional[Callable[[], None]] = None):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._on_coalesced = on_coalesced
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if self._on_coalesced is not None:
+                self._on_coalesced()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            # Quitar antes de avisar: quien llegue después ya no espera un vuelo terminado
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines on one event loop. Followers are shielded
+    from each other: cancelling a waiting caller does not cancel the load,
+    and if the leader is cancelled the next waiter retries the load itself.
+    """
+
+    def __init__(self, on_coalesced: Optional[Callable[[], None]] = None):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self._on_coalesced = on_coalesced
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            if self._on_coalesced is not None:
+                self._on_coalesced()
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # Cancelaron al líder (cliente desconectado), no a nosotros: reintentar
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Marcar como recuperada aunque no haya seguidores esperando
+            future.exception()
+            raise
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        future.set_result(result)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+def encode_value(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def decode_value(raw: bytes) -> Any:
+    # strict_map_key=False: admite claves int (p. ej. rating_distribution)
+    return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+class TwoTierCache:
+    """
+    L1 (LocalCache) in front of an optional shared L2 (CacheBackend).
+
+    ttls maps namespace -> seconds a value stays fresh; namespaces without
+    an entry use default_ttl. stale_ttls maps namespace -> seconds an
+    expired value may still be served while it is refreshed (none by
+    default). refresh_workers bounds the threads running sync refreshes.
+
+    Entries invalidated or evicted after a write are refilled from the
+    primary for primary_window seconds (see needs_primary), so a replica
+    that has not replayed the write yet cannot put the old value back.
+    """
+
+    def __init__(
+        self,
+        l1: LocalCache,
+        l2: Optional[CacheBackend] = None,
+        version: str = "1",
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 60.0,
+        prefix: str = "platziflix",
+        stats: Optional[CacheStats] = None,
+        stale_ttls: Optional[Dict[str, float]] = None,
+        refresh_workers: int = 2,
+        wall_clock: Callable[[], float] = time.time,
+        primary_window: float = 0.0
+    ):
+        self.l1 = l1
+        self.l2 = l2
+        self.version = version
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        self.stats = stats if stats is not None else CacheStats()
+        self.stale_ttls = stale_ttls or {}
+        self.refresh_workers = refresh_workers
+        # Reloj de pared: fresco_hasta en L2 debe valer para todos los workers
+        self._wall_clock = wall_clock
+        self.flights = SingleFlight(self.stats.record_coalesced)
+        self.async_flights = AsyncSingleFlight(self.stats.record_coalesced)
+        self._refresh_lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self.primary_window = primary_window
+        self._invalidated_lock = threading.Lock()
+        # clave completa / prefijo de namespace ("" = todo) -> leer del primario hasta
+        self._invalidated_keys: Dict[str, float] = {}
+        self._invalidated_prefixes: Dict[str, float] = {}
+
+    def key(self, namespace: str, key: Any) -> str:
+        return f"{self.prefix}:v{self.version}:{namespace}:{key}"
+
+    def ttl(self, namespace: str) -> float:
+        return self.ttls.get(namespace, self.default_ttl)
+
+    def stale_ttl(self, namespace: str) -> float:
+        return self.stale_ttls.get(namespace, 0.0)
+
+    def get(self, namespace: str, key: Any) -> Any:
+        """Cached value (fresh or stale) from L1 or L2, or MISSING."""
+        return self._lookup(namespace, self.key(namespace, key))[0]
+
+    def _lookup(self, namespace: str, full_key: str) -> Tuple[Any, bool]:
+        value, fresh = self._get_l1(full_key)
+        if value is not MISSING or self.l2 is None:
+            return value, fresh
+        return self._get_l2(namespace, full_key)
+
+    def _get_l1(self, full_key: str) -> Tuple[Any, bool]:
+        start = time.perf_counter()
+        value, fresh = self.l1.lookup(full_key)
+        self.stats.record("l1", value is not MISSING, (time.perf_counter() - start) * 1000)
+        return value, fresh
+
+    def _get_l2(self, namespace: str, full_key: str) -> Tuple[Any, bool]:
+        start = time.perf_counter()
+        try:
+            raw = self.l2.get(full_key)
+        except Exception:
+            self.stats.record("l2", False, (time.perf_counter() - start) * 1000, error=True)
+            return MISSING, False
+        self.stats.record("l2", raw is not None, (time.perf_counter() - start) * 1000)
+        if raw is None:
+            return MISSING, False
+
+        fresh_until, value = decode_value(raw)
+        fresh_for = fresh_until - self._wall_clock()
+        stale_ttl = self.stale_ttl(namespace)
+        if fresh_for + stale_ttl <= 0:
+            return MISSING, False
+        # Rellenar L1 con lo que le queda al valor, no con un TTL completo
+        self.l1.set(full_key, value, max(fresh_for, 0.0), stale_ttl + min(fresh_for, 0.0))
+        return value, fresh_for > 0
+
+    def set(self, namespace: str, key: Any, value: Any) -> None:
+        self.l1.set(self.key(namespace, key), value, self.ttl(namespace), self.stale_ttl(namespace))
+        self._set_l2(namespace, key, value)
+
+    def _set_l2(self, namespace: str, key: Any, value: Any) -> None:
+        if self.l2 is not None:
+            ttl = self.ttl(namespace)
+            try:
+                self.l2.set(
+                    self.key(namespace, key),
+                    encode_value([self._wall_clock() + ttl, value]),
+                    ttl + self.stale_ttl(namespace)
+                )
+            except Exception:
+                # Errores de L2 ya se cuentan en las lecturas; L1 sigue sirviendo
+                pass
+
+    def get_or_load(
+        self,
+        namespace: str,
+        key: Any,
+        loader: Callable[[], T],
+        refresh: Optional[Callable[[], T]] = None
+    ) -> T:
+        """
+        Cached value, or loader() stored in both tiers.
+        Concurrent misses of one key share a single loader() call. None
+        results and exceptions are not cached.
+
+        refresh recomputes the value outside the caller's request; when
+        given, a stale value is returned at once and refresh() runs in a
+        background thread. Without it stale values count as misses.
+        """
+        full_key = self.key(namespace, key)
+        value, fresh = self._lookup(namespace, full_key)
+        if value is not MISSING:
+            if fresh:
+                return value
+            if refresh is not None:
+                self.stats.record_stale()
+                self._schedule_refresh(namespace, key, refresh)
+                return value
+
+        def load() -> T:
+            # Otro líder pudo terminar entre nuestro miss y tomar el vuelo
+            value, fresh = self.l1.lookup(full_key)
+            if fresh:
+                return value
+            self.stats.record_load()
+            value = loader()
+            if value is not None:
+                self.set(namespace, key, value)
+            return value
+
+        return self.flights.do(full_key, load)
+
+    async def aget_or_load(
+        self,
+        namespace: str,
+        key: Any,
+        loader: Callable[[], Awaitable[T]],
+        refresh: Optional[Callable[[], Awaitable[T]]] = None
+    ) -> T:
+        """
+        get_or_load for the event loop: loader and refresh are coroutine
+        functions (refresh runs as a background task) and L2 round trips
+        run in a worker thread.
+        """
+        full_key = self.key(namespace, key)
+        value, fresh = self._get_l1(full_key)
+        if value is MISSING and self.l2 is not None:
+            value, fresh = await asyncio.to_thread(self._get_l2, namespace, full_key)
+        if value is not MISSING:
+            if fresh:
+                return value
+            if refresh is not None:
+                self.stats.record_stale()
+                self._schedule_async_refresh(namespace, key, refresh)
+                return value
+
+        async def load() -> T:
+            value, fresh = self.l1.lookup(full_key)
+            if fresh:
+                return value
+            self.stats.record_load()
+            value = await loader()
+            if value is not None:
+                await self._aset(namespace, key, value)
+            return value
+
+        return await self.async_flights.do(full_key, load)
+
+    async def _aset(self, namespace: str, key: Any, value: Any) -> None:
+        self.l1.set(self.key(namespace, key), value, self.ttl(namespace), self.stale_ttl(namespace))
+        if self.l2 is not None:
+            await asyncio.to_thread(self._set_l2, namespace, key, value)
+
+    def _claim_refresh(self, full_key: str) -> bool:
+        """True if no refresh of full_key is running yet (and marks it running)."""
+        with self._refresh_lock:
+            if full_key in self._refreshing:
+                return False
+            self._refreshing.add(full_key)
+            return True
+
+    def _release_refresh(self, full_key: str) -> None:
+        with self._refresh_lock:
+            self._refreshing.discard(full_key)
+
+    def _schedule_refresh(self, namespace: str, key: Any, refresh: Callable[[], Any]) -> None:
+        if not self._claim_refresh(self.key(namespace, key)):
+            return
+        with self._refresh_lock:
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    self.refresh_workers, thread_name_prefix="cache-refresh"
+                )
+        self._refresh_executor.submit(self._refresh, namespace, key, refresh)
+
+    def _refresh(self, namespace: str, key: Any, refresh: Callable[[], Any]) -> None:
+        full_key = self.key(namespace, key)
+        start = time.perf_counter()
+        error = None
+        try:
+            self.flights.do(full_key, lambda: self._reload(namespace, key, refresh))
+        except Exception as exc:
+            error = str(exc) or type(exc).__name__
+            logger.warning("Cache refresh of %s failed, serving stale: %s", full_key, error)
+        finally:
+            self._release_refresh(full_key)
+        self.stats.record_refresh((time.perf_counter() - start) * 1000, error)
+
+    def _reload(self, namespace: str, key: Any, refresh: Callable[[], Any]) -> Any:
+        if self.l2 is not None:
+            # Otro worker pudo refrescarlo ya: tomarlo de L2 en vez de recalcular
+            value, fresh = self._get_l2(namespace, self.key(namespace, key))
+            if fresh:
+                return value
+        value = refresh()
+        if value is None:
+            # Ya no existe: que el siguiente lector cargue (y vea None)
+            self.invalidate(namespace, key)
+        else:
+            self.set(namespace, key, value)
+        return value
+
+    def _schedule_async_refresh(self, namespace: str, key: Any, refresh: Callable[[], Awaitable[Any]]) -> None:
+        if not self._claim_refresh(self.key(namespace, key)):
+            return
+        task = asyncio.get_running_loop().create_task(self._arefresh(namespace, key, refresh))
+        # El loop solo guarda referencias débiles a las tareas
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _arefresh(self, namespace: str, key: Any, refresh: Callable[[], Awaitable[Any]]) -> None:
+        full_key = self.key(namespace, key)
+        start = time.perf_counter()
+        error = None
+        try:
+            await self.async_flights.do(full_key, lambda: self._areload(namespace, key, refresh))
+        except Exception as exc:
+            error = str(exc) or type(exc).__name__
+            logger.warning("Cache refresh of %s failed, serving stale: %s", full_key, error)
+        finally:
+            self._release_refresh(full_key)
+        self.stats.record_refresh((time.perf_counter() - start) * 1000, error)
+
+    async def _areload(self, namespace: str, key: Any, refresh: Callable[[], Awaitable[Any]]) -> Any:
+        if self.l2 is not None:
+            value, fresh = await asyncio.to_thread(self._get_l2, namespace, self.key(namespace, key))
+            if fresh:
+                return value
+        value = await refresh()
+        if value is None:
+            if self.l2 is None:
+                self.invalidate(namespace, key)
+            else:
+                await asyncio.to_thread(self.invalidate, namespace, key)
+        else:
+            await self._aset(namespace, key, value)
+        return value
+
+    def invalidate(self, namespace: str, *keys: Any) -> None:
+        """Drop entries from both tiers (L2 errors are ignored; TTL bounds staleness)."""
+        full_keys = [self.key(namespace, key) for key in keys]
+        self._mark_invalidated(self._invalidated_keys, full_keys)
+        self.l1.delete(*full_keys)
+        if self.l2 is not None:
+            try:
+                self.l2.delete(*full_keys)
+            except Exception:
+                pass
+
+    def evict_local(self, namespace: str, *keys: Any) -> None:
+        """Drop entries from this process's L1 only (another worker already cleared L2)."""
+        full_keys = [self.key(namespace, key) for key in keys]
+        self._mark_invalidated(self._invalidated_keys, full_keys)
+        self.l1.delete(*full_keys)
+
+    def evict_local_namespace(self, namespace: str) -> None:
+        prefix = self.key(namespace, "")
+        self._mark_invalidated(self._invalidated_prefixes, [prefix])
+        self.l1.delete_prefix(prefix)
+
+    def clear_local(self) -> None:
+        self._mark_invalidated(self._invalidated_prefixes, [""])
+        self.l1.clear()
+
+    def needs_primary(self, namespace: str, key: Any) -> bool:
+        """Whether a load of this entry must skip the replicas (recently invalidated)."""
+        if self.primary_window <= 0:
+            return False
+        full_key = self.key(namespace, key)
+        now = time.monotonic()
+        with self._invalidated_lock:
+            if self._invalidated_keys.get(full_key, 0.0) > now:
+                return True
+            return any(
+                until > now and full_key.startswith(prefix)
+                for prefix, until in self._invalidated_prefixes.items()
+            )
+
+    def _mark_invalidated(self, marks: Dict[str, float], names: List[str]) -> None:
+        if self.primary_window <= 0:
+            return
+        now = time.monotonic()
+        with self._invalidated_lock:
+            # Purga las ventanas vencidas para que el dict no crezca
+            for name in [name for name, until in marks.items() if until <= now]:
+                del marks[name]
+            for name in names:
+                marks[name] = now + self.primary_window
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "l1_entries": len(self.l1),
+            "l1_max_entries": self.l1.max_entries,
+            "l2": type(self.l2).__name__ if self.l2 is not None else None,
+            "ttls": {"default": self.default_ttl, **self.ttls},
+            "stale_ttls": dict(self.stale_ttls),
+            "in_flight": len(self.flights) + len(self.async_flights),
+            "refreshing": len(self._refreshing),
+            **self.stats.snapshot(),
+        }
+
+
+def cached_read(namespace: str, key_arg: Optional[str] = None):
+    """
+    Serve a service method (self.cache holds an optional TwoTierCache)
+    through the cache. Works on plain and async methods.
+
+    Services with a session_factory also serve stale values while they
+    refresh: the refresh runs the method on background_copy(), the same
+    service on its own session, because the request's session is closed
+    by the time the refresh runs.
+
+    Args:
+        namespace: Cache namespace (selects the TTL)
+        key_arg: Name of the argument identifying the value; methods
+            without arguments use the key "all"
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func) if key_arg else None
+
+        def cache_key(self, args, kwargs) -> Any:
+            if signature is None:
+                return "all"
+            return signature.bind(self, *args, **kwargs).arguments[key_arg]
+
+        def load(cache: TwoTierCache, service, args, kwargs) -> Any:
+            """Miss loader: on the primary while the entry was just invalidated."""
+            if not cache.needs_primary(namespace, cache_key(service, args, kwargs)):
+                return func(service, *args, **kwargs)
+            with primary_reads(getattr(service, "db", None)):
+                return func(service, *args, **kwargs)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                cache = getattr(self, "cache", None)
+                if cache is None:
+                    return await func(self, *args, **kwargs)
+
+                refresh = None
+                if getattr(self, "session_factory", None) is not None:
+                    async def refresh():
+                        async with self.background_copy() as service:
+                            return await func(service, *args, **kwargs)
+
+                return await cache.aget_or_load(
+                    namespace, cache_key(self, args, kwargs), lambda: func(self, *args, **kwargs), refresh
+                )
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, "cache", None)
+            if cache is None:
+                return func(self, *args, **kwargs)
+
+            refresh = None
+            if getattr(self, "session_factory", None) is not None:
+                def refresh():
+                    with self.background_copy() as service:
+                        return func(service, *args, **kwargs)
+
+            return cache.get_or_load(
+                namespace, cache_key(self, args, kwargs), lambda: load(cache, self, args, kwargs), refresh
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def build_cache(config: Settings) -> Optional[TwoTierCache]:
+    """TwoTierCache from settings, or None when cache_enabled is off."""
+    if not config.cache_enabled:
+        return None
+    l2 = None
+    if config.cache_redis_url:
+        l2 = RedisCache.from_url(config.cache_redis_url, timeout=config.cache_redis_timeout)
+    return TwoTierCache(
+        LocalCache(config.cache_l1_max_entries),
+        l2,
+        version=config.cache_key_version,
+        ttls=config.cache_ttls,
+        default_ttl=config.cache_default_ttl,
+        stale_ttls=config.cache_stale_ttls,
+        refresh_workers=config.cache_refresh_workers,
+        primary_window=config.read_your_writes_window
+    )
+
+
+# Una instancia por proceso/worker
+course_cache = build_cache(settings)
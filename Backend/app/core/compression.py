@@ -0,0 +1,248 @@
+"""
+Response compression (brotli/gzip) negotiated from Accept-Encoding.
+
+Single-message responses of a compressible content type and at least
+minimum_size bytes are compressed with the best encoding the client
+accepts (brotli preferred over gzip on ties). Responses that already carry
+a Content-Encoding and streaming responses are passed through untouched.
+
+For cacheable routes (catalog, course detail) the compressed variants are
+kept in a bounded LRU keyed by a digest of the raw body: each content
+version is compressed once per encoding, at a higher brotli quality, and
+every later request with the same body reuses the bytes.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import brotli
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Preferencia del servidor ante q-values iguales
+ENCODINGS = ("br", "gzip")
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/msgpack", "text/", "application/javascript", "application/xml"
+)
+# Cuerpos más grandes se comprimen fuera del event loop
+OFFLOAD_SIZE = 64 * 1024
+
+
+def negotiate_encoding(accept_encoding: str, available: Iterable[str] = ENCODINGS) -> Optional[str]:
+    """
+    Best encoding of `available` for an Accept-Encoding header, or None.
+
+    Honors q-values (q=0 refuses an encoding) and the "*" wildcard; ties go
+    to the order of `available`.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressedVariants:
+    """
+    Thread-safe LRU of compressed bodies keyed by (body digest, encoding).
+    Hits mean a content version was served again without recompressing.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[bytes, str], bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(body: bytes) -> bytes:
+        return hashlib.blake2b(body, digest_size=16).digest()
+
+    def get(self, key: Tuple[bytes, str]) -> Optional[bytes]:
+        with self._lock:
+            variant = self._entries.get(key)
+            if variant is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return variant
+
+    def put(self, key: Tuple[bytes, str], variant: bytes) -> None:
+        with self._lock:
+            self._entries[key] = variant
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+class CompressionStats:
+    """Thread-safe counters of compressed responses and bytes saved per encoding."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.responses: Dict[str, int] = {}
+            self.bytes_in: Dict[str, int] = {}
+            self.bytes_out: Dict[str, int] = {}
+
+    def record(self, encoding: str, raw_size: int, compressed_size: int) -> None:
+        with self._lock:
+            self.responses[encoding] = self.responses.get(encoding, 0) + 1
+            self.bytes_in[encoding] = self.bytes_in.get(encoding, 0) + raw_size
+            self.bytes_out[encoding] = self.bytes_out.get(encoding, 0) + compressed_size
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                encoding: {
+                    "responses": count,
+                    "bytes_in": self.bytes_in[encoding],
+                    "bytes_out": self.bytes_out[encoding],
+                    "ratio": round(self.bytes_out[encoding] / self.bytes_in[encoding], 3),
+                }
+                for encoding, count in self.responses.items()
+            }
+
+
+# Una instancia por proceso/worker
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI compression middleware.
+
+    cached_routes are route path templates (e.g. "/courses/{slug}") whose
+    compressed bodies are reused through `variants`; they are compressed
+    with cached_brotli_quality since that cost is paid once per version.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        cached_routes: Optional[List[str]] = None,
+        cached_brotli_quality: int = 11,
+        variants: Optional[CompressedVariants] = None,
+        stats: Optional[CompressionStats] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cached_routes = set(cached_routes or ())
+        self.cached_brotli_quality = cached_brotli_quality
+        self.variants = variants if variants is not None else CompressedVariants()
+        self.stats = stats if stats is not None else compression_stats
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+
+            if message["type"] == "http.response.start":
+                # Se retiene hasta ver el cuerpo
+                start_message = message
+                return
+
+            if start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            eligible = self._compressible(headers)
+            if eligible:
+                headers.add_vary_header("Accept-Encoding")
+
+            body = message.get("body", b"")
+            if (
+                not eligible
+                or encoding is None
+                or message.get("more_body", False)
+                or len(body) < self.minimum_size
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await self._compress(scope, body, encoding)
+            self.stats.record(encoding, len(body), len(compressed))
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def _compress(self, scope: Scope, body: bytes, encoding: str) -> bytes:
+        route = scope.get("route")
+        if getattr(route, "path", None) not in self.cached_routes:
+            return await self._run(body, encoding, self.brotli_quality)
+
+        key = (self.variants.digest(body), encoding)
+        variant = self.variants.get(key)
+        if variant is None:
+            variant = await self._run(body, encoding, self.cached_brotli_quality, offload=True)
+            self.variants.put(key, variant)
+        return variant
+
+    async def _run(self, body: bytes, encoding: str, brotli_quality: int, offload: bool = False) -> bytes:
+        if offload or len(body) >= OFFLOAD_SIZE:
+            return await run_in_threadpool(compress, body, encoding, self.gzip_level, brotli_quality)
+        return compress(body, encoding, self.gzip_level, brotli_quality)
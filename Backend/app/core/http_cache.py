@@ -0,0 +1,272 @@
+"""
+HTTP caching headers for a CDN in front of the read endpoints, and
+surrogate-key purging.
+
+HttpCacheMiddleware adds, on 200 responses to GET/HEAD:
+- Cache-Control from the policy of the matched route (shared caches keep
+  the response s-maxage seconds and may serve it stale for
+  stale-while-revalidate more while they refetch; browsers revalidate).
+- Surrogate-Key listing what the payload was built from: "courses" for
+  the catalog and leaderboard, "course-<id>" for every course in it.
+  Routes with a {course_id} path parameter are tagged automatically;
+  handlers add the rest with add_surrogate_keys().
+Every other GET/HEAD response (routes without a policy, errors) gets
+"private, no-store", so neither the CDN's default TTL nor a browser
+keeps 404s, per-user data or admin/health output.
+
+Writes purge those keys: the Session hooks in app.db.cache_invalidation
+collect the affected keys of each transaction and, after commit, hand
+them to a PurgeDispatcher, which calls the configured PurgeSink from a
+background thread so no request waits on the CDN API.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+import urllib.request
+from contextvars import ContextVar
+from typing import Any, Collection, Dict, Iterable, List, Optional, Protocol, Set
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+CATALOG_KEY = "courses"
+# Respuestas sin política o con error: que nadie las guarde
+NO_STORE = "private, no-store"
+
+# Claves de la respuesta en curso; el handler añade al set que crea el middleware
+surrogate_keys: ContextVar[Optional[Set[str]]] = ContextVar("surrogate_keys", default=None)
+
+
+def course_key(course_id: Any) -> str:
+    return f"course-{course_id}"
+
+
+def add_surrogate_keys(*keys: str) -> None:
+    """Tag the current response; no-op outside HttpCacheMiddleware."""
+    current = surrogate_keys.get()
+    if current is not None:
+        current.update(keys)
+
+
+def tag_courses(courses: Iterable[Dict[str, Any]], catalog: bool = False) -> None:
+    """Tag the current response with the course ids of a payload."""
+    keys = [course_key(course["id"]) for course in courses]
+    if catalog:
+        keys.append(CATALOG_KEY)
+    add_surrogate_keys(*keys)
+
+
+class CachePolicy:
+    """Cache-Control of one route (seconds)."""
+
+    def __init__(
+        self,
+        s_maxage: int,
+        stale_while_revalidate: int = 0,
+        max_age: int = 0,
+        stale_if_error: int = 0
+    ):
+        self.s_maxage = s_maxage
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_age = max_age
+        self.stale_if_error = stale_if_error
+        directives = ["public", f"max-age={max_age}", f"s-maxage={s_maxage}"]
+        if stale_while_revalidate:
+            directives.append(f"stale-while-revalidate={stale_while_revalidate}")
+        if stale_if_error:
+            directives.append(f"stale-if-error={stale_if_error}")
+        self.header = ", ".join(directives)
+
+    @classmethod
+    def from_config(cls, policies: Dict[str, Dict[str, int]]) -> Dict[str, "CachePolicy"]:
+        """Policies per route path from settings.http_cache_policies."""
+        return {path: cls(**options) for path, options in policies.items()}
+
+
+class HttpCacheMiddleware:
+    """
+    Pure ASGI middleware adding Cache-Control and Surrogate-Key.
+
+    policies maps route paths ("/courses/{slug}") to CachePolicy and
+    applies to 200 responses; everything else gets NO_STORE. Responses
+    that already set Cache-Control keep theirs.
+    """
+
+    def __init__(self, app: ASGIApp, policies: Dict[str, CachePolicy]):
+        self.app = app
+        self.policies = policies
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        keys: Set[str] = set()
+        token = surrogate_keys.set(keys)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] != "http.response.start":
+                await send(message)
+                return
+            headers = MutableHeaders(scope=message)
+            route = scope.get("route")
+            policy = None
+            if message["status"] == 200:
+                policy = self.policies.get(route.path) if route is not None else None
+                course_id = scope.get("path_params", {}).get("course_id")
+                if course_id is not None:
+                    keys.add(course_key(course_id))
+                if keys:
+                    headers["Surrogate-Key"] = " ".join(sorted(keys))
+            if "cache-control" not in headers:
+                headers["Cache-Control"] = policy.header if policy is not None else NO_STORE
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            surrogate_keys.reset(token)
+
+
+class PurgeSink(Protocol):
+    """Something that evicts surrogate keys from a CDN."""
+
+    def purge(self, keys: Collection[str]) -> None:
+        ...
+
+
+class MemoryPurgeSink:
+    """Local stand-in for a CDN: records every purge (tests, local runs)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.purges: List[Set[str]] = []
+
+    def purge(self, keys: Collection[str]) -> None:
+        with self._lock:
+            self.purges.append(set(keys))
+
+    @property
+    def keys(self) -> Set[str]:
+        with self._lock:
+            return set().union(*self.purges)
+
+
+class HttpPurgeSink:
+    """
+    POSTs each purge to url with the keys both in a Surrogate-Key header
+    and as {"surrogate_keys": [...]} (the shape of Fastly's bulk purge).
+    headers carries the credentials, e.g. {"Fastly-Key": "..."}.
+    """
+
+    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 2.0):
+        self.url = url
+        self.headers = headers or {}
+        self.timeout = timeout
+
+    def purge(self, keys: Collection[str]) -> None:
+        ordered = sorted(keys)
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"surrogate_keys": ordered}).encode(),
+            method="POST",
+            headers={
+                **self.headers,
+                "Content-Type": "application/json",
+                "Surrogate-Key": " ".join(ordered),
+            }
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class PurgeDispatcher:
+    """
+    Runs purges on a background thread. Keys submitted while a purge is in
+    flight are merged into the next one. Failed purges are logged and
+    dropped: s-maxage bounds how long the CDN serves the old response.
+    """
+
+    def __init__(self, sink: PurgeSink):
+        self.sink = sink
+        self._queue: "queue.Queue[Set[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.purges = 0
+        self.keys = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_purge_at: Optional[float] = None
+
+    def submit(self, keys: Iterable[str]) -> None:
+        keys = set(keys)
+        if not keys:
+            return
+        self._queue.put(keys)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cdn-purge", daemon=True)
+                self._thread.start()
+
+    def wait(self) -> None:
+        """Block until every submitted purge has been sent (tests, shutdown)."""
+        self._queue.join()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sink": type(self.sink).__name__,
+                "pending": self._queue.qsize(),
+                "purges": self.purges,
+                "keys": self.keys,
+                "errors": self.errors,
+                "last_error": self.last_error,
+                "last_purge_at": self.last_purge_at,
+            }
+
+    def _run(self) -> None:
+        while True:
+            batches = [self._queue.get()]
+            while True:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._purge(set().union(*batches))
+            finally:
+                for _ in batches:
+                    self._queue.task_done()
+
+    def _purge(self, keys: Set[str]) -> None:
+        try:
+            self.sink.purge(keys)
+        except Exception as exc:
+            with self._lock:
+                self.errors += 1
+                self.last_error = str(exc) or type(exc).__name__
+            logger.warning("CDN purge of %d keys failed: %s", len(keys), self.last_error)
+            return
+        with self._lock:
+            self.purges += 1
+            self.keys += len(keys)
+            self.last_purge_at = time.time()
+
+
+def build_purger(config: Settings) -> Optional[PurgeDispatcher]:
+    """PurgeDispatcher for the configured CDN, or None when purging is off."""
+    if not config.cdn_purge_url:
+        return None
+    return PurgeDispatcher(
+        HttpPurgeSink(config.cdn_purge_url, config.cdn_purge_headers, config.cdn_purge_timeout)
+    )
+
+
+# Una instancia por proceso; None = sin CDN que purgar
+cdn_purger = build_purger(settings)
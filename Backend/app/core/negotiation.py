@@ -0,0 +1,119 @@
+"""
+MessagePack content negotiation.
+
+Clients that send `Accept: application/msgpack` (e.g. the Android app) get
+the same payload as the JSON path, same response models and field names,
+encoded as MessagePack instead. ContentNegotiationMiddleware records the
+negotiated format of each request in a context variable; the response
+classes below read it when rendering, so handlers and response_model
+validation stay unchanged.
+
+Datetimes are encoded as ISO 8601 strings, like in JSON. Error responses
+(HTTPException, 503s) are always JSON.
+"""
+from contextvars import ContextVar
+from datetime import date, datetime
+from typing import Any, Mapping, Optional
+
+import msgpack
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+# Alias no registrado que aún envían algunos clientes
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+JSON_MEDIA_RANGES = (JSON_MEDIA_TYPE, "application/*", "*/*")
+
+# Formato negociado para la request en curso
+response_media_type: ContextVar[str] = ContextVar("response_media_type", default=JSON_MEDIA_TYPE)
+
+
+def negotiate_media_type(accept: str) -> str:
+    """
+    MSGPACK_MEDIA_TYPE when the Accept header asks for MessagePack at least
+    as strongly as for JSON, otherwise JSON_MEDIA_TYPE.
+
+    MessagePack has to be listed explicitly; wildcards only select JSON.
+    """
+    weights = {}
+    for item in accept.split(","):
+        media_range, *params = item.split(";")
+        media_range = media_range.strip().lower()
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[media_range] = max(quality, weights.get(media_range, 0.0))
+
+    msgpack_quality = max(weights.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    json_quality = next((weights[name] for name in JSON_MEDIA_RANGES if name in weights), 0.0)
+    if msgpack_quality > 0 and msgpack_quality >= json_quality:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not MessagePack serializable")
+
+
+def packb(content: Any) -> bytes:
+    return msgpack.packb(content, default=_encode_default, use_bin_type=True, datetime=False)
+
+
+class ContentNegotiationMiddleware:
+    """Pure ASGI middleware storing the negotiated media type of each request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        media_type = negotiate_media_type(Headers(scope=scope).get("accept", ""))
+        token = response_media_type.set(media_type)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            response_media_type.reset(token)
+
+
+class MsgPackNegotiationMixin:
+    """
+    Renders MessagePack instead of JSON when the request negotiated it.
+    Adds `Vary: Accept` so shared caches keep both variants apart.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        **kwargs: Any
+    ):
+        headers = dict(headers or {})
+        headers.setdefault("Vary", "Accept")
+        super().__init__(content, status_code, headers, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if response_media_type.get() == MSGPACK_MEDIA_TYPE:
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return packb(content)
+        return super().render(content)
+
+
+class NegotiatedJSONResponse(MsgPackNegotiationMixin, JSONResponse):
+    """Default response class: JSON, or MessagePack when negotiated."""
+
+
+class NegotiatedORJSONResponse(MsgPackNegotiationMixin, ORJSONResponse):
+    """ORJSONResponse for pre-serialized rows, or MessagePack when negotiated."""
@@ -0,0 +1,38 @@
+"""
+Keyset-paginated list responses.
+
+The body stays a plain JSON list (same schema as before pagination); the
+cursor for the next page and the optional total travel in headers.
+"""
+from typing import Any, Dict
+
+from app.core.negotiation import NegotiatedORJSONResponse
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Documentación OpenAPI de las cabeceras (responses={200: {..., "headers": PAGE_HEADERS}})
+PAGE_HEADERS = {
+    NEXT_CURSOR_HEADER: {
+        "description": "Pass as `cursor` to fetch the next page; absent on the last page",
+        "schema": {"type": "string"},
+    },
+    TOTAL_COUNT_HEADER: {
+        "description": "Total matching items; only with include_total=true",
+        "schema": {"type": "integer"},
+    },
+}
+
+
+def page_response(page: Dict[str, Any]) -> NegotiatedORJSONResponse:
+    """
+    Response for a service page dict (items, next_cursor, total).
+    Items are serialized as-is with orjson, or MessagePack when negotiated
+    (no response_model re-validation).
+    """
+    headers = {}
+    if page.get("next_cursor") is not None:
+        headers[NEXT_CURSOR_HEADER] = page["next_cursor"]
+    if page.get("total") is not None:
+        headers[TOTAL_COUNT_HEADER] = str(page["total"])
+    return NegotiatedORJSONResponse(page["items"], headers=headers)
@@ -0,0 +1,39 @@
+"""
+Shared query-parameter parsing helpers for API endpoints.
+"""
+from typing import List
+from fastapi import HTTPException, status
+
+
+def parse_id_list(values: List[str], max_items: int, name: str) -> List[int]:
+    """
+    Parse ids given as repeated and/or comma-separated query parameters.
+
+    Accepts `?ids=1,2,3` as well as `?ids=1&ids=2`. Duplicates are removed
+    preserving order.
+
+    Raises:
+        HTTPException 400: If an id is not a positive integer or there are
+        more than max_items ids
+    """
+    ids: List[int] = []
+    for value in values:
+        for item in value.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            if not (item.isascii() and item.isdigit()) or int(item) <= 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid value in {name}: '{item}'"
+                )
+            ids.append(int(item))
+
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many values in {name} (max {max_items})"
+        )
+
+    return ids
@@ -0,0 +1,62 @@
+"""
+Server-Timing and query budget middleware.
+
+Wraps every HTTP request in a QueryCollector, adds
+`Server-Timing: db;dur=<ms>;desc="<N> queries"` to the response and logs a
+warning when the route ran more queries than its budget.
+"""
+import logging
+from typing import Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.query_counter import QueryCollector, collect_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryTimingMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task overhead).
+
+    Budgets are keyed by route path template (e.g. "/courses/{slug}");
+    routes without an entry use default_budget. A budget <= 0 disables the
+    check for that route.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_budget: int = 20,
+        budgets: Optional[Dict[str, int]] = None
+    ):
+        self.app = app
+        self.default_budget = default_budget
+        self.budgets = budgets or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_queries() as queries:
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    self._check_budget(scope, queries)
+                    MutableHeaders(scope=message).append("Server-Timing", queries.server_timing())
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+    def _check_budget(self, scope: Scope, queries: QueryCollector) -> None:
+        # FastAPI deja la ruta resuelta en el scope; sin ruta se usa el path
+        route = scope.get("route")
+        path = getattr(route, "path", scope["path"])
+        budget = self.budgets.get(path, self.default_budget)
+
+        if 0 < budget < queries.count:
+            logger.warning(
+                "Query budget exceeded: %s %s ran %d queries in %.1f ms (budget %d)",
+                scope["method"], path, queries.count, queries.duration_ms, budget
+            )
@@ -0,0 +1,34 @@
+"""
+Per-process sliding-window rate limiter for expensive operational endpoints.
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque
+
+
+class RateLimiter:
+    """
+    Allows at most max_calls per `period` seconds in this worker process.
+
+    acquire() returns 0 when the call is allowed, otherwise the seconds to
+    wait before the next slot frees up (suitable for Retry-After).
+    """
+
+    def __init__(self, max_calls: int, period: float, clock: Callable[[], float] = time.monotonic):
+        self.max_calls = max_calls
+        self.period = period
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls: Deque[float] = deque()
+
+    def acquire(self) -> float:
+        with self._lock:
+            now = self._clock()
+            while self._calls and now - self._calls[0] >= self.period:
+                self._calls.popleft()
+
+            if len(self._calls) < self.max_calls:
+                self._calls.append(now)
+                return 0.0
+            return self.period - (now - self._calls[0])
@@ -0,0 +1,198 @@
+"""
+Redis L2 backend for TwoTierCache.
+
+Minimal RESP2 client covering the commands the cache needs (GET, SET PX,
+DEL, PING) over a small pool of blocking sockets, so no extra dependency
+is required. Any server speaking the Redis protocol works (Redis, Valkey,
+KeyDB, or a local stand-in in tests).
+
+After a connection error the backend stays "down" for retry_interval
+seconds and fails fast instead of paying the connect timeout on every
+request.
+"""
+import socket
+import threading
+import time
+from typing import Any, Callable, List, Optional
+from urllib.parse import unquote, urlparse
+
+
+class RedisError(Exception):
+    """Error reply from the server, or the backend is marked down."""
+
+
+class RedisCache:
+    """CacheBackend over the Redis protocol."""
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        timeout: float = 0.1,
+        max_idle: int = 8,
+        retry_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.retry_interval = retry_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._idle: List["_Connection"] = []
+        self._down_until = 0.0
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisCache":
+        """Build from redis://[:password@]host[:port][/db]."""
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported cache URL scheme: {parsed.scheme}")
+        db = parsed.path.lstrip("/")
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+            **kwargs
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.execute("GET", key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.execute("SET", key, value, "PX", max(int(ttl * 1000), 1))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.execute("DEL", *keys)
+
+    def ping(self) -> bool:
+        return self.execute("PING") == b"PONG"
+
+    def execute(self, *args: Any) -> Any:
+        """Run one command and return its decoded reply."""
+        if self._clock() < self._down_until:
+            raise RedisError("Cache backend unavailable")
+
+        connection = self._acquire()
+        try:
+            reply = connection.execute(args)
+        except (OSError, EOFError):
+            connection.close()
+            with self._lock:
+                self._down_until = self._clock() + self.retry_interval
+            raise
+        self._release(connection)
+        if isinstance(reply, RedisError):
+            raise reply
+        return reply
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def _acquire(self) -> "_Connection":
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return self._connect()
+        except OSError:
+            with self._lock:
+                self._down_until = self._clock() + self.retry_interval
+            raise
+
+    def _release(self, connection: "_Connection") -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def _connect(self) -> "_Connection":
+        connection = _Connection(socket.create_connection((self.host, self.port), timeout=self.timeout))
+        for command in self._handshake():
+            reply = connection.execute(command)
+            if isinstance(reply, RedisError):
+                connection.close()
+                raise reply
+        return connection
+
+    def _handshake(self) -> List[tuple]:
+        commands = []
+        if self.password:
+            commands.append(("AUTH", self.password))
+        if self.db:
+            commands.append(("SELECT", self.db))
+        return commands
+
+
+class _Connection:
+    """One socket speaking RESP2."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.reader = sock.makefile("rb")
+
+    def execute(self, args: tuple) -> Any:
+        self.sock.sendall(encode_command(args))
+        return read_reply(self.reader)
+
+    def close(self) -> None:
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def encode_command(args: tuple) -> bytes:
+    """RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        else:
+            data = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+def read_reply(reader) -> Any:
+    """
+    Decode one RESP2 reply. Error replies are returned (not raised) as
+    RedisError so the connection stays usable.
+    """
+    line = reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise EOFError("Connection closed by the cache server")
+    kind, payload = line[:1], line[1:-2]
+
+    if kind == b"+":
+        return payload
+    if kind == b"-":
+        return RedisError(payload.decode(errors="replace"))
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = reader.read(length + 2)
+        if len(data) != length + 2:
+            raise EOFError("Connection closed by the cache server")
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [read_reply(reader) for _ in range(length)]
+    raise EOFError(f"Unexpected reply from the cache server: {line!r}")
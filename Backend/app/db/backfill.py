@@ -0,0 +1,65 @@
+"""
+Backfill script for materialized rating data.
+Rebuilds derived tables from course_ratings (source of truth).
+
+Usage:
+    python -m app.db.backfill summaries
+    python -m app.db.backfill rollups [chunk_size]
+"""
+
+from sqlalchemy.orm import Session
+from app.db.base import SessionLocal
+from app.services.course_service import CourseService
+
+
+def backfill_summaries():
+    """Rebuild course_rating_summaries (leaderboard and stats)."""
+    db: Session = SessionLocal()
+
+    try:
+        total = CourseService(db).rebuild_rating_summaries()
+        print(f"✅ Rating summaries rebuilt for {total} courses")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error rebuilding rating summaries: {e}")
+        raise
+    finally:
+        db.close()
+
+
+def backfill_rollups(chunk_size: int = 100):
+    """Rebuild hourly/daily rating rollups, one short transaction per chunk of courses."""
+    db: Session = SessionLocal()
+
+    try:
+        chunks = 0
+        for last_id in CourseService(db).backfill_rating_rollups(chunk_size=chunk_size):
+            chunks += 1
+            print(f"   chunk {chunks}: courses up to id {last_id}")
+
+        print(f"✅ Rating rollups rebuilt in {chunks} chunks")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error rebuilding rating rollups: {e}")
+        raise
+    finally:
+        db.close()
+
+
+COMMANDS = {
+    "summaries": backfill_summaries,
+    "rollups": backfill_rollups,
+}
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:
+        print(f"Usage: python -m app.db.backfill [{'|'.join(COMMANDS)}]")
+        sys.exit(1)
+
+    args = [int(arg) for arg in sys.argv[2:]]
+    COMMANDS[sys.argv[1]](*args)
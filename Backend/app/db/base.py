@@ -1,25 +1,128 @@
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from app.core.config import settings
+from app.db.lazy_session import LazySession, track_checkouts
+from app.db.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    request_checkout_stats,
+)
+from app.db.routing import ReadYourWritesTracker, ReplicaSet, RoutingSession
+from app.db.slow_queries import slow_query_recorder
+from app.db.statement_cache import (
+    async_statement_cache_stats,
+    instrument_statement_cache,
+    statement_cache_stats,
+)
+from app.db.statement_timeout import StatementTimeouts
 from app.models.base import Base
 
+# Configuración compartida por el engine sync, el async y las réplicas
+POOL_OPTIONS = dict(
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_use_lifo=settings.db_pool_use_lifo,
+)
+ENGINE_OPTIONS = dict(
+    query_cache_size=settings.db_query_cache_size,
+    **POOL_OPTIONS
+)
+
 # Create SQLAlchemy engine
-engine = create_engine(settings.database_url)
+engine = create_engine(
+    settings.database_url,
+    poolclass=InstrumentedQueuePool,
+    **ENGINE_OPTIONS
+)
+instrument_statement_cache(engine, statement_cache_stats)
+
+# Slow-query log; EXPLAIN usa el engine sync (mismo paramstyle que el SQL capturado)
+slow_query_recorder.configure(
+    threshold_ms=settings.slow_query_threshold_ms,
+    capacity=settings.slow_query_buffer_size,
+    explain_engine=engine if settings.slow_query_explain else None
+)
+
+# Read replicas (optional); reads marked with @replica_read go here
+replicas = ReplicaSet(
+    [create_engine(url, **ENGINE_OPTIONS) for url in settings.replica_database_urls],
+    retry_interval=settings.replica_retry_interval
+)
+for replica in replicas.engines:
+    instrument_statement_cache(replica, statement_cache_stats)
+read_your_writes = ReadYourWritesTracker(window=settings.read_your_writes_window)
+
+# statement_timeout por ruta, aplicado con SET LOCAL al iniciar cada transacción
+statement_timeouts = StatementTimeouts(
+    default_ms=settings.statement_timeout_default_ms,
+    routes=settings.statement_timeouts_ms
+)
 
 # Create SessionLocal class for database sessions
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    replicas=replicas,
+    read_your_writes=read_your_writes
+)
+track_checkouts(SessionLocal)
+
+# Async engine (asyncpg) for the async request path
+async_engine = create_async_engine(
+    settings.resolved_async_database_url,
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    **ENGINE_OPTIONS
+)
+instrument_statement_cache(async_engine.sync_engine, async_statement_cache_stats)
+
+# expire_on_commit=False: los objetos siguen legibles tras commit sin I/O implícito
+# Sin réplicas (todo va al primario), pero sus escrituras abren la ventana read-your-writes
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    read_your_writes=read_your_writes,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 
 # Dependency function for getting database session
-def get_db() -> Generator:
+def get_db(request: Request = None) -> Generator:
     """
-    Dependency function that yields database session.
+    Dependency function that yields a lazy database session.
     Used for dependency injection in FastAPI endpoints.
+
+    The Session is created on first use and a connection is checked out on
+    the first query, so requests answered without the database (cache hits,
+    early validation errors) never touch the pool. Transactions run with
+    the statement timeout configured for the matched route.
     """
-    db = SessionLocal()
+    db = LazySession(SessionLocal)
+    if request is not None:
+        statement_timeouts.apply(db, request.scope)
     try:
         yield db
     finally:
+        request_checkout_stats.record_request(db.created, db.checked_out)
         db.close()
+
+
+async def get_async_db(request: Request = None) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async dependency function that yields an AsyncSession.
+    Used by async def endpoints; never blocks the event loop.
+    """
+    async with AsyncSessionLocal() as db:
+        if request is not None:
+            statement_timeouts.apply(db, request.scope)
+        yield db
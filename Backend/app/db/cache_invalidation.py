@@ -0,0 +1,303 @@
+"""
+Cross-worker cache invalidation over PostgreSQL LISTEN/NOTIFY.
+
+Writers: a Session after_flush listener runs `pg_notify(channel,
+"<kind>:<course_id>")` for every course whose ratings ("rating") or
+course data ("course": Course, Lesson rows) were flushed. NOTIFY is
+transactional, so listeners only hear about committed writes and
+duplicate payloads of one transaction are delivered once.
+
+Readers: one CacheInvalidationListener task per worker keeps a dedicated
+asyncpg connection in LISTEN and evicts the affected keys from its L1 as
+notifications arrive. Notifications sent while it was disconnected are
+lost, so every (re)connect starts with a full L1 flush.
+
+Shared L2: the listeners only evict L1, so the writing process clears
+L2 itself. Flushes collect the slugs of changed courses in the session's
+info and, after commit, their details and the catalog are invalidated in
+both tiers of course_cache (rating writes do the same from the service).
+
+CDN: the same flushes collect the surrogate keys to purge in the
+session's info; after commit (only the writing process, once) they go to
+cdn_purger, and a rollback discards them.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+import asyncpg
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import course_cache
+from app.core.config import settings
+from app.core.http_cache import CATALOG_KEY, cdn_purger, course_key
+from app.models.course import Course
+from app.models.course_rating import CourseRating
+from app.models.lesson import Lesson
+from app.services.course_service import invalidate_course_details
+
+logger = logging.getLogger(__name__)
+
+RATING = "rating"
+COURSE = "course"
+
+# Claves de CDN pendientes de purgar en session.info hasta el commit
+PURGE_KEYS = "cdn_purge_keys"
+# Slugs de cursos cuyo detalle cacheado hay que invalidar tras el commit
+COURSE_SLUGS = "cache_course_slugs"
+
+
+def changed_courses(session: Session) -> Set[Tuple[str, int]]:
+    """(kind, course_id) of the course data and ratings pending in a flush."""
+    changes = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, CourseRating):
+            changes.add((RATING, instance.course_id))
+        elif isinstance(instance, Course):
+            changes.add((COURSE, instance.id))
+        elif isinstance(instance, Lesson):
+            changes.add((COURSE, instance.course_id))
+    return {(kind, course_id) for kind, course_id in changes if course_id is not None}
+
+
+def changed_course_slugs(session: Session) -> Set[str]:
+    """Slugs of the courses whose cached detail a flush makes stale."""
+    slugs: Set[str] = set()
+    lesson_course_ids: Set[int] = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Course):
+            # Un cambio de slug deja obsoletos el antiguo y el nuevo
+            slugs.update(inspect(instance).attrs.slug.history.deleted)
+            slugs.add(instance.slug)
+        elif isinstance(instance, Lesson):
+            lesson_course_ids.update(inspect(instance).attrs.course_id.history.deleted)
+            lesson_course_ids.add(instance.course_id)
+    lesson_course_ids.discard(None)
+    if lesson_course_ids:
+        with session.no_autoflush:
+            slugs.update(session.execute(
+                select(Course.slug).where(Course.id.in_(lesson_course_ids))
+            ).scalars())
+    slugs.discard(None)
+    return slugs
+
+
+def purge_keys(changes: Set[Tuple[str, int]]) -> Set[str]:
+    """Surrogate keys of the CDN responses built from the changed courses."""
+    keys = {course_key(course_id) for _, course_id in changes}
+    if keys:
+        # El catálogo y el ranking muestran nombres y medias de todos los cursos
+        keys.add(CATALOG_KEY)
+    return keys
+
+
+def listen_dsn(database_url: str) -> str:
+    """asyncpg DSN for a SQLAlchemy URL (driver suffix removed)."""
+    scheme, _, rest = database_url.partition("://")
+    return f"{scheme.split('+')[0]}://{rest}"
+
+
+def parse_payload(payload: str) -> Optional[Tuple[str, int]]:
+    """(kind, course_id) from a notification payload, or None if malformed."""
+    kind, _, course_id = payload.partition(":")
+    if kind not in (RATING, COURSE) or not (course_id.isascii() and course_id.isdigit()):
+        return None
+    return kind, int(course_id)
+
+
+class CacheNotifier:
+    """Emits pg_notify for flushed course/rating changes; disabled while channel is None."""
+
+    def __init__(self, channel: Optional[str] = None):
+        self.channel = channel
+
+    def notify(self, session: Session) -> None:
+        if self.channel is None:
+            return
+        changes = changed_courses(session)
+        if not changes:
+            return
+        connection = session.connection()
+        if connection.dialect.name != "postgresql":
+            return
+        for kind, course_id in sorted(changes):
+            connection.execute(select(func.pg_notify(self.channel, f"{kind}:{course_id}")))
+
+
+# NOTIFY serializa los commits en un lock global: solo con la caché activa
+cache_notifier = CacheNotifier(settings.cache_invalidation_channel if settings.cache_enabled else None)
+
+
+@event.listens_for(Session, "after_flush")
+def _notify_cache_changes(session, flush_context):
+    cache_notifier.notify(session)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_course_slugs(session, flush_context):
+    if course_cache is None:
+        return
+    slugs = changed_course_slugs(session)
+    if slugs:
+        session.info.setdefault(COURSE_SLUGS, set()).update(slugs)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_cdn_purges(session, flush_context):
+    if cdn_purger is None:
+        return
+    keys = purge_keys(changed_courses(session))
+    if keys:
+        session.info.setdefault(PURGE_KEYS, set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _purge_cdn(session):
+    keys = session.info.pop(PURGE_KEYS, None)
+    if keys and cdn_purger is not None:
+        cdn_purger.submit(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_course_cache(session):
+    slugs = session.info.pop(COURSE_SLUGS, None)
+    if slugs and course_cache is not None:
+        invalidate_course_details(course_cache, slugs)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(PURGE_KEYS, None)
+    session.info.pop(COURSE_SLUGS, None)
+
+
+class CacheInvalidationListener:
+    """
+    Background LISTEN loop of one worker.
+
+    on_change(kind, course_id) runs for each notification; on_reconnect()
+    runs after every successful (re)connect, before listening, and must
+    flush whatever could have been missed. The connection is checked every
+    health_interval seconds so a silently dropped socket is noticed.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        on_change: Callable[[str, int], None],
+        on_reconnect: Callable[[], None],
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 30.0,
+        health_interval: float = 10.0,
+        connect: Callable[..., Any] = asyncpg.connect
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self.on_change = on_change
+        self.on_reconnect = on_reconnect
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self.health_interval = health_interval
+        self._connect = connect
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self.connected = False
+        self.connects = 0
+        self.notifications = 0
+        self.ignored = 0
+        self.last_error: Optional[str] = None
+        self.last_notification_at: Optional[float] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="cache-invalidation")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.connected = False
+
+    def handle(self, payload: str) -> None:
+        """Apply one notification."""
+        change = parse_payload(payload)
+        with self._lock:
+            self.notifications += 1
+            self.last_notification_at = time.time()
+            if change is None:
+                self.ignored += 1
+        if change is None:
+            # Formato desconocido: vaciar es lo único seguro
+            logger.warning("Unknown cache invalidation payload %r, flushing L1", payload)
+            self.on_reconnect()
+            return
+        self.on_change(*change)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "channel": self.channel,
+                "connected": self.connected,
+                "connects": self.connects,
+                "full_flushes": self.connects + self.ignored,
+                "notifications": self.notifications,
+                "ignored": self.ignored,
+                "last_notification_at": self.last_notification_at,
+                "last_error": self.last_error,
+            }
+
+    async def _run(self) -> None:
+        delay = self.retry_interval
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.last_error = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+                logger.warning("Cache invalidation listener disconnected: %s", self.last_error)
+            if self.connected:
+                # Llegó a escuchar: el backoff vuelve a empezar
+                self.connected = False
+                delay = self.retry_interval
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_retry_interval)
+
+    async def _listen(self) -> None:
+        connection = await self._connect(self.dsn)
+        lost = asyncio.get_running_loop().create_future()
+
+        def on_notification(_connection, _pid, _channel, payload):
+            self.handle(payload)
+
+        def on_termination(_connection):
+            if not lost.done():
+                lost.set_result(None)
+
+        try:
+            connection.add_termination_listener(on_termination)
+            await connection.add_listener(self.channel, on_notification)
+            # Lo ocurrido mientras no escuchábamos se perdió: vaciar L1
+            self.on_reconnect()
+            with self._lock:
+                self.connects += 1
+                self.connected = True
+
+            while not lost.done():
+                try:
+                    await asyncio.wait_for(asyncio.shield(lost), self.health_interval)
+                except asyncio.TimeoutError:
+                    await asyncio.wait_for(connection.execute("SELECT 1"), self.health_interval)
+            raise ConnectionError("Listener connection closed")
+        finally:
+            if not connection.is_closed():
+                await connection.close(timeout=1)
@@ -0,0 +1,112 @@
+"""
+Database probes for the health endpoints.
+
+- ReadinessProbe: `SELECT 1` with a short statement timeout, cached for a
+  few seconds so frequent orchestrator probes across pods don't turn into
+  one database round trip each. Pool saturation is read live (no I/O).
+- estimated_row_count: planner estimate (pg_class.reltuples) instead of a
+  COUNT(*) sequential scan, for the human-facing /health report.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.pool import pool_status
+
+_ESTIMATED_ROWS = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"
+)
+
+
+def estimated_row_count(connection: Connection, table: str) -> Optional[int]:
+    """
+    Row count estimate maintained by VACUUM/ANALYZE.
+
+    Returns None on non-PostgreSQL databases and for tables never analyzed
+    (reltuples = -1). Raises if the table does not exist.
+    """
+    if connection.dialect.name != "postgresql":
+        return None
+    estimate = connection.execute(_ESTIMATED_ROWS, {"table": table}).scalar()
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+class ReadinessProbe:
+    """
+    Cached database readiness check for one engine.
+
+    The database result is reused for `ttl` seconds; pool occupancy is
+    always current. While the pool is at `max_saturation` or above the
+    probe reports not ready without checking out a connection (it would
+    only queue behind requests for up to db_pool_timeout).
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        ttl: float = 2.0,
+        timeout_ms: int = 500,
+        max_saturation: float = 1.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.engine = engine
+        self.ttl = ttl
+        self.timeout_ms = timeout_ms
+        self.max_saturation = max_saturation
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._database: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+
+    def check(self) -> Dict[str, Any]:
+        """
+        Readiness of this worker.
+
+        Returns:
+            Dictionary with ready, database (ok, error, age_s, cached) and
+            pool (checked_out, capacity, saturation)
+        """
+        status = pool_status(self.engine.pool)
+        saturation = status.get("saturation", 0.0)
+        pool = {
+            "checked_out": status.get("checked_out", 0),
+            "capacity": status.get("size", 0) + max(status.get("max_overflow", 0), 0),
+            "saturation": saturation,
+        }
+        saturated = saturation >= self.max_saturation
+
+        # Un solo probe a la vez; el resto reutiliza su resultado
+        with self._lock:
+            now = self._clock()
+            fresh = self._database is not None and now - self._checked_at < self.ttl
+            probed = not fresh and not saturated
+            if probed:
+                self._database = self._probe()
+                self._checked_at = now
+            database = dict(self._database or {"ok": False, "error": None})
+            database["cached"] = not probed
+            database["age_s"] = round(now - self._checked_at, 3) if self._database is not None else None
+
+        reason = "pool saturated" if saturated else database["error"]
+        return {
+            "ready": database["ok"] and not saturated,
+            "reason": reason,
+            "database": database,
+            "pool": pool,
+        }
+
+    def _probe(self) -> Dict[str, Any]:
+        try:
+            with self.engine.connect() as connection:
+                if connection.dialect.name == "postgresql":
+                    # SET LOCAL: solo para esta transacción, se revierte al cerrar
+                    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.timeout_ms)}")
+                connection.exec_driver_sql("SELECT 1")
+        except Exception as exc:
+            return {"ok": False, "error": str(exc).splitlines()[0]}
+        return {"ok": True, "error": None}
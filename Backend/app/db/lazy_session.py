@@ -0,0 +1,74 @@
+"""
+Lazy database session for request dependencies.
+
+LazySession stands in for a Session and only creates it (and thus checks
+out a pooled connection on the first query) when an attribute of the real
+session is used. Requests answered without touching the database never
+create a session nor take a connection from the pool.
+"""
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+
+# Clave en Session.info: la sesión llegó a obtener una conexión
+CHECKED_OUT_KEY = "connection_checked_out"
+
+
+class LazySession:
+    """
+    Proxy that creates its Session on first use.
+
+    `info` is available before the session exists (flags set on it are
+    copied into the session when it is created), so scopes such as
+    replica_reads don't force a session into existence.
+    """
+
+    def __init__(self, factory: sessionmaker):
+        self._factory = factory
+        self._session: Optional[Session] = None
+        self._pending_info: Dict[str, Any] = {}
+
+    @property
+    def session_class(self) -> type:
+        return self._factory.class_
+
+    @property
+    def created(self) -> bool:
+        return self._session is not None
+
+    @property
+    def session(self) -> Session:
+        if self._session is None:
+            self._session = self._factory(info=self._pending_info)
+        return self._session
+
+    @property
+    def info(self) -> Dict[str, Any]:
+        if self._session is None:
+            return self._pending_info
+        return self._session.info
+
+    @property
+    def checked_out(self) -> bool:
+        """Whether the session ever acquired a connection."""
+        return self._session is not None and self._session.info.get(CHECKED_OUT_KEY, False)
+
+    def option(self, name: str) -> Any:
+        """Keyword argument the factory passes to new sessions (e.g. replicas)."""
+        return self._factory.kw.get(name)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+
+def track_checkouts(factory: sessionmaker) -> None:
+    """Flag sessions created by factory once they begin a transaction on a connection."""
+
+    @event.listens_for(factory, "after_begin")
+    def _mark_checked_out(session, transaction, connection):
+        session.info[CHECKED_OUT_KEY] = True
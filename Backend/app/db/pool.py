@@ -0,0 +1,169 @@
+"""
+Connection pool telemetry.
+
+Tracks how long requests wait to obtain a pooled connection and how often
+the pool times out, so pool_size/max_overflow can be sized against the
+number of workers and threads.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Límites superiores (ms) de los buckets del histograma de espera
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolStats:
+    """
+    Thread-safe counters for pool checkouts.
+
+    The wait histogram is not cumulative: each checkout is counted in the
+    first bucket whose upper bound is >= its wait time (or in "+Inf").
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total_ms = 0.0
+            self.wait_max_ms = 0.0
+            self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def record_checkout(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            self.wait_buckets[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            histogram = {
+                f"le_{bound}ms": count
+                for bound, count in zip(WAIT_BUCKETS_MS, self.wait_buckets)
+            }
+            histogram["le_inf"] = self.wait_buckets[-1]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+                "wait_histogram": histogram,
+            }
+
+
+class RequestCheckoutStats:
+    """
+    Per-request session usage of the lazy get_db dependency.
+
+    A request is "zero checkout" when it never took a connection from the
+    pool (no session created, or a session that never ran a query).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.sessions_created = 0
+            self.zero_checkout = 0
+
+    def record_request(self, session_created: bool, checked_out: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.sessions_created += session_created
+            self.zero_checkout += not checked_out
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "sessions_created": self.sessions_created,
+                "zero_checkout_requests": self.zero_checkout,
+                "zero_checkout_ratio": round(self.zero_checkout / self.requests, 3) if self.requests else 0.0,
+            }
+
+
+# Estadísticas por engine (una instancia por proceso/worker)
+pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+request_checkout_stats = RequestCheckoutStats()
+
+
+class CheckoutStatsMixin:
+    """
+    Records checkout wait time and timeouts of a QueuePool in PoolStats.
+
+    Wait time covers everything needed to hand out a usable connection:
+    queueing for a free slot, opening overflow connections and pre-ping.
+    """
+
+    stats: PoolStats
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_checkout((time.perf_counter() - start) * 1000)
+        return connection
+
+
+class InstrumentedQueuePool(CheckoutStatsMixin, QueuePool):
+    """QueuePool for the sync engine, reporting to pool_stats."""
+
+    stats = pool_stats
+
+
+class InstrumentedAsyncAdaptedQueuePool(CheckoutStatsMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool for the async engine, reporting to async_pool_stats."""
+
+    stats = async_pool_stats
+
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    """
+    Current occupancy of a pool plus its accumulated telemetry.
+
+    Returns:
+        Dictionary with size, checked_out, checked_in, overflow, max_overflow,
+        saturation (checked_out / (size + max_overflow)) and the stats snapshot
+    """
+    if not isinstance(pool, QueuePool):
+        return {"pool_class": type(pool).__name__}
+
+    size = pool.size()
+    max_overflow = pool._max_overflow
+    checked_out = pool.checkedout()
+    capacity = size + max(max_overflow, 0)
+
+    status = {
+        "pool_class": type(pool).__name__,
+        "size": size,
+        "max_overflow": max_overflow,
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+    }
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+
+    return status
@@ -0,0 +1,75 @@
+"""
+Per-request SQL query counting.
+
+Cursor execution events of every engine feed the QueryCollector active in
+the current context (set per request by QueryTimingMiddleware, or by a
+test with collect_queries()). Outside a collector the listeners only do a
+ContextVar lookup.
+
+Usage in tests:
+    with collect_queries() as queries:
+        service.get_course_rating_stats(1)
+    assert queries.count == 3
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Atributo del ExecutionContext con el inicio de la sentencia
+_START_ATTR = "_query_counter_start"
+
+
+class QueryCollector:
+    """Queries executed and time spent in the database for one scope."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration_ms = 0.0
+        self.statements: List[str] = []
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.duration_ms += duration_ms
+        self.statements.append(statement)
+
+    def server_timing(self) -> str:
+        """Value for the Server-Timing response header."""
+        noun = "query" if self.count == 1 else "queries"
+        return f'db;dur={self.duration_ms:.1f};desc="{self.count} {noun}"'
+
+
+_current: ContextVar[Optional[QueryCollector]] = ContextVar("query_collector", default=None)
+
+
+def current_collector() -> Optional[QueryCollector]:
+    return _current.get()
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryCollector]:
+    """Count the queries run in this context (and threads/tasks started from it)."""
+    collector = QueryCollector()
+    token = _current.set(collector)
+    try:
+        yield collector
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None and context is not None:
+        setattr(context, _START_ATTR, time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collector = _current.get()
+    start = getattr(context, _START_ATTR, None)
+    if collector is None or start is None:
+        return
+    collector.record(statement, (time.perf_counter() - start) * 1000)
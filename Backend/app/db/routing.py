@@ -0,0 +1,366 @@
+"""
+Read-replica routing.
+
+RoutingSession sends statements issued inside a read-only scope to a
+healthy replica and everything else (writes, flushes, reads that follow a
+write in the same session) to the primary. Service methods opt in with the
+@replica_read decorator; a session that is not a RoutingSession (tests,
+mocks) ignores it.
+
+Read-your-writes: after a user's rating write, reads scoped to that user
+go to the primary for a short window so replication lag never hides the
+user's own change. The window is kept in the writing process and, through
+ReadYourWritesMiddleware, in a cookie sent back to the client, so the
+follow-up read is pinned whichever worker serves it.
+"""
+import functools
+import inspect
+import itertools
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.lazy_session import LazySession
+
+logger = logging.getLogger(__name__)
+
+# Claves en Session.info
+READ_ONLY_KEY = "replica_read"
+PRIMARY_ONLY_KEY = "primary_only"
+WROTE_KEY = "replica_wrote"
+REPLICA_KEY = "replica_engine"
+
+
+class ReplicaSet:
+    """
+    Replica engines with health tracking and round-robin selection.
+
+    A replica is marked unhealthy when a statement on it fails with a
+    disconnect error or when a probe fails. Unhealthy replicas are probed
+    again (SELECT 1) at most every `retry_interval` seconds.
+    """
+
+    def __init__(self, engines: List[Engine], retry_interval: float = 5.0):
+        self.engines = list(engines)
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+        self._cycle = itertools.cycle(range(len(self.engines))) if self.engines else None
+        # índice -> instante (monotonic) en que se marcó como caída
+        self._down_since: Dict[int, float] = {}
+
+        for engine in self.engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self) -> Optional[Engine]:
+        """Next healthy replica, or None if all are down."""
+        if not self.engines:
+            return None
+
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = next(self._cycle)
+                down_since = self._down_since.get(index)
+            if down_since is None:
+                return self.engines[index]
+            if time.monotonic() - down_since >= self.retry_interval and self.probe(index):
+                return self.engines[index]
+
+        return None
+
+    def probe(self, index: int) -> bool:
+        """Run SELECT 1 on a replica and update its health."""
+        try:
+            with self.engines[index].connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except Exception:
+            self.mark_down(index)
+            return False
+        self.mark_up(index)
+        return True
+
+    def mark_down(self, index: int) -> None:
+        with self._lock:
+            self._down_since[index] = time.monotonic()
+        logger.warning("Read replica %s marked unhealthy", self.engines[index].url.render_as_string(hide_password=True))
+
+    def mark_up(self, index: int) -> None:
+        with self._lock:
+            recovered = self._down_since.pop(index, None) is not None
+        if recovered:
+            logger.info("Read replica %s is healthy again", self.engines[index].url.render_as_string(hide_password=True))
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Health of every replica (for admin endpoints)."""
+        with self._lock:
+            down = dict(self._down_since)
+        return [
+            {
+                "url": engine.url.render_as_string(hide_password=True),
+                "healthy": index not in down,
+            }
+            for index, engine in enumerate(self.engines)
+        ]
+
+    def _on_error(self, context) -> None:
+        if not context.is_disconnect or context.engine is None:
+            return
+        for index, engine in enumerate(self.engines):
+            if engine is context.engine:
+                self.mark_down(index)
+
+
+# Ventanas (user_id -> hasta) que trae el cliente; el middleware crea el dict por request
+client_writes: ContextVar[Optional[Dict[int, float]]] = ContextVar("client_writes", default=None)
+
+
+def parse_writes_cookie(value: Optional[str], now: float, window: float) -> Dict[int, float]:
+    """
+    Windows from a "<user_id>:<until>_..." cookie. Expired and malformed
+    entries are dropped and none may last longer than window from now, so
+    a forged cookie can at most send a few reads to the primary.
+    """
+    writes: Dict[int, float] = {}
+    for entry in (value or "").split("_"):
+        user_id, _, until = entry.partition(":")
+        try:
+            user, expires = int(user_id), min(float(until), now + window)
+        except ValueError:
+            continue
+        if expires > now:
+            writes[user] = expires
+    return writes
+
+
+def format_writes_cookie(writes: Dict[int, float]) -> str:
+    return "_".join(f"{user_id}:{until:.3f}" for user_id, until in sorted(writes.items()))
+
+
+class ReadYourWritesTracker:
+    """
+    Users that wrote recently and must read from the primary.
+
+    Windows are wall-clock deadlines so every worker reads them the same
+    way; inside ReadYourWritesMiddleware they are also written to the
+    client's cookie (see client_writes).
+    """
+
+    def __init__(self, window: float = 5.0, clock: Callable[[], float] = time.time):
+        self.window = window
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._until: Dict[int, float] = {}
+
+    def record_write(self, user_id: int) -> None:
+        until = self.clock() + self.window
+        with self._lock:
+            self._until[user_id] = until
+        writes = client_writes.get()
+        if writes is not None:
+            writes[user_id] = until
+
+    def is_pinned(self, user_id: Optional[int]) -> bool:
+        if user_id is None or self.window <= 0:
+            return False
+        now = self.clock()
+        writes = client_writes.get()
+        if writes is not None and writes.get(user_id, 0.0) > now:
+            return True
+        with self._lock:
+            until = self._until.get(user_id)
+            if until is None:
+                return False
+            if until <= now:
+                del self._until[user_id]
+                return False
+            return True
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware carrying the read-your-writes windows in a cookie.
+
+    Loads the cookie into client_writes for the request and, when a write
+    opened a window, sends the updated cookie back (HttpOnly, expiring
+    with the longest window).
+    """
+
+    def __init__(self, app: ASGIApp, tracker: ReadYourWritesTracker, cookie_name: str = "ryw"):
+        self.app = app
+        self.tracker = tracker
+        self.cookie_name = cookie_name
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.tracker.window <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        now = self.tracker.clock()
+        cookie = HTTPConnection(scope).cookies.get(self.cookie_name)
+        writes = parse_writes_cookie(cookie, now, self.tracker.window)
+        received = dict(writes)
+        token = client_writes.set(writes)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and writes != received:
+                max_age = math.ceil(max(writes.values()) - now)
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{self.cookie_name}={format_writes_cookie(writes)}; Max-Age={max_age}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            client_writes.reset(token)
+
+
+class RoutingSession(Session):
+    """
+    Session that routes read-only scopes to a replica.
+
+    The replica is chosen once per session so a request sees a single
+    snapshot source. DML statements and flushes always use the primary, and
+    once the session has written every later read does too.
+    """
+
+    def __init__(
+        self,
+        *args,
+        replicas: Optional[ReplicaSet] = None,
+        read_your_writes: Optional[ReadYourWritesTracker] = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.read_your_writes = read_your_writes
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or (clause is not None and getattr(clause, "is_dml", False)):
+            self.info[WROTE_KEY] = True
+
+        if (
+            self.replicas
+            and self.info.get(READ_ONLY_KEY)
+            and not self.info.get(PRIMARY_ONLY_KEY)
+            and not self.info.get(WROTE_KEY)
+        ):
+            replica = self.info.get(REPLICA_KEY)
+            if replica is None:
+                replica = self.replicas.choose()
+                self.info[REPLICA_KEY] = replica
+            if replica is not None:
+                return replica
+
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def close(self) -> None:
+        super().close()
+        for key in (READ_ONLY_KEY, PRIMARY_ONLY_KEY, WROTE_KEY, REPLICA_KEY):
+            self.info.pop(key, None)
+
+
+def _read_your_writes(db: Any) -> Optional[ReadYourWritesTracker]:
+    """Tracker of a routing session (or of a lazy or async one, without creating it)."""
+    if isinstance(db, AsyncSession):
+        db = db.sync_session
+    if isinstance(db, RoutingSession):
+        return db.read_your_writes
+    if isinstance(db, LazySession) and issubclass(db.session_class, RoutingSession):
+        return db.option("read_your_writes")
+    return None
+
+
+def _can_route(db: Any) -> bool:
+    return isinstance(db, RoutingSession) or (
+        isinstance(db, LazySession) and issubclass(db.session_class, RoutingSession)
+    )
+
+
+@contextmanager
+def replica_reads(db: Any, user_id: Optional[int] = None) -> Iterator[None]:
+    """
+    Route reads issued inside the block to a replica.
+
+    No-op for non-routing sessions, inside primary_reads() and for users
+    inside their read-your-writes window.
+    """
+    if not _can_route(db) or db.info.get(PRIMARY_ONLY_KEY):
+        yield
+        return
+
+    tracker = _read_your_writes(db)
+    if tracker is not None and tracker.is_pinned(user_id):
+        yield
+        return
+
+    previous = db.info.get(READ_ONLY_KEY, False)
+    db.info[READ_ONLY_KEY] = True
+    try:
+        yield
+    finally:
+        db.info[READ_ONLY_KEY] = previous
+
+
+@contextmanager
+def primary_reads(db: Any) -> Iterator[None]:
+    """Keep reads inside the block on the primary, even in @replica_read methods."""
+    if not _can_route(db):
+        yield
+        return
+
+    previous = db.info.get(PRIMARY_ONLY_KEY, False)
+    db.info[PRIMARY_ONLY_KEY] = True
+    try:
+        yield
+    finally:
+        db.info[PRIMARY_ONLY_KEY] = previous
+
+
+def record_user_write(db: Any, user_id: int) -> None:
+    """Open the read-your-writes window for user_id after a committed write."""
+    tracker = _read_your_writes(db)
+    if tracker is not None:
+        tracker.record_write(user_id)
+
+
+def replica_read(method: Optional[Callable] = None, *, user_arg: Optional[str] = None):
+    """
+    Mark a service method (self.db holds the session) as read-only.
+
+    Args:
+        user_arg: Name of the argument holding the user id, so the user's
+            own reads honour the read-your-writes window
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func) if user_arg else None
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            user_id = None
+            if signature is not None:
+                user_id = signature.bind_partial(self, *args, **kwargs).arguments.get(user_arg)
+            with replica_reads(self.db, user_id=user_id):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    if method is not None:
+        return decorator(method)
+    return decorator
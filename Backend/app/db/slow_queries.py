@@ -0,0 +1,225 @@
+"""
+Slow-query recorder.
+
+Statements slower than a threshold are kept in a bounded ring buffer with
+their SQL, the shape of their bound parameters (types only, never values),
+duration and the service method that issued them. The first time a query
+fingerprint is seen, its plan can be captured in the background with
+EXPLAIN (ANALYZE off, FORMAT JSON), which plans the statement without
+running it.
+"""
+import hashlib
+import logging
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    import greenlet
+except ImportError:  # pragma: no cover - greenlet viene con sqlalchemy[asyncio]
+    greenlet = None
+
+logger = logging.getLogger(__name__)
+
+# Atributo del ExecutionContext con el inicio de la sentencia
+_START_ATTR = "_slow_query_start"
+# Módulos cuyos métodos se reportan como origen de la query
+SERVICE_MODULE_PREFIX = "app.services."
+
+_WHITESPACE = re.compile(r"\s+")
+# Admite placeholders con paréntesis, p. ej. IN (%(id_1_1)s, %(id_1_2)s)
+_IN_LIST = re.compile(r"\bIN \((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+
+
+def fingerprint(statement: str) -> str:
+    """Stable id of a statement shape (whitespace and IN-list length ignored)."""
+    normalized = _IN_LIST.sub("IN (...)", _WHITESPACE.sub(" ", statement).strip())
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Types of the bound parameters, without their values."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: forma del primer set y cuántos hay
+            return {"rows": len(parameters), "shape": parameter_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def service_call_path(skip: int = 2) -> List[str]:
+    """
+    Service methods on the current call stack, outermost first.
+
+    Also walks parent greenlets so statements issued from the async path
+    (which run in a child greenlet) are attributed to the awaiting
+    coroutine.
+    """
+    path = []
+    frame = sys._getframe(skip)
+    current = greenlet.getcurrent() if greenlet is not None else None
+
+    while True:
+        while frame is not None:
+            if frame.f_globals.get("__name__", "").startswith(SERVICE_MODULE_PREFIX):
+                owner = frame.f_locals.get("self")
+                if owner is not None:
+                    path.append(f"{type(owner).__name__}.{frame.f_code.co_name}")
+            frame = frame.f_back
+
+        current = current.parent if current is not None else None
+        if current is None:
+            break
+        frame = current.gr_frame
+
+    path.reverse()
+    return path
+
+
+class SlowQueryRecorder:
+    """
+    Ring buffer of slow statements plus captured plans per fingerprint.
+
+    Disabled while threshold_ms <= 0.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 0.0,
+        capacity: int = 100,
+        explain_engine: Optional[Engine] = None,
+        max_fingerprints: int = 1000
+    ):
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.max_fingerprints = max_fingerprints
+        self.configure(threshold_ms, capacity, explain_engine)
+
+    def configure(
+        self,
+        threshold_ms: float,
+        capacity: int,
+        explain_engine: Optional[Engine] = None
+    ) -> None:
+        with self._lock:
+            self.threshold_ms = threshold_ms
+            self.explain_engine = explain_engine
+            self.entries: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+            # fingerprint -> plan (None mientras el EXPLAIN está pendiente)
+            self.plans: "OrderedDict[str, Optional[Any]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def record(
+        self,
+        statement: str,
+        parameters: Any,
+        duration_ms: float,
+        dialect_driver: Optional[str] = None,
+        call_path: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Store a slow statement; schedule EXPLAIN for unseen fingerprints."""
+        query_id = fingerprint(statement)
+        call_path = call_path or []
+        entry = {
+            "fingerprint": query_id,
+            "sql": statement,
+            "parameters": parameter_shape(parameters),
+            "duration_ms": round(duration_ms, 3),
+            "service_method": call_path[-1] if call_path else None,
+            "call_path": call_path,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        with self._lock:
+            self.entries.append(entry)
+            is_new = query_id not in self.plans
+            if is_new:
+                self.plans[query_id] = None
+                if len(self.plans) > self.max_fingerprints:
+                    self.plans.popitem(last=False)
+
+        logger.warning(
+            "Slow query %s (%.1f ms) from %s",
+            query_id, duration_ms, entry["service_method"] or "unknown caller"
+        )
+
+        # EXPLAIN con el engine sync: solo si el SQL usa su mismo paramstyle
+        engine = self.explain_engine
+        if is_new and engine is not None and dialect_driver == engine.dialect.driver:
+            self._explain_in_background(engine, query_id, statement, parameters)
+
+        return entry
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "capacity": self.entries.maxlen,
+                "entries": list(reversed(self.entries)),
+                "plans": {key: plan for key, plan in self.plans.items() if plan is not None},
+            }
+
+    def _explain_in_background(self, engine: Engine, query_id: str, statement: str, parameters: Any) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._executor.submit(self._explain, engine, query_id, statement, parameters)
+
+    def _explain(self, engine: Engine, query_id: str, statement: str, parameters: Any) -> None:
+        try:
+            with engine.connect() as connection:
+                plan = connection.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE off, FORMAT JSON) {statement}",
+                    parameters
+                ).scalar()
+        except Exception as exc:
+            plan = {"error": str(exc).splitlines()[0]}
+
+        with self._lock:
+            if query_id in self.plans:
+                self.plans[query_id] = plan
+
+
+# Una instancia por proceso/worker; configurada en app.db.base
+slow_query_recorder = SlowQueryRecorder()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if slow_query_recorder.enabled and context is not None:
+        setattr(context, _START_ATTR, time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, _START_ATTR, None)
+    if start is None:
+        return
+
+    duration_ms = (time.perf_counter() - start) * 1000
+    if duration_ms < slow_query_recorder.threshold_ms:
+        return
+
+    # EXPLAIN de sentencias propias del recorder no se registra
+    if statement.startswith("EXPLAIN "):
+        return
+
+    slow_query_recorder.record(
+        statement,
+        parameters,
+        duration_ms,
+        dialect_driver=conn.dialect.driver,
+        call_path=service_call_path()
+    )
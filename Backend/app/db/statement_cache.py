@@ -0,0 +1,73 @@
+"""
+Compiled statement cache telemetry.
+
+SQLAlchemy caches the SQL string compiled for each statement shape per
+engine (create_engine(query_cache_size=...)). A miss means the statement
+was compiled again during the request; a low hit ratio usually means the
+cache is too small for the number of distinct statements or a query is
+built in a way that defeats caching (literal values, ad-hoc constructs).
+"""
+import threading
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, default
+
+
+class StatementCacheStats:
+    """Thread-safe counters of compiled cache lookups."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.uncached = 0
+
+    def record(self, cache_hit) -> None:
+        with self._lock:
+            if cache_hit is default.CACHE_HIT:
+                self.hits += 1
+            elif cache_hit is default.CACHE_MISS:
+                self.misses += 1
+            else:
+                # caché desactivada, sin cache key o SQL textual sin compilar
+                self.uncached += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "uncached": self.uncached,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Estadísticas por engine (una instancia por proceso/worker)
+statement_cache_stats = StatementCacheStats()
+async_statement_cache_stats = StatementCacheStats()
+
+
+def instrument_statement_cache(engine: Engine, stats: StatementCacheStats) -> None:
+    """Record the compiled cache outcome of every statement run on engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            stats.record(context.cache_hit)
+
+
+def statement_cache_status(engine: Engine, stats: StatementCacheStats) -> Dict[str, Any]:
+    """Configured size, current entries and hit ratio of an engine's cache."""
+    cache = engine._compiled_cache
+    status = {
+        "size": cache.capacity if cache is not None else 0,
+        "entries": len(cache) if cache is not None else 0,
+    }
+    status.update(stats.snapshot())
+    return status
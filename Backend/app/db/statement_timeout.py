@@ -0,0 +1,91 @@
+"""
+Per-route statement timeouts.
+
+get_db/get_async_db store the timeout of the matched route in Session.info;
+when the session begins a transaction on a PostgreSQL connection it runs
+`SET LOCAL statement_timeout`, so the limit covers every statement of that
+transaction and is reset when the connection returns to the pool.
+
+A statement cancelled by the timeout raises SQLSTATE 57014
+(query_canceled); is_query_canceled() recognizes it so the API can answer
+503 with Retry-After and count the cancellation per route.
+"""
+import threading
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from starlette.types import Scope
+
+# Clave en Session.info: statement_timeout (ms) para las transacciones de la sesión
+STATEMENT_TIMEOUT_KEY = "statement_timeout_ms"
+QUERY_CANCELED = "57014"
+
+
+def route_path(scope: Scope) -> str:
+    """Route path template of a request (e.g. "/courses/{slug}"), or its path."""
+    route = scope.get("route")
+    return getattr(route, "path", scope.get("path", ""))
+
+
+class StatementTimeouts:
+    """
+    Timeout per route path template; routes without an entry use default_ms.
+    A value <= 0 means no timeout.
+    """
+
+    def __init__(self, default_ms: int = 0, routes: Optional[Dict[str, int]] = None):
+        self.default_ms = default_ms
+        self.routes = routes or {}
+
+    def for_route(self, path: str) -> int:
+        return self.routes.get(path, self.default_ms)
+
+    def apply(self, db: Any, scope: Scope) -> None:
+        """Store the timeout of the request's route in the session info."""
+        timeout_ms = self.for_route(route_path(scope))
+        if timeout_ms > 0:
+            db.info[STATEMENT_TIMEOUT_KEY] = timeout_ms
+
+
+class StatementTimeoutStats:
+    """Thread-safe count of requests cancelled by statement_timeout, per route."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.cancelled: Dict[str, int] = {}
+
+    def record_cancel(self, path: str) -> None:
+        with self._lock:
+            self.cancelled[path] = self.cancelled.get(path, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cancelled_total": sum(self.cancelled.values()),
+                "cancelled": dict(self.cancelled),
+            }
+
+
+# Una instancia por proceso/worker
+statement_timeout_stats = StatementTimeoutStats()
+
+
+def is_query_canceled(error: BaseException) -> bool:
+    """Whether a DBAPI error is a statement cancelled by statement_timeout."""
+    if not isinstance(error, DBAPIError):
+        return False
+    # psycopg2 y el adaptador asyncpg de SQLAlchemy exponen el SQLSTATE en pgcode
+    return getattr(error.orig, "pgcode", None) == QUERY_CANCELED
+
+
+@event.listens_for(Session, "after_begin")
+def _set_statement_timeout(session, transaction, connection):
+    timeout_ms = session.info.get(STATEMENT_TIMEOUT_KEY)
+    if timeout_ms and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
@@ -1,17 +1,90 @@
-from fastapi import FastAPI, HTTPException, Depends, status
-from sqlalchemy import text
+from contextlib import asynccontextmanager
+from functools import partial
+from fastapi import APIRouter, FastAPI, HTTPException, Depends, Query, Request, status
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from app.core.admin import require_admin
+from app.core.cache import course_cache
+from app.core.compression import CompressedVariants, CompressionMiddleware, compression_stats
 from app.core.config import settings
-from app.db.base import engine, get_db
-from app.services.course_service import CourseService
+from app.core.http_cache import CachePolicy, HttpCacheMiddleware, cdn_purger
+from app.core.negotiation import ContentNegotiationMiddleware, NegotiatedJSONResponse
+from app.db.cache_invalidation import CacheInvalidationListener, listen_dsn
+from app.db.base import (
+    SessionLocal,
+    engine,
+    async_engine,
+    read_your_writes,
+    replicas,
+    statement_timeouts,
+    get_db
+)
+from app.db.health import ReadinessProbe, estimated_row_count
+from app.db.pool import pool_status, request_checkout_stats
+from app.db.routing import ReadYourWritesMiddleware
+from app.db.slow_queries import slow_query_recorder
+from app.db.statement_cache import (
+    async_statement_cache_stats,
+    statement_cache_stats,
+    statement_cache_status
+)
+from app.db.statement_timeout import is_query_canceled, route_path, statement_timeout_stats
+from app.core.pagination import page_response
+from app.core.params import parse_id_list
+from app.core.rate_limit import RateLimiter
+from app.core.query_timing import QueryTimingMiddleware
+from app.routers.async_courses import router as async_courses_router
+from app.routers.course_responses import (
+    ADD_RATING_RESPONSES,
+    BULK_RATING_STATS_RESPONSES,
+    COURSE_RATINGS_RESPONSES,
+    DELETE_RATING_RESPONSES,
+    RATING_STATS_RESPONSES,
+    UPDATE_RATING_RESPONSES,
+    USER_RATING_RESPONSES,
+    bulk_stats_course_ids,
+    catalog_response,
+    check_rating_owner,
+    course_detail_response,
+    deleted_rating_response,
+    service_error,
+    user_rating_response
+)
+from app.services.course_service import CourseService, evict_course_reads
 from app.schemas.rating import (
     RatingRequest,
     RatingResponse,
     RatingStatsResponse,
+    TopRatedCourseResponse,
+    TrendGranularity,
+    RatingTrendResponse,
+    UserRatingsResponse,
     ErrorResponse
 )
 
+# Un listener LISTEN/NOTIFY por worker vacía su L1 tras escrituras de otros workers
+cache_invalidation_listener = None
+if course_cache is not None and settings.cache_invalidation_listen:
+    cache_invalidation_listener = CacheInvalidationListener(
+        listen_dsn(settings.database_url),
+        settings.cache_invalidation_channel,
+        on_change=partial(evict_course_reads, course_cache),
+        on_reconnect=course_cache.clear_local
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if cache_invalidation_listener is not None:
+        cache_invalidation_listener.start()
+    yield
+    if cache_invalidation_listener is not None:
+        await cache_invalidation_listener.stop()
+
+
 app = FastAPI(
     title=settings.project_name,
     version=settings.version,
@@ -31,7 +104,14 @@ app = FastAPI(
     - One rating per user per course
     - Ratings can be updated or deleted
     - Aggregated statistics available per course
+
+    ## Response formats
+
+    Send `Accept: application/msgpack` to receive MessagePack instead of
+    JSON (same fields). Errors are always JSON.
     """,
+    default_response_class=NegotiatedJSONResponse,
+    lifespan=lifespan,
     openapi_tags=[
         {
             "name": "courses",
@@ -43,17 +123,83 @@ app = FastAPI(
         },
         {
             "name": "health",
-            "description": "Health check endpoints"
+            "description": "Health check and orchestrator probe endpoints"
+        },
+        {
+            "name": "admin",
+            "description": "Operational telemetry of the worker that answers (requires admin_token)"
         }
     ]
 )
 
+# Server-Timing con queries/tiempo de BD por request y aviso de presupuesto
+app.add_middleware(
+    QueryTimingMiddleware,
+    default_budget=settings.query_budget_default,
+    budgets=settings.query_budgets
+)
+
+# Ventana read-your-writes en cookie: vale en cualquier worker
+app.add_middleware(
+    ReadYourWritesMiddleware,
+    tracker=read_your_writes,
+    cookie_name=settings.read_your_writes_cookie
+)
+
+# JSON o MessagePack según Accept
+app.add_middleware(ContentNegotiationMiddleware)
+
+# Cache-Control por ruta y Surrogate-Key para el CDN
+http_cache_policies = CachePolicy.from_config(settings.http_cache_policies)
+app.add_middleware(HttpCacheMiddleware, policies=http_cache_policies)
+
+# Compresión br/gzip; catálogo y detalle reutilizan variantes ya comprimidas
+compressed_variants = CompressedVariants(settings.compression_cache_size)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+    cached_routes=settings.compression_cached_routes,
+    cached_brotli_quality=settings.compression_cached_brotli_quality,
+    variants=compressed_variants
+)
+
+@app.exception_handler(DBAPIError)
+async def database_error_handler(request: Request, exc: DBAPIError) -> JSONResponse:
+    """
+    Statements cancelled by statement_timeout become 503 with Retry-After
+    (counted per route); any other database error propagates as a 500.
+    """
+    if not is_query_canceled(exc):
+        raise exc
+
+    statement_timeout_stats.record_cancel(route_path(request.scope))
+    return JSONResponse(
+        {"detail": "Database query timed out, try again later"},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(settings.statement_timeout_retry_after)}
+    )
+
+
+# Con async_endpoints activo, los handlers async def se registran primero y
+# atienden las mismas rutas; el resto sigue en los handlers sync de abajo.
+if settings.async_endpoints:
+    app.include_router(async_courses_router)
+
 
 def get_course_service(db: Session = Depends(get_db)) -> CourseService:
     """
     Dependency to get CourseService instance
     """
-    return CourseService(db)
+    return CourseService(db, cache=course_cache, session_factory=SessionLocal)
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """Normalize an (optionally timezone-aware) datetime to naive UTC."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
 
 
 @app.get("/")
@@ -61,13 +207,67 @@ def root() -> dict[str, str]:
     return {"message": "Bienvenido a Platziflix API"}
 
 
-@app.get("/health", tags=["health"])
-def health() -> dict[str, str | bool | int]:
+# Probes por worker: /readyz reutiliza el SELECT 1 durante readiness_cache_ttl
+readiness_probe = ReadinessProbe(
+    engine,
+    ttl=settings.readiness_cache_ttl,
+    timeout_ms=settings.readiness_timeout_ms,
+    max_saturation=settings.readiness_max_saturation
+)
+health_rate_limiter = RateLimiter(settings.health_rate_limit, settings.health_rate_period)
+
+
+@app.get("/livez", tags=["health"])
+def livez() -> dict[str, str]:
+    """
+    Liveness probe: the process is up and serving requests.
+    Never touches the database, so a database outage doesn't restart pods.
+    """
+    return {"status": "ok"}
+
+
+@app.get(
+    "/readyz",
+    tags=["health"],
+    responses={503: {"description": "Database unreachable or pool saturated"}}
+)
+def readyz():
+    """
+    Readiness probe: this worker can serve database-backed requests.
+
+    Runs `SELECT 1` with a short statement timeout, cached for
+    readiness_cache_ttl seconds, and reports pool saturation. Returns 503
+    when the database check fails or the pool is saturated.
+    """
+    readiness = readiness_probe.check()
+    status_code = status.HTTP_200_OK if readiness["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(readiness, status_code=status_code)
+
+
+@app.get(
+    "/health",
+    tags=["health"],
+    responses={429: {"description": "Too many health checks, see Retry-After"}}
+)
+def health() -> dict[str, str | bool | int | None]:
     """
-    Health check endpoint that verifies:
+    Detailed health report for humans (rate-limited per worker).
+
+    Verifies:
     - Service status
     - Database connectivity
+    - Migrations applied (estimated courses row count, no table scan)
+
+    Orchestrators should use /livez and /readyz instead.
     """
+    retry_after = health_rate_limiter.acquire()
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many health checks",
+            headers={"Retry-After": str(max(1, round(retry_after)))}
+        )
+
     health_status = {
         "status": "ok",
         "service": settings.project_name,
@@ -78,16 +278,9 @@ def health() -> dict[str, str | bool | int]:
     # Check database connectivity and verify migration
     try:
         with engine.connect() as connection:
-            # Execute COUNT on courses table to verify migration was executed
-            result = connection.execute(text("SELECT COUNT(*) FROM courses"))
-            row = result.fetchone()
-            if row:
-                count = row[0]
-                health_status["database"] = True
-                health_status["courses_count"] = count
-            else:
-                health_status["database"] = True
-                health_status["courses_count"] = 0
+            # Estimación del planner (pg_class.reltuples): sin COUNT(*) ni seq scan
+            health_status["courses_estimate"] = estimated_row_count(connection, "courses")
+            health_status["database"] = True
     except Exception as e:
         health_status["status"] = "degraded"
         health_status["database_error"] = str(e)
@@ -95,13 +288,153 @@ def health() -> dict[str, str | bool | int]:
     return health_status
 
 
+# Telemetría operativa: requiere admin_token (ver app.core.admin)
+admin_router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@admin_router.get("/pool")
+def get_pool_stats() -> dict:
+    """
+    Connection pool telemetry for this worker process.
+
+    Returns occupancy (checked_out, overflow, saturation) and accumulated
+    checkout stats (wait-time histogram, timeouts). Use it to size
+    db_pool_size/db_max_overflow against the number of workers.
+    The async engine pool (async request path) is reported under "async",
+    each read replica (health plus pool) under "replicas" and per-request
+    session usage of get_db (requests served with zero checkouts) under
+    "requests".
+    """
+    status = pool_status(engine.pool)
+    status["async"] = pool_status(async_engine.pool)
+    status["requests"] = request_checkout_stats.snapshot()
+    status["replicas"] = [
+        {**health, **pool_status(replica.pool)}
+        for health, replica in zip(replicas.status(), replicas.engines)
+    ]
+    return status
+
+
+@admin_router.get("/statement-cache")
+def get_statement_cache_stats() -> dict:
+    """
+    Compiled SQL cache telemetry for this worker process.
+
+    Returns the configured size (db_query_cache_size), current entries and
+    hits/misses/hit_ratio since startup. Replicas share the sync counters;
+    the async engine is reported under "async".
+    """
+    status = statement_cache_status(engine, statement_cache_stats)
+    status["async"] = statement_cache_status(async_engine.sync_engine, async_statement_cache_stats)
+    return status
+
+
+@admin_router.get("/slow-queries")
+def get_slow_queries() -> dict:
+    """
+    Recent slow statements of this worker process, newest first.
+
+    Each entry has the SQL, bound-parameter types, duration, fingerprint and
+    the service method that issued it. With slow_query_explain enabled,
+    "plans" maps fingerprints to their EXPLAIN (FORMAT JSON) output.
+    """
+    return slow_query_recorder.snapshot()
+
+
+@admin_router.get("/statement-timeouts")
+def get_statement_timeouts() -> dict:
+    """
+    Statement timeouts of this worker process.
+
+    Returns the default and per-route timeouts (ms, 0 = none) and how many
+    requests per route were cancelled by them (answered with 503).
+    """
+    return {
+        "default_ms": statement_timeouts.default_ms,
+        "routes_ms": statement_timeouts.routes,
+        **statement_timeout_stats.snapshot(),
+    }
+
+
+@admin_router.get("/compression")
+def get_compression_stats() -> dict:
+    """
+    Response compression of this worker process.
+
+    "encodings" has responses, raw and compressed bytes and ratio per
+    encoding; "cached_variants" the reuse of pre-compressed bodies of
+    cacheable routes.
+    """
+    return {
+        "minimum_size": settings.compression_minimum_size,
+        "cached_routes": settings.compression_cached_routes,
+        "encodings": compression_stats.snapshot(),
+        "cached_variants": compressed_variants.snapshot(),
+    }
+
+
+@admin_router.get("/cache")
+def get_cache_stats() -> dict:
+    """
+    Read cache of this worker process.
+
+    Hits, misses, errors and lookup latency per tier (l1 = this process,
+    l2 = shared backend), loads that went to the database, the key
+    version and TTLs in use, and the state of the LISTEN/NOTIFY
+    invalidation listener.
+    """
+    if course_cache is None:
+        return {"enabled": False}
+    invalidation = cache_invalidation_listener.snapshot() if cache_invalidation_listener else None
+    return {"enabled": True, **course_cache.snapshot(), "invalidation": invalidation}
+
+
+@admin_router.get("/http-cache")
+def get_http_cache_stats() -> dict:
+    """
+    CDN caching of this worker process: the Cache-Control sent per route
+    and the surrogate-key purges issued after writes (None when no purge
+    URL is configured).
+    """
+    return {
+        "policies": {path: policy.header for path, policy in http_cache_policies.items()},
+        "purge": cdn_purger.snapshot() if cdn_purger is not None else None,
+    }
+
+
+app.include_router(admin_router)
+
+
 @app.get("/courses", tags=["courses"])
 def get_courses(course_service: CourseService = Depends(get_course_service)) -> list:
     """
     Get all courses.
     Returns a list of courses with basic information: id, name, description, thumbnail, slug
     """
-    return course_service.get_all_courses()
+    return catalog_response(course_service.get_all_courses())
+
+
+@app.get(
+    "/courses/top",
+    response_model=List[TopRatedCourseResponse],
+    tags=["courses"]
+)
+def get_top_courses(
+    limit: int = Query(10, ge=1, le=settings.leaderboard_max_limit),
+    course_service: CourseService = Depends(get_course_service)
+) -> List[TopRatedCourseResponse]:
+    """
+    Get the top-rated courses leaderboard.
+
+    Courses are ranked by Bayesian-weighted average so that courses with
+    very few votes don't outrank well-established ones. Served from the
+    materialized course_rating_summaries table (refreshed on every rating write).
+
+    Example:
+        GET /courses/top?limit=5
+    """
+    # El ranking cambia con cualquier rating: también depende del catálogo
+    return catalog_response(course_service.get_top_courses(limit=limit))
 
 
 @app.get("/courses/{slug}", tags=["courses"])
@@ -110,12 +443,7 @@ def get_course_by_slug(slug: str, course_service: CourseService = Depends(get_co
     Get course details by slug.
     Returns course information including teachers and classes.
     """
-    course = course_service.get_course_by_slug(slug)
-
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
-
-    return course
+    return course_detail_response(course_service.get_course_by_slug(slug))
 
 
 @app.get("/classes/{class_id}", tags=["courses"])
@@ -148,11 +476,7 @@ def get_class_by_id(class_id: int, db: Session = Depends(get_db)) -> dict:
     response_model=RatingResponse,
     status_code=status.HTTP_201_CREATED,
     tags=["ratings"],
-    responses={
-        201: {"description": "Rating created successfully"},
-        400: {"model": ErrorResponse, "description": "Validation error"},
-        404: {"model": ErrorResponse, "description": "Course not found"}
-    }
+    responses=ADD_RATING_RESPONSES
 )
 def add_course_rating(
     course_id: int,
@@ -187,41 +511,44 @@ def add_course_rating(
         return RatingResponse(**result)
     except ValueError as e:
         # Course not found or rating out of range
-        if "not found" in str(e):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=str(e)
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=str(e)
-            )
+        raise service_error(e)
 
 
 @app.get(
     "/courses/{course_id}/ratings",
     response_model=List[RatingResponse],
     tags=["ratings"],
-    responses={
-        200: {"description": "List of course ratings"},
-        404: {"model": ErrorResponse, "description": "Course not found"}
-    }
+    responses=COURSE_RATINGS_RESPONSES
 )
 def get_course_ratings(
     course_id: int,
+    limit: int = Query(
+        settings.course_ratings_default_limit,
+        ge=1,
+        le=settings.course_ratings_max_limit
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor (X-Next-Cursor of the previous page)"
+    ),
+    rating: Optional[int] = Query(None, ge=1, le=5, description="Only ratings with this star value"),
+    include_total: bool = Query(
+        False,
+        description="Add X-Total-Count, read from the rating summary (no COUNT(*))"
+    ),
     course_service: CourseService = Depends(get_course_service)
-) -> List[RatingResponse]:
+) -> ORJSONResponse:
     """
-    Get all active ratings for a course.
+    Get the active ratings for a course, one page at a time.
 
-    Returns list of ratings ordered by creation date (newest first).
-    Returns empty list if course has no ratings.
+    Returns list of ratings ordered by creation date (newest first, ties by
+    id). Returns empty list if course has no ratings. While more ratings
+    remain, the X-Next-Cursor header carries the cursor for the next page.
 
     Example:
-        GET /courses/1/ratings
+        GET /courses/1/ratings?limit=2&rating=5&include_total=true
 
-        Response:
+        Response (X-Next-Cursor: MjAyNS0xMC0xNFQxMDozMDowMHwx, X-Total-Count: 52):
         [
             {
                 "id": 1,
@@ -233,25 +560,31 @@ def get_course_ratings(
             },
             ...
         ]
+
+        GET /courses/1/ratings?limit=2&rating=5&cursor=MjAyNS0xMC0xNFQxMDozMDowMHwx
     """
     try:
-        ratings = course_service.get_course_ratings(course_id)
-        return [RatingResponse(**rating) for rating in ratings]
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e)
+        page = course_service.get_course_ratings(
+            course_id,
+            limit=limit,
+            cursor=cursor,
+            rating=rating,
+            include_total=include_total
         )
+    except ValueError as e:
+        raise service_error(e)
+
+    # Los dicts del servicio ya tienen la forma de RatingResponse: se serializan
+    # directo con orjson. response_model solo documenta el esquema en OpenAPI
+    # (sin un RatingResponse por fila ni re-validación).
+    return page_response(page)
 
 
 @app.get(
     "/courses/{course_id}/ratings/stats",
     response_model=RatingStatsResponse,
     tags=["ratings"],
-    responses={
-        200: {"description": "Course rating statistics"},
-        404: {"model": ErrorResponse, "description": "Course not found"}
-    }
+    responses=RATING_STATS_RESPONSES
 )
 def get_course_rating_stats(
     course_id: int,
@@ -285,20 +618,110 @@ def get_course_rating_stats(
         stats = course_service.get_course_rating_stats(course_id)
         return RatingStatsResponse(**stats)
     except ValueError as e:
+        raise service_error(e, status.HTTP_404_NOT_FOUND)
+
+
+@app.get(
+    "/ratings/stats",
+    response_model=Dict[int, RatingStatsResponse],
+    tags=["ratings"],
+    responses=BULK_RATING_STATS_RESPONSES
+)
+def get_bulk_rating_stats(
+    course_ids: List[str] = Query(
+        ...,
+        description="Comma-separated course ids, e.g. 1,2,3"
+    ),
+    course_service: CourseService = Depends(get_course_service)
+) -> Dict[int, RatingStatsResponse]:
+    """
+    Get rating statistics for many courses in one call.
+
+    Intended for course grids and lists: replaces N calls to
+    /courses/{course_id}/ratings/stats with a single summary-table read.
+    Unknown or deleted courses are omitted from the response.
+
+    Example:
+        GET /ratings/stats?course_ids=1,2,3
+
+        Response:
+        {
+            "1": {"average_rating": 4.35, "total_ratings": 142, "rating_distribution": {...}},
+            "2": {"average_rating": 0.0, "total_ratings": 0, "rating_distribution": {...}}
+        }
+    """
+    return course_service.get_bulk_rating_stats(bulk_stats_course_ids(course_ids))
+
+
+@app.get(
+    "/courses/{course_id}/ratings/trend",
+    response_model=RatingTrendResponse,
+    tags=["ratings"],
+    responses={
+        200: {"description": "Rating activity per time bucket"},
+        400: {"model": ErrorResponse, "description": "Invalid time range"},
+        404: {"model": ErrorResponse, "description": "Course not found"}
+    }
+)
+def get_course_rating_trend(
+    course_id: int,
+    granularity: TrendGranularity = TrendGranularity.day,
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = None,
+    course_service: CourseService = Depends(get_course_service)
+) -> RatingTrendResponse:
+    """
+    Get rating trends for a course over time.
+
+    Served exclusively from the hourly/daily rollup tables, which are
+    updated on every rating write. Buckets without activity are omitted.
+
+    Query Parameters:
+    - granularity: "hour" or "day" (default: day)
+    - from: Start of the range, inclusive (default: `to` minus 30 days)
+    - to: End of the range, exclusive (default: now, UTC)
+
+    Example:
+        GET /courses/1/ratings/trend?granularity=day&from=2025-10-01&to=2025-10-15
+    """
+    # Los timestamps se guardan en UTC sin zona horaria
+    end = _to_naive_utc(to) if to else datetime.utcnow()
+    start = _to_naive_utc(from_) if from_ else end - timedelta(days=settings.trend_default_days)
+
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must be earlier than 'to'"
+        )
+
+    bucket_size = timedelta(hours=1) if granularity == TrendGranularity.hour else timedelta(days=1)
+    if (end - start) / bucket_size > settings.trend_max_buckets:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e)
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Time range exceeds {settings.trend_max_buckets} {granularity.value} buckets"
+        )
+
+    try:
+        points = course_service.get_course_rating_trend(
+            course_id=course_id,
+            granularity=granularity.value,
+            start=start,
+            end=end
         )
+    except ValueError as e:
+        raise service_error(e, status.HTTP_404_NOT_FOUND)
+    return RatingTrendResponse(
+        course_id=course_id,
+        granularity=granularity,
+        points=points
+    )
 
 
 @app.get(
     "/courses/{course_id}/ratings/user/{user_id}",
     response_model=RatingResponse | None,
     tags=["ratings"],
-    responses={
-        200: {"description": "User's rating for the course"},
-        204: {"description": "User has not rated this course"}
-    }
+    responses=USER_RATING_RESPONSES
 )
 def get_user_course_rating(
     course_id: int,
@@ -332,25 +755,68 @@ def get_user_course_rating(
         Response (if not rated):
         HTTP 204 No Content
     """
-    rating = course_service.get_user_course_rating(course_id, user_id)
+    return user_rating_response(course_service.get_user_course_rating(course_id, user_id))
 
-    if rating is None:
-        raise HTTPException(
-            status_code=status.HTTP_204_NO_CONTENT
+
+@app.get(
+    "/users/{user_id}/ratings",
+    response_model=UserRatingsResponse,
+    tags=["ratings"],
+    responses={
+        200: {"description": "User's active ratings"},
+        400: {"model": ErrorResponse, "description": "Invalid or too many course ids"}
+    }
+)
+def get_user_ratings(
+    user_id: int,
+    course_ids: Optional[List[str]] = Query(
+        None,
+        description="Comma-separated course ids, e.g. 1,2,3"
+    ),
+    after: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Keyset cursor (next_cursor of the previous page)"
+    ),
+    limit: int = Query(
+        settings.user_ratings_default_limit,
+        ge=1,
+        le=settings.user_ratings_max_limit
+    ),
+    course_service: CourseService = Depends(get_course_service)
+) -> UserRatingsResponse:
+    """
+    Get a user's active ratings across courses.
+
+    Use Case:
+    - "Your rating" badges on the catalog in one request
+
+    Modes:
+    - With course_ids: ratings for those courses only (not paginated)
+    - Without course_ids: all ratings, paginated by course id using `after`
+
+    Example:
+        GET /users/42/ratings?course_ids=1,2,3
+        GET /users/42/ratings?limit=50&after=120
+    """
+    if course_ids is not None:
+        ids = parse_id_list(course_ids, settings.bulk_stats_max_ids, "course_ids")
+        result = course_service.get_user_ratings(user_id=user_id, course_ids=ids)
+    else:
+        result = course_service.get_user_ratings(
+            user_id=user_id,
+            after_course_id=after,
+            limit=limit
         )
 
-    return RatingResponse(**rating)
+    return UserRatingsResponse(**result)
 
 
 @app.put(
     "/courses/{course_id}/ratings/{user_id}",
     response_model=RatingResponse,
     tags=["ratings"],
-    responses={
-        200: {"description": "Rating updated successfully"},
-        400: {"model": ErrorResponse, "description": "Validation error"},
-        404: {"model": ErrorResponse, "description": "Rating not found"}
-    }
+    responses=UPDATE_RATING_RESPONSES
 )
 def update_course_rating(
     course_id: int,
@@ -376,11 +842,7 @@ def update_course_rating(
         }
     """
     # Validar que user_id del body coincide con user_id del path
-    if rating_data.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="user_id in body must match user_id in path"
-        )
+    check_rating_owner(user_id, rating_data)
 
     try:
         result = course_service.update_course_rating(
@@ -390,20 +852,14 @@ def update_course_rating(
         )
         return RatingResponse(**result)
     except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e)
-        )
+        raise service_error(e, status.HTTP_404_NOT_FOUND)
 
 
 @app.delete(
     "/courses/{course_id}/ratings/{user_id}",
     status_code=status.HTTP_204_NO_CONTENT,
     tags=["ratings"],
-    responses={
-        204: {"description": "Rating deleted successfully"},
-        404: {"model": ErrorResponse, "description": "Rating not found"}
-    }
+    responses=DELETE_RATING_RESPONSES
 )
 def delete_course_rating(
     course_id: int,
@@ -424,11 +880,4 @@ def delete_course_rating(
         HTTP 204 No Content
     """
     success = course_service.delete_course_rating(course_id, user_id)
-
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No active rating found for user {user_id} on course {course_id}"
-        )
-
-    return None
+    return deleted_rating_response(success, course_id, user_id)
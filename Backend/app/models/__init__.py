@@ -7,6 +7,8 @@ from .course import Course
 from .lesson import Lesson
 from .course_teacher import course_teachers
 from .course_rating import CourseRating
+from .course_rating_summary import CourseRatingSummary
+from .course_rating_rollup import CourseRatingRollupHourly, CourseRatingRollupDaily
 
 # Export all models for easy importing
 __all__ = [
@@ -16,5 +18,8 @@ __all__ = [
     'Course',
     'Lesson',
     'course_teachers',
-    'CourseRating'
+    'CourseRating',
+    'CourseRatingSummary',
+    'CourseRatingRollupHourly',
+    'CourseRatingRollupDaily'
 ] 
\ No newline at end of file
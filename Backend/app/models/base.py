@@ -12,7 +12,7 @@ class BaseModel(Base):
     """
     __abstract__ = True
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)  # la PK ya tiene su índice
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     deleted_at = Column(DateTime, nullable=True)  # Soft delete
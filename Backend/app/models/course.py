@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, String, Text, Index, text
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -36,6 +36,15 @@ class Course(BaseModel):
         lazy='select'  # Lazy loading por defecto, eager cuando se necesite
     )
 
+    __table_args__ = (
+        # GET /courses/{slug}: solo cursos activos
+        Index(
+            'ix_courses_slug_active',
+            'slug',
+            postgresql_where=text('deleted_at IS NULL')
+        ),
+    )
+
     @property
     def average_rating(self) -> float:
         """
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, ForeignKey, CheckConstraint, Index, text
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -44,6 +44,32 @@ class CourseRating(BaseModel):
         back_populates="ratings"
     )
 
+    __table_args__ = (
+        # Stats de un curso (avg/count/distribución): index-only scan
+        Index(
+            'ix_course_ratings_course_active',
+            'course_id',
+            postgresql_include=['rating'],
+            postgresql_where=text('deleted_at IS NULL')
+        ),
+        # Listado paginado de un curso: keyset (created_at DESC, id DESC)
+        # recorriendo el índice hacia atrás
+        Index(
+            'ix_course_ratings_course_created_active',
+            'course_id',
+            'created_at',
+            'id',
+            postgresql_where=text('deleted_at IS NULL')
+        ),
+        # Ratings activos de un usuario: un solo index range scan
+        Index(
+            'ix_course_ratings_user_course_active',
+            'user_id',
+            'course_id',
+            postgresql_where=text('deleted_at IS NULL')
+        ),
+    )
+
     def __repr__(self):
         return (
             f"<CourseRating("
@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, DateTime
+from .base import Base
+
+
+class RatingRollupBase(Base):
+    """
+    Common columns for time-bucketed rating rollups.
+
+    Each row aggregates the rating events of one course within one bucket:
+    - submitted_count / submitted_sum: ratings created or changed in the bucket
+    - removed_count: ratings soft-deleted in the bucket
+
+    The primary key (course_id, bucket_start) is the only index needed:
+    trend queries are a range scan over a single course.
+
+    course_id has no FK on purpose: these are append-mostly tables written
+    on every rating event and must stay cheap to update.
+    """
+    __abstract__ = True
+
+    course_id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    submitted_count = Column(Integer, nullable=False, default=0)
+    submitted_sum = Column(Integer, nullable=False, default=0)
+    removed_count = Column(Integer, nullable=False, default=0)
+
+    @property
+    def average_rating(self) -> float:
+        """Average value of the ratings submitted in this bucket."""
+        if not self.submitted_count:
+            return 0.0
+        return round(self.submitted_sum / self.submitted_count, 2)
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__}("
+            f"course_id={self.course_id}, "
+            f"bucket_start={self.bucket_start}, "
+            f"submitted_count={self.submitted_count}"
+            f")>"
+        )
+
+
+class CourseRatingRollupHourly(RatingRollupBase):
+    """Hourly rating rollup per course."""
+    __tablename__ = 'course_rating_rollups_hourly'
+
+
+class CourseRatingRollupDaily(RatingRollupBase):
+    """Daily rating rollup per course."""
+    __tablename__ = 'course_rating_rollups_daily'
@@ -0,0 +1,64 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from .base import Base
+
+
+class CourseRatingSummary(Base):
+    """
+    Materialized rating aggregates per course.
+
+    One row per course with at least one rating event. Rows are maintained
+    incrementally by CourseService on every rating write, so read paths
+    (leaderboard, stats) never aggregate course_ratings on demand.
+
+    bayesian_score is the Bayesian-weighted average used to rank courses:
+    courses with few votes are pulled towards the configured prior mean.
+    """
+    __tablename__ = 'course_rating_summaries'
+
+    course_id = Column(Integer, ForeignKey('courses.id'), primary_key=True)
+    total_ratings = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+
+    # Distribución de ratings activos (1-5 estrellas)
+    rating_1_count = Column(Integer, nullable=False, default=0)
+    rating_2_count = Column(Integer, nullable=False, default=0)
+    rating_3_count = Column(Integer, nullable=False, default=0)
+    rating_4_count = Column(Integer, nullable=False, default=0)
+    rating_5_count = Column(Integer, nullable=False, default=0)
+
+    bayesian_score = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Leaderboard: un solo range scan ordenado por score
+        Index(
+            'ix_course_rating_summaries_score',
+            bayesian_score.desc(),
+            course_id
+        ),
+    )
+
+    @property
+    def average_rating(self) -> float:
+        """Plain (non-weighted) average of active ratings."""
+        if not self.total_ratings:
+            return 0.0
+        return round(self.rating_sum / self.total_ratings, 2)
+
+    @property
+    def rating_distribution(self) -> dict:
+        """Count of active ratings per value (1-5)."""
+        return {
+            value: getattr(self, f"rating_{value}_count") or 0
+            for value in range(1, 6)
+        }
+
+    def __repr__(self):
+        return (
+            f"<CourseRatingSummary("
+            f"course_id={self.course_id}, "
+            f"total_ratings={self.total_ratings}, "
+            f"bayesian_score={self.bayesian_score}"
+            f")>"
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -17,6 +17,16 @@ class Lesson(BaseModel):
     
     # Many-to-one relationship with Course
     course = relationship("Course", back_populates="lessons")
+
+    __table_args__ = (
+        # Lecciones activas de un curso en orden de id
+        Index(
+            'ix_lessons_course_active',
+            'course_id',
+            'id',
+            postgresql_where=text('deleted_at IS NULL')
+        ),
+    )
     
     def __repr__(self):
         return f"<Lesson(id={self.id}, name='{self.name}', slug='{self.slug}', course_id={self.course_id})>" 
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+API routers mounted by app.main.
+"""
@@ -0,0 +1,252 @@
+"""
+Async (async def) handlers for the hot course and rating endpoints.
+
+Same paths, parameters and response models as the sync handlers in
+app.main, backed by AsyncCourseService on the asyncpg engine. Mounted
+ahead of the sync handlers when settings.async_endpoints is enabled.
+
+Covers the course reads and every rating endpoint except
+/courses/{course_id}/ratings/trend and /users/{user_id}/ratings, which
+stay on the sync handlers. Responses, status codes and error mapping come
+from app.routers.course_responses, shared with the sync handlers.
+"""
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import course_cache
+from app.core.config import settings
+from app.core.pagination import page_response
+from app.db.base import AsyncSessionLocal, get_async_db
+from app.routers.course_responses import (
+    ADD_RATING_RESPONSES,
+    BULK_RATING_STATS_RESPONSES,
+    COURSE_RATINGS_RESPONSES,
+    DELETE_RATING_RESPONSES,
+    RATING_STATS_RESPONSES,
+    UPDATE_RATING_RESPONSES,
+    USER_RATING_RESPONSES,
+    bulk_stats_course_ids,
+    catalog_response,
+    check_rating_owner,
+    course_detail_response,
+    deleted_rating_response,
+    service_error,
+    user_rating_response
+)
+from app.services.async_course_service import AsyncCourseService
+from app.schemas.rating import (
+    RatingRequest,
+    RatingResponse,
+    RatingStatsResponse,
+    TopRatedCourseResponse
+)
+
+router = APIRouter()
+
+
+def get_async_course_service(db: AsyncSession = Depends(get_async_db)) -> AsyncCourseService:
+    """
+    Dependency to get AsyncCourseService instance
+    """
+    return AsyncCourseService(db, cache=course_cache, session_factory=AsyncSessionLocal)
+
+
+@router.get("/courses", tags=["courses"])
+async def get_courses(
+    course_service: AsyncCourseService = Depends(get_async_course_service)
+) -> list:
+    """
+    Get all courses (async handler).
+    """
+    return catalog_response(await course_service.get_all_courses())
+
+
+@router.get(
+    "/courses/top",
+    response_model=List[TopRatedCourseResponse],
+    tags=["courses"]
+)
+async def get_top_courses(
+    limit: int = Query(10, ge=1, le=settings.leaderboard_max_limit),
+    course_service: AsyncCourseService = Depends(get_async_course_service)
+) -> List[TopRatedCourseResponse]:
+    """
+    Get the top-rated courses leaderboard (async handler).
+    """
+    return catalog_response(await course_service.get_top_courses(limit=limit))
+
+
+@router.get("/courses/{slug}", tags=["courses"])
+async def get_course_by_slug(
+    slug: str,
+    course_service: AsyncCourseService = Depends(get_async_course_service)
+) -> dict:
+    """
+    Get course details by slug (async handler).
+    """
+    return course_detail_response(await course_service.get_course_by_slug(slug))
+
+
+@router.post(
+    "/courses/{course_id}/ratings",
+    response_model=RatingResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["ratings"],
+    responses=ADD_RATING_RESPONSES
+)
+async def add_course_rating(
+    course_id: int,
+    rating_data: RatingRequest,
+    course_service: AsyncCourseService = Depends(get_async_course_service)
+) -> RatingResponse:
+    """
+    Add or update a user's rating for a course (async handler).
+    """
+    try:
+        result = await course_service.add_course_rating(
+            course_id=course_id,
+            user_id=rating_data.user_id,
+            rating=rating_data.rating
+        )
+        return RatingResponse(**result)
+    except ValueError as e:
+        raise service_error(e)
+
+
+@router.get(
+    "/courses/{course_id}/ratings",
+    response_model=List[RatingResponse],
+    tags=["ratings"],
+    responses=COURSE_RATINGS_RESPONSES
+)
+async def get_course_ratings(
+    course_id: int,
+    limit: int = Query(
+        settings.course_ratings_default_limit,
+        ge=1,
+        le=settings.course_ratings_max_limit
+    ),
+    cursor: Optional[str] = Query(None),
+    rating: Optional[int] = Query(None, ge=1, le=5),
+    include_total: bool = Query(False),
+    course_service: AsyncCourseService = Depends(get_async_course_service)
+) -> ORJSONResponse:
+    """
+    Get one page of the active ratings for a course (async handler).
+    """
+    try:
+        page = await course_service.get_course_ratings(
+            course_id,
+            limit=limit,
+            cursor=cursor,
+            rating=rating,
+            include_total=include_total
+        )
+    except ValueError as e:
+        raise service_error(e)
+
+    # Serialización directa con orjson, como en el handler sync
+    return page_response(page)
+
+
+@router.get(
+    "/courses/{course_id}/ratings/stats",
+    response_model=RatingStatsResponse,
+    tags=["ratings"],
+    responses=RATING_STATS_RESPONSES
+)
+async def get_course_rating_stats(
+    course_id: int,
+    course_service: AsyncCourseService = Depends(get_async_course_service)
+) -> RatingStatsResponse:
+    """
+    Get aggregated rating statistics for a course (async handler).
+    """
+    try:
+        stats = await course_service.get_course_rating_stats(course_id)
+        return RatingStatsResponse(**stats)
+    except ValueError as e:
+        raise service_error(e, status.HTTP_404_NOT_FOUND)
+
+
+@router.get(
+    "/ratings/stats",
+    response_model=Dict[int, RatingStatsResponse],
+    tags=["ratings"],
+    responses=BULK_RATING_STATS_RESPONSES
+)
+async def get_bulk_rating_stats(
+    course_ids: List[str] = Query(
+        ...,
+        description="Comma-separated course ids, e.g. 1,2,3"
+    ),
+    course_service: AsyncCourseService = Depends(get_async_course_service)
+) -> Dict[int, RatingStatsResponse]:
+    """
+    Get rating statistics for many courses in one call (async handler).
+    """
+    return await course_service.get_bulk_rating_stats(bulk_stats_course_ids(course_ids))
+
+
+@router.get(
+    "/courses/{course_id}/ratings/user/{user_id}",
+    response_model=RatingResponse | None,
+    tags=["ratings"],
+    responses=USER_RATING_RESPONSES
+)
+async def get_user_course_rating(
+    course_id: int,
+    user_id: int,
+    course_service: AsyncCourseService = Depends(get_async_course_service)
+) -> RatingResponse | None:
+    """
+    Get a specific user's rating for a course (async handler).
+    """
+    return user_rating_response(await course_service.get_user_course_rating(course_id, user_id))
+
+
+@router.put(
+    "/courses/{course_id}/ratings/{user_id}",
+    response_model=RatingResponse,
+    tags=["ratings"],
+    responses=UPDATE_RATING_RESPONSES
+)
+async def update_course_rating(
+    course_id: int,
+    user_id: int,
+    rating_data: RatingRequest,
+    course_service: AsyncCourseService = Depends(get_async_course_service)
+) -> RatingResponse:
+    """
+    Update an existing course rating (async handler).
+    """
+    check_rating_owner(user_id, rating_data)
+
+    try:
+        result = await course_service.update_course_rating(
+            course_id=course_id,
+            user_id=user_id,
+            rating=rating_data.rating
+        )
+        return RatingResponse(**result)
+    except ValueError as e:
+        raise service_error(e, status.HTTP_404_NOT_FOUND)
+
+
+@router.delete(
+    "/courses/{course_id}/ratings/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    tags=["ratings"],
+    responses=DELETE_RATING_RESPONSES
+)
+async def delete_course_rating(
+    course_id: int,
+    user_id: int,
+    course_service: AsyncCourseService = Depends(get_async_course_service)
+) -> None:
+    """
+    Delete (soft delete) a course rating (async handler).
+    """
+    success = await course_service.delete_course_rating(course_id, user_id)
+    return deleted_rating_response(success, course_id, user_id)
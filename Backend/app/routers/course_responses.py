@@ -0,0 +1,140 @@
+"""
+Response building shared by the sync (app.main) and async course handlers.
+
+Both handler sets only call their service and pass the result through
+these helpers, so status codes, error mapping, surrogate keys and the
+OpenAPI response docs stay identical whichever set serves the request.
+"""
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.core.http_cache import add_surrogate_keys, course_key, tag_courses
+from app.core.pagination import PAGE_HEADERS
+from app.core.params import parse_id_list
+from app.schemas.rating import ErrorResponse, RatingRequest, RatingResponse
+
+# Documentación OpenAPI (responses=...) de cada endpoint de ratings
+ADD_RATING_RESPONSES = {
+    201: {"description": "Rating created successfully"},
+    400: {"model": ErrorResponse, "description": "Validation error"},
+    404: {"model": ErrorResponse, "description": "Course not found"}
+}
+COURSE_RATINGS_RESPONSES = {
+    200: {"description": "One page of course ratings", "headers": PAGE_HEADERS},
+    400: {"model": ErrorResponse, "description": "Invalid cursor"},
+    404: {"model": ErrorResponse, "description": "Course not found"}
+}
+RATING_STATS_RESPONSES = {
+    200: {"description": "Course rating statistics"},
+    404: {"model": ErrorResponse, "description": "Course not found"}
+}
+BULK_RATING_STATS_RESPONSES = {
+    200: {"description": "Rating statistics keyed by course id"},
+    400: {"model": ErrorResponse, "description": "Invalid or too many course ids"}
+}
+USER_RATING_RESPONSES = {
+    200: {"description": "User's rating for the course"},
+    204: {"description": "User has not rated this course"}
+}
+UPDATE_RATING_RESPONSES = {
+    200: {"description": "Rating updated successfully"},
+    400: {"model": ErrorResponse, "description": "Validation error"},
+    404: {"model": ErrorResponse, "description": "Rating not found"}
+}
+DELETE_RATING_RESPONSES = {
+    204: {"description": "Rating deleted successfully"},
+    404: {"model": ErrorResponse, "description": "Rating not found"}
+}
+
+
+def service_error(
+    error: ValueError,
+    fallback_status: int = status.HTTP_400_BAD_REQUEST
+) -> HTTPException:
+    """
+    HTTPException for a ValueError raised by a course service.
+
+    Messages containing "not found" map to 404; anything else to
+    fallback_status.
+    """
+    if "not found" in str(error):
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error))
+    return HTTPException(status_code=fallback_status, detail=str(error))
+
+
+def catalog_response(courses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Course list response, tagged with its courses and the catalog key."""
+    tag_courses(courses, catalog=True)
+    return courses
+
+
+def course_detail_response(course: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Course detail response, tagged with the course's surrogate key.
+
+    Raises:
+        HTTPException 404: If the course was not found
+    """
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+
+    add_surrogate_keys(course_key(course["id"]))
+    return course
+
+
+def bulk_stats_course_ids(course_ids: List[str]) -> List[int]:
+    """
+    Parse the course_ids of GET /ratings/stats and tag the response.
+
+    Raises:
+        HTTPException 400: If an id is invalid or there are too many
+    """
+    ids = parse_id_list(course_ids, settings.bulk_stats_max_ids, "course_ids")
+    # Las ids pedidas, no solo las devueltas: crear uno de esos cursos también purga
+    add_surrogate_keys(*(course_key(course_id) for course_id in ids))
+    return ids
+
+
+def user_rating_response(rating: Optional[Dict[str, Any]]) -> RatingResponse:
+    """
+    Response for a user's rating of a course.
+
+    Raises:
+        HTTPException 204: If the user has not rated the course
+    """
+    if rating is None:
+        raise HTTPException(
+            status_code=status.HTTP_204_NO_CONTENT
+        )
+
+    return RatingResponse(**rating)
+
+
+def check_rating_owner(user_id: int, rating_data: RatingRequest) -> None:
+    """
+    Validate that the user_id of a PUT body matches the path.
+
+    Raises:
+        HTTPException 400: If they differ
+    """
+    if rating_data.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="user_id in body must match user_id in path"
+        )
+
+
+def deleted_rating_response(deleted: bool, course_id: int, user_id: int) -> None:
+    """
+    Empty response of DELETE /courses/{course_id}/ratings/{user_id}.
+
+    Raises:
+        HTTPException 404: If there was no active rating to delete
+    """
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No active rating found for user {user_id} on course {course_id}"
+        )
+
+    return None
@@ -2,8 +2,9 @@
 Pydantic schemas for course rating requests and responses.
 Provides validation and serialization for API endpoints.
 """
+from enum import Enum
 from pydantic import BaseModel, Field, field_validator
-from typing import Dict
+from typing import Dict, List, Optional
 
 
 class RatingRequest(BaseModel):
@@ -51,6 +52,18 @@ class RatingResponse(BaseModel):
         from_attributes = True
 
 
+class UserRatingsResponse(BaseModel):
+    """
+    Schema for the active ratings of one user across courses.
+    Ordered by course_id; next_cursor is null on the last page.
+    """
+    items: List[RatingResponse]
+    next_cursor: Optional[int] = Field(
+        None,
+        description="Pass as `after` to fetch the next page"
+    )
+
+
 class RatingStatsResponse(BaseModel):
     """
     Schema for aggregated rating statistics.
@@ -88,6 +101,72 @@ class RatingStatsResponse(BaseModel):
         }
 
 
+class TopRatedCourseResponse(BaseModel):
+    """
+    Schema for a leaderboard entry.
+    Courses are ranked by bayesian_score, not by raw average_rating.
+    """
+    id: int
+    name: str
+    description: str
+    thumbnail: str
+    slug: str
+    average_rating: float = Field(
+        ...,
+        ge=0.0,
+        le=5.0,
+        description="Plain average of active ratings"
+    )
+    total_ratings: int = Field(
+        ...,
+        ge=0,
+        description="Total number of active ratings"
+    )
+    bayesian_score: float = Field(
+        ...,
+        description="Bayesian-weighted average used for ranking"
+    )
+
+
+class TrendGranularity(str, Enum):
+    """Bucket size for rating trends."""
+    hour = "hour"
+    day = "day"
+
+
+class RatingTrendPoint(BaseModel):
+    """
+    Rating activity within one time bucket.
+    """
+    bucket_start: str
+    submitted_count: int = Field(
+        ...,
+        ge=0,
+        description="Ratings created or changed in the bucket"
+    )
+    average_rating: float = Field(
+        ...,
+        ge=0.0,
+        le=5.0,
+        description="Average value of the ratings submitted in the bucket"
+    )
+    removed_count: int = Field(
+        ...,
+        ge=0,
+        description="Ratings deleted in the bucket"
+    )
+
+
+class RatingTrendResponse(BaseModel):
+    """
+    Schema for rating trends of a course.
+    Buckets without activity are omitted.
+    """
+    course_id: int
+    granularity: TrendGranularity
+    points: List[RatingTrendPoint]
+
+
 class ErrorResponse(BaseModel):
     """
     Standard error response schema.
@@ -0,0 +1,111 @@
+"""
+Production server: a gunicorn master supervising uvicorn workers.
+
+    python -m app.server
+
+Everything is configured through the server_* settings:
+- Workers: server_workers, or one per CPU available to the process when
+  0 (CPU affinity and the cgroup v2 quota of the container are honoured).
+  Each worker is a full event loop, so more workers than CPUs only adds
+  memory and database connections.
+- uvloop and httptools in every worker.
+- The app is imported once in the master before forking (server_preload),
+  so workers start fast and share its memory copy-on-write. Connection
+  pools inherited from the master are discarded in each child; per-worker
+  state (caches, LISTEN connection) is created by the app's lifespan.
+- Workers are recycled after server_max_requests requests, plus a random
+  jitter so they don't all restart together, which bounds memory growth.
+- server_keepalive must exceed the load balancer's idle timeout, and
+  server_backlog is the accept() queue of the listening socket.
+
+The development command (`uvicorn app.main:app --reload`) still works for
+local runs; it is a single process with a file watcher.
+"""
+import math
+import os
+from typing import Any, Dict
+
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker
+
+from app.core.config import Settings, settings
+
+
+def available_cpus(cpu_max_path: str = "/sys/fs/cgroup/cpu.max") -> int:
+    """CPUs this process may use: affinity mask, capped by the cgroup v2 quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open(cpu_max_path) as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def worker_count(config: Settings) -> int:
+    return config.server_workers or available_cpus()
+
+
+class ProductionWorker(UvicornWorker):
+    """UvicornWorker with the event loop and HTTP parser from settings."""
+
+    CONFIG_KWARGS = {"loop": settings.server_loop, "http": settings.server_http}
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    """Drop pooled connections inherited from the master (never share sockets across processes)."""
+    from app.db.base import async_engine, engine, replicas
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    for replica in replicas.engines:
+        replica.dispose(close=False)
+
+
+def gunicorn_options(config: Settings) -> Dict[str, Any]:
+    """gunicorn settings derived from the server_* settings."""
+    return {
+        "bind": f"{config.server_host}:{config.server_port}",
+        "workers": worker_count(config),
+        "worker_class": ProductionWorker,
+        "preload_app": config.server_preload,
+        "backlog": config.server_backlog,
+        "keepalive": config.server_keepalive,
+        "max_requests": config.server_max_requests,
+        "max_requests_jitter": config.server_max_requests_jitter,
+        "timeout": config.server_timeout,
+        "graceful_timeout": config.server_graceful_timeout,
+        "forwarded_allow_ips": config.server_forwarded_allow_ips,
+        "accesslog": "-" if config.server_access_log else None,
+        "post_fork": post_fork,
+    }
+
+
+class ProductionServer(BaseApplication):
+    """gunicorn application serving app.main:app with the given options."""
+
+    def __init__(self, options: Dict[str, Any]):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Any:
+        from app.main import app
+
+        return app
+
+
+def main() -> None:
+    ProductionServer(gunicorn_options(settings)).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
 from .course_service import CourseService
+from .async_course_service import AsyncCourseService
 
-__all__ = ['CourseService'] 
\ No newline at end of file
+__all__ = ['CourseService', 'AsyncCourseService']
@@ -0,0 +1,403 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, List, Optional, Dict, Any
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TwoTierCache, cached_read
+from app.db.routing import record_user_write
+from app.models.course import Course
+from app.models.course_rating import CourseRating
+from app.models.course_rating_summary import CourseRatingSummary
+from app.services.course_queries import (
+    ACTIVE_COURSES,
+    ACTIVE_COURSE_ID,
+    COURSE_BY_SLUG,
+    COURSE_RATING_DISTRIBUTION,
+    COURSE_RATING_SUMMARY_COUNTS,
+    COURSE_RATING_TOTALS,
+    USER_COURSE_RATING,
+    course_rating_page,
+    course_rating_page_params,
+    summary_rating_total
+)
+from app.services.course_service import invalidate_course_reads
+from app.services.rating_aggregates import course_ratings_lock, rating_change_statements
+
+
+class AsyncCourseService:
+    """
+    Async counterpart of CourseService for the async request path.
+
+    Same contracts and return shapes as CourseService, executed on an
+    AsyncSession (asyncpg) so endpoints run on the event loop instead of
+    the threadpool. Covers the read endpoints and the rating writes
+    (create, update, delete).
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: Optional[TwoTierCache] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None
+    ):
+        self.db = db
+        # Misma caché (y claves) que CourseService: lo que carga una ruta lo sirve la otra
+        self.cache = cache
+        # Sesiones propias para refrescar la caché en segundo plano (stale-while-revalidate)
+        self.session_factory = session_factory
+
+    @asynccontextmanager
+    async def background_copy(self) -> AsyncIterator["AsyncCourseService"]:
+        """This service on a new session, for work that outlives the request."""
+        async with self.session_factory() as db:
+            yield AsyncCourseService(db, cache=self.cache, session_factory=self.session_factory)
+
+    @cached_read("courses")
+    async def get_all_courses(self) -> List[Dict[str, Any]]:
+        """
+        Get all courses with basic information including rating stats.
+
+        Returns:
+            List of course dictionaries with: id, name, description, thumbnail, slug,
+            average_rating, total_ratings
+        """
+        courses = (await self.db.execute(ACTIVE_COURSES)).scalars().all()
+
+        items = []
+        for course in courses:
+            rating_stats = await self.get_course_rating_stats(course.id)
+            items.append({
+                "id": course.id,
+                "name": course.name,
+                "description": course.description,
+                "thumbnail": course.thumbnail,
+                "slug": course.slug,
+                "average_rating": rating_stats["average_rating"],
+                "total_ratings": rating_stats["total_ratings"]
+            })
+
+        return items
+
+    async def get_course_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
+        """
+        Get course details by slug including teachers and lessons.
+
+        Args:
+            slug: The course slug
+
+        Returns:
+            Course dictionary with teachers and lessons, or None if not found
+        """
+        course = await self._get_course_detail(slug)
+
+        if not course:
+            return None
+
+        rating_stats = await self.get_course_rating_stats(course["id"])
+
+        return {
+            **course,
+            "average_rating": rating_stats["average_rating"],
+            "total_ratings": rating_stats["total_ratings"],
+            "rating_distribution": rating_stats["rating_distribution"]
+        }
+
+    @cached_read("course", key_arg="slug")
+    async def _get_course_detail(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Course, teachers and lessons (without rating stats)."""
+        result = await self.db.execute(COURSE_BY_SLUG, {"slug": slug})
+        course = result.unique().scalars().first()
+
+        if not course:
+            return None
+
+        return {
+            "id": course.id,
+            "name": course.name,
+            "description": course.description,
+            "thumbnail": course.thumbnail,
+            "slug": course.slug,
+            "teacher_id": [teacher.id for teacher in course.teachers],
+            "classes": [
+                {
+                    "id": lesson.id,
+                    "name": lesson.name,
+                    "description": lesson.description,
+                    "slug": lesson.slug
+                }
+                for lesson in course.lessons
+                if lesson.deleted_at is None
+            ]
+        }
+
+    async def get_course_ratings(
+        self,
+        course_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        rating: Optional[int] = None,
+        include_total: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get one page of the active ratings of a course, newest first.
+        Same keyset pagination and return shape as CourseService.
+
+        Raises:
+            ValueError: If course_id doesn't exist or the cursor is malformed
+        """
+        await self._ensure_course_exists(course_id)
+
+        statement, params = course_rating_page_params(course_id, limit, cursor, rating)
+        result = await self.db.execute(statement, params)
+        page = course_rating_page(result.all(), limit)
+
+        page["total"] = None
+        if include_total:
+            result = await self.db.execute(COURSE_RATING_SUMMARY_COUNTS, {"course_id": course_id})
+            page["total"] = summary_rating_total(result.first(), rating)
+
+        return page
+
+    @cached_read("rating_stats", key_arg="course_id")
+    async def get_course_rating_stats(self, course_id: int) -> Dict[str, Any]:
+        """
+        Get aggregated rating statistics for a course.
+
+        Raises:
+            ValueError: If course_id doesn't exist
+        """
+        await self._ensure_course_exists(course_id)
+
+        params = {"course_id": course_id}
+        stats = (await self.db.execute(COURSE_RATING_TOTALS, params)).one()
+        distribution = await self.db.execute(COURSE_RATING_DISTRIBUTION, params)
+
+        rating_distribution = {i: 0 for i in range(1, 6)}
+        for rating_value, count in distribution:
+            rating_distribution[rating_value] = count
+
+        return {
+            "average_rating": round(float(stats.average), 2),
+            "total_ratings": stats.total,
+            "rating_distribution": rating_distribution
+        }
+
+    async def get_bulk_rating_stats(self, course_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get rating statistics for many courses in a single summary-table read.
+        Unknown or deleted courses are omitted.
+        """
+        if not course_ids:
+            return {}
+
+        rows = await self.db.execute(
+            select(Course.id, CourseRatingSummary)
+            .outerjoin(CourseRatingSummary, CourseRatingSummary.course_id == Course.id)
+            .where(
+                Course.id.in_(course_ids),
+                Course.deleted_at.is_(None)
+            )
+        )
+
+        result = {}
+        for course_id, summary in rows:
+            if summary is None or not summary.total_ratings:
+                result[course_id] = {
+                    "average_rating": 0.0,
+                    "total_ratings": 0,
+                    "rating_distribution": {i: 0 for i in range(1, 6)}
+                }
+                continue
+
+            result[course_id] = {
+                "average_rating": summary.average_rating,
+                "total_ratings": summary.total_ratings,
+                "rating_distribution": summary.rating_distribution
+            }
+
+        return result
+
+    async def get_top_courses(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the top-rated courses ranked by Bayesian-weighted average.
+        """
+        rows = await self.db.execute(
+            select(
+                Course.id,
+                Course.name,
+                Course.description,
+                Course.thumbnail,
+                Course.slug,
+                CourseRatingSummary.total_ratings,
+                CourseRatingSummary.rating_sum,
+                CourseRatingSummary.bayesian_score
+            )
+            .join(CourseRatingSummary, CourseRatingSummary.course_id == Course.id)
+            .where(
+                Course.deleted_at.is_(None),
+                CourseRatingSummary.total_ratings > 0
+            )
+            .order_by(
+                CourseRatingSummary.bayesian_score.desc(),
+                CourseRatingSummary.course_id
+            )
+            .limit(limit)
+        )
+
+        return [
+            {
+                "id": row.id,
+                "name": row.name,
+                "description": row.description,
+                "thumbnail": row.thumbnail,
+                "slug": row.slug,
+                "average_rating": round(row.rating_sum / row.total_ratings, 2),
+                "total_ratings": row.total_ratings,
+                "bayesian_score": round(row.bayesian_score, 4)
+            }
+            for row in rows
+        ]
+
+    async def get_user_course_rating(
+        self,
+        course_id: int,
+        user_id: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a specific user's rating for a course, or None if not rated.
+        """
+        rating = await self._get_active_rating(course_id, user_id)
+        return rating.to_dict() if rating else None
+
+    async def add_course_rating(
+        self,
+        course_id: int,
+        user_id: int,
+        rating: int
+    ) -> Dict[str, Any]:
+        """
+        Add a new rating or update existing active rating for a course.
+
+        Derived tables (summary, rollups) are updated in the same transaction.
+
+        Raises:
+            ValueError: If course doesn't exist or rating out of range
+        """
+        if not 1 <= rating <= 5:
+            raise ValueError("Rating must be between 1 and 5")
+
+        await self._ensure_course_exists(course_id)
+        await self.db.execute(course_ratings_lock(course_id))
+
+        existing_rating = await self._get_active_rating(course_id, user_id, for_update=True)
+
+        if existing_rating:
+            previous_rating = existing_rating.rating
+            existing_rating.rating = rating
+            existing_rating.updated_at = datetime.utcnow()
+            target = existing_rating
+        else:
+            previous_rating = None
+            target = CourseRating(
+                course_id=course_id,
+                user_id=user_id,
+                rating=rating
+            )
+            self.db.add(target)
+
+        await self._commit_rating_change(course_id, user_id, previous_rating, rating)
+        await self.db.refresh(target)
+
+        return target.to_dict()
+
+    async def update_course_rating(
+        self,
+        course_id: int,
+        user_id: int,
+        rating: int
+    ) -> Dict[str, Any]:
+        """
+        Update an existing active rating (PUT semantics).
+
+        Raises:
+            ValueError: If rating doesn't exist or is inactive
+        """
+        if not 1 <= rating <= 5:
+            raise ValueError("Rating must be between 1 and 5")
+
+        await self.db.execute(course_ratings_lock(course_id))
+
+        existing_rating = await self._get_active_rating(course_id, user_id, for_update=True)
+
+        if not existing_rating:
+            raise ValueError(
+                f"No active rating found for user {user_id} on course {course_id}"
+            )
+
+        previous_rating = existing_rating.rating
+        existing_rating.rating = rating
+        existing_rating.updated_at = datetime.utcnow()
+        await self._commit_rating_change(course_id, user_id, previous_rating, rating)
+        await self.db.refresh(existing_rating)
+
+        return existing_rating.to_dict()
+
+    async def delete_course_rating(self, course_id: int, user_id: int) -> bool:
+        """
+        Soft delete a course rating.
+
+        Returns:
+            True if rating was deleted, False if rating not found
+        """
+        await self.db.execute(course_ratings_lock(course_id))
+
+        rating_to_delete = await self._get_active_rating(course_id, user_id, for_update=True)
+
+        if not rating_to_delete:
+            return False
+
+        rating_to_delete.deleted_at = datetime.utcnow()
+        rating_to_delete.updated_at = datetime.utcnow()
+        await self._commit_rating_change(course_id, user_id, rating_to_delete.rating, None)
+
+        return True
+
+    async def _commit_rating_change(
+        self,
+        course_id: int,
+        user_id: int,
+        old_rating: Optional[int],
+        new_rating: Optional[int]
+    ) -> None:
+        """Apply one rating write to the derived tables, commit and invalidate reads."""
+        await self.db.flush()
+        for stmt in rating_change_statements(course_id, old_rating, new_rating):
+            await self.db.execute(stmt)
+        await self.db.commit()
+        record_user_write(self.db, user_id)
+        if self.cache is not None:
+            # Un DEL en L2 es E/S bloqueante: fuera del event loop
+            await asyncio.to_thread(invalidate_course_reads, self.cache, course_id)
+
+    async def _ensure_course_exists(self, course_id: int) -> None:
+        """Raise ValueError if the course doesn't exist or is deleted."""
+        course_id_found = (
+            await self.db.execute(ACTIVE_COURSE_ID, {"course_id": course_id})
+        ).scalar()
+
+        if course_id_found is None:
+            raise ValueError(f"Course with id {course_id} not found")
+
+    async def _get_active_rating(
+        self,
+        course_id: int,
+        user_id: int,
+        for_update: bool = False
+    ) -> Optional[CourseRating]:
+        """Active rating of a user for a course, if any (row-locked when for_update)."""
+        result = await self.db.execute(
+            USER_COURSE_RATING.with_for_update() if for_update else USER_COURSE_RATING,
+            {"course_id": course_id, "user_id": user_id}
+        )
+        return result.scalars().first()
@@ -0,0 +1,193 @@
+"""
+Prebuilt statements for the hot CourseService read paths.
+
+Built once at import time with bindparam() placeholders instead of being
+rebuilt by a query chain on every call: the request only pays for binding
+parameters, and the statement's cache key maps to the same entry of the
+engine's compiled cache (query_cache_size) on every execution.
+
+Execute with a parameter dict, e.g.:
+    db.execute(ACTIVE_COURSE_ID, {"course_id": course_id}).scalar()
+
+Shared by CourseService and AsyncCourseService.
+"""
+import base64
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import Integer, bindparam, func, select, tuple_
+from sqlalchemy.orm import joinedload
+from app.models.course import Course
+from app.models.course_rating import CourseRating
+from app.models.course_rating_summary import CourseRatingSummary
+from app.models.lesson import Lesson
+
+# Cursos activos (listado)
+ACTIVE_COURSES = select(Course).where(Course.deleted_at.is_(None))
+
+# Detalle por slug con profesores y lecciones activas (usar .unique() por los joinedload)
+COURSE_BY_SLUG = (
+    select(Course)
+    .options(
+        joinedload(Course.teachers),
+        joinedload(Course.lessons.and_(Lesson.deleted_at.is_(None)))
+    )
+    .where(
+        Course.slug == bindparam("slug"),
+        Course.deleted_at.is_(None)
+    )
+)
+
+# Existencia de un curso activo sin hidratar el objeto: params course_id
+ACTIVE_COURSE_ID = select(Course.id).where(
+    Course.id == bindparam("course_id"),
+    Course.deleted_at.is_(None)
+)
+
+_ACTIVE_COURSE_RATINGS = (
+    CourseRating.course_id == bindparam("course_id"),
+    CourseRating.deleted_at.is_(None)
+)
+
+# Columnas de CourseRating.to_dict(), en el orden de RATING_FIELDS
+RATING_FIELDS = ("id", "course_id", "user_id", "rating", "created_at", "updated_at")
+
+# Ratings activos de un curso, más recientes primero: params course_id
+# Tuplas de columnas, sin entidades: ni identity map ni estado de unit of work
+# Orden (created_at DESC, id DESC): total y estable para el keyset de las páginas
+COURSE_RATING_ROWS = (
+    select(*(getattr(CourseRating, field) for field in RATING_FIELDS))
+    .where(*_ACTIVE_COURSE_RATINGS)
+    .order_by(CourseRating.created_at.desc(), CourseRating.id.desc())
+)
+
+
+def _course_rating_page(after_cursor: bool, by_rating: bool):
+    statement = COURSE_RATING_ROWS.limit(bindparam("limit"))
+    if after_cursor:
+        # Comparación de filas: un solo rango sobre ix_course_ratings_course_created_active
+        statement = statement.where(
+            tuple_(CourseRating.created_at, CourseRating.id) < tuple_(
+                bindparam("cursor_created_at", type_=CourseRating.created_at.type),
+                bindparam("cursor_id", type_=Integer)
+            )
+        )
+    if by_rating:
+        statement = statement.where(CourseRating.rating == bindparam("rating"))
+    return statement
+
+
+# Una página de COURSE_RATING_ROWS por combinación de (cursor, filtro por estrellas)
+# params course_id, limit [, cursor_created_at, cursor_id] [, rating]
+COURSE_RATING_PAGES = {
+    (after_cursor, by_rating): _course_rating_page(after_cursor, by_rating)
+    for after_cursor in (False, True)
+    for by_rating in (False, True)
+}
+
+# Totales materializados (sin COUNT(*)): params course_id
+COURSE_RATING_SUMMARY_COUNTS = select(
+    CourseRatingSummary.total_ratings,
+    *(getattr(CourseRatingSummary, f"rating_{value}_count") for value in range(1, 6))
+).where(CourseRatingSummary.course_id == bindparam("course_id"))
+
+
+def encode_rating_cursor(created_at: datetime, rating_id: int) -> str:
+    """Opaque keyset cursor pointing after the given row."""
+    raw = f"{created_at.isoformat()}|{rating_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_rating_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Inverse of encode_rating_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, rating_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(rating_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def course_rating_page_params(
+    course_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    rating: Optional[int] = None
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Statement and parameters for one page of a course's ratings.
+    Fetches limit + 1 rows to know whether there is a next page.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    params: Dict[str, Any] = {"course_id": course_id, "limit": limit + 1}
+    if cursor is not None:
+        params["cursor_created_at"], params["cursor_id"] = decode_rating_cursor(cursor)
+    if rating is not None:
+        params["rating"] = rating
+    return COURSE_RATING_PAGES[(cursor is not None, rating is not None)], params
+
+
+def course_rating_page(rows: Sequence[Sequence[Any]], limit: int) -> Dict[str, Any]:
+    """Items and next_cursor of a page fetched with course_rating_page_params."""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    last = rows[-1] if has_more else None
+    return {
+        "items": rating_rows_as_dicts(rows),
+        # created_at e id de la última fila (posiciones 4 y 0 de RATING_FIELDS)
+        "next_cursor": encode_rating_cursor(last[4], last[0]) if last else None,
+    }
+
+
+def summary_rating_total(counts: Optional[Sequence[int]], rating: Optional[int] = None) -> int:
+    """Active ratings (of one star value, if given) from a COURSE_RATING_SUMMARY_COUNTS row."""
+    if counts is None:
+        return 0
+    return counts[rating] if rating is not None else counts[0]
+
+
+def rating_rows_as_dicts(rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Rows of COURSE_RATING_ROWS as CourseRating.to_dict() dictionaries.
+    Timestamps are formatted in one pass with the unbound isoformat.
+    """
+    isoformat = datetime.isoformat
+    return [
+        {
+            "id": rating_id,
+            "course_id": course_id,
+            "user_id": user_id,
+            "rating": rating,
+            "created_at": isoformat(created_at) if created_at else None,
+            "updated_at": isoformat(updated_at) if updated_at else None,
+        }
+        for rating_id, course_id, user_id, rating, created_at, updated_at in rows
+    ]
+
+
+# Media y total de ratings activos: params course_id
+# count(*) y no count(id): ix_course_ratings_course_active solo cubre
+# course_id y rating, así el agregado es un index-only scan
+COURSE_RATING_TOTALS = select(
+    func.coalesce(func.avg(CourseRating.rating), 0.0).label('average'),
+    func.count().label('total')
+).where(*_ACTIVE_COURSE_RATINGS)
+
+# Conteo por valor de rating (1-5): params course_id
+COURSE_RATING_DISTRIBUTION = (
+    select(CourseRating.rating, func.count().label('count'))
+    .where(*_ACTIVE_COURSE_RATINGS)
+    .group_by(CourseRating.rating)
+)
+
+# Rating activo de un usuario en un curso: params course_id, user_id
+USER_COURSE_RATING = select(CourseRating).where(
+    *_ACTIVE_COURSE_RATINGS,
+    CourseRating.user_id == bindparam("user_id")
+)
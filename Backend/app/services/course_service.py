@@ -1,11 +1,60 @@
-from typing import List, Optional, Dict, Any
+from typing import Callable, Iterable, Iterator, List, Optional, Dict, Any
+from contextlib import contextmanager
 from datetime import datetime
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, delete, literal_column, union
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.cache import TwoTierCache, cached_read
+from app.core.config import settings
+from app.db.routing import record_user_write, replica_read
 from app.models.course import Course
 from app.models.lesson import Lesson
 from app.models.teacher import Teacher
 from app.models.course_rating import CourseRating
+from app.models.course_rating_summary import CourseRatingSummary
+from app.services.course_queries import (
+    ACTIVE_COURSES,
+    ACTIVE_COURSE_ID,
+    COURSE_BY_SLUG,
+    COURSE_RATING_DISTRIBUTION,
+    COURSE_RATING_SUMMARY_COUNTS,
+    COURSE_RATING_TOTALS,
+    USER_COURSE_RATING,
+    course_rating_page,
+    course_rating_page_params,
+    summary_rating_total
+)
+from app.services.rating_aggregates import (
+    ROLLUP_MODELS,
+    course_ratings_lock,
+    truncate_to_bucket,
+    summary_delta_statement,
+    rollup_delta_statements
+)
+
+
+def invalidate_course_reads(cache: TwoTierCache, course_id: int) -> None:
+    """Drop the cached reads that include a course's rating stats."""
+    cache.invalidate("rating_stats", course_id)
+    cache.invalidate("courses", "all")
+
+
+def invalidate_course_details(cache: TwoTierCache, slugs: Iterable[str]) -> None:
+    """Drop cached course details (keyed by slug) and the catalog after course data changes."""
+    cache.invalidate("course", *slugs)
+    cache.invalidate("courses", "all")
+
+
+def evict_course_reads(cache: TwoTierCache, kind: str, course_id: int) -> None:
+    """
+    Drop a course's cached reads from this worker's L1 after another
+    worker's write (see app.db.cache_invalidation). Course data changes
+    also drop every cached detail, since details are keyed by slug.
+    """
+    cache.evict_local("rating_stats", course_id)
+    cache.evict_local("courses", "all")
+    if kind == "course":
+        cache.evict_local_namespace("course")
 
 
 class CourseService:
@@ -14,9 +63,34 @@ class CourseService:
     Implements the contract specifications for course endpoints.
     """
 
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        cache: Optional[TwoTierCache] = None,
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
         self.db = db
+        # Caché opcional de lecturas (catálogo, detalle, stats); None = siempre BD
+        self.cache = cache
+        # Sesiones propias para refrescar la caché en segundo plano (stale-while-revalidate)
+        self.session_factory = session_factory
+
+    @contextmanager
+    def background_copy(self) -> Iterator["CourseService"]:
+        """This service on a new session, for work that outlives the request."""
+        db = self.session_factory()
+        try:
+            yield CourseService(db, cache=self.cache, session_factory=self.session_factory)
+        finally:
+            db.close()
 
+    def _invalidate_course_cache(self, course_id: int) -> None:
+        """Drop cached reads derived from a course's ratings (after commit)."""
+        if self.cache is not None:
+            invalidate_course_reads(self.cache, course_id)
+
+    @cached_read("courses")
+    @replica_read
     def get_all_courses(self) -> List[Dict[str, Any]]:
         """
         Get all courses with basic information including rating stats.
@@ -25,7 +99,7 @@ class CourseService:
             List of course dictionaries with: id, name, description, thumbnail, slug,
             average_rating, total_ratings
         """
-        courses = self.db.query(Course).filter(Course.deleted_at.is_(None)).all()
+        courses = self.db.execute(ACTIVE_COURSES).scalars().all()
 
         result = []
         for course in courses:
@@ -51,6 +125,7 @@ class CourseService:
 
         return result
 
+    @replica_read
     def get_course_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
         """
         Get course details by slug including teachers and lessons.
@@ -61,23 +136,16 @@ class CourseService:
         Returns:
             Course dictionary with teachers and lessons, or None if not found
         """
-        course = (
-            self.db.query(Course)
-            .options(
-                joinedload(Course.teachers),
-                joinedload(Course.lessons)
-            )
-            .filter(Course.slug == slug)
-            .filter(Course.deleted_at.is_(None))
-            .first()
-        )
-        
+        # Cursos, profesores y clases no cambian vía API: se cachean aparte de
+        # las stats, que se invalidan con cada escritura de rating
+        course = self._get_course_detail(slug)
+
         if not course:
             return None
 
         # Obtener stats de ratings eficientemente
         try:
-            rating_stats = self.get_course_rating_stats(course.id)
+            rating_stats = self.get_course_rating_stats(course["id"])
         except ValueError:
             # Si falla, usar valores por defecto
             rating_stats = {
@@ -86,6 +154,27 @@ class CourseService:
                 "rating_distribution": {i: 0 for i in range(1, 6)}
             }
 
+        return {
+            **course,
+            # NUEVOS CAMPOS DE RATING
+            "average_rating": rating_stats["average_rating"],
+            "total_ratings": rating_stats["total_ratings"],
+            "rating_distribution": rating_stats["rating_distribution"]
+        }
+
+    @cached_read("course", key_arg="slug")
+    def _get_course_detail(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Course, teachers and lessons (without rating stats)."""
+        course = (
+            self.db.execute(COURSE_BY_SLUG, {"slug": slug})
+            .unique()
+            .scalars()
+            .first()
+        )
+
+        if not course:
+            return None
+
         return {
             "id": course.id,
             "name": course.name,
@@ -102,47 +191,53 @@ class CourseService:
                 }
                 for lesson in course.lessons
                 if lesson.deleted_at is None
-            ],
-            # NUEVOS CAMPOS DE RATING
-            "average_rating": rating_stats["average_rating"],
-            "total_ratings": rating_stats["total_ratings"],
-            "rating_distribution": rating_stats["rating_distribution"]
+            ]
         }
 
-    def get_course_ratings(self, course_id: int) -> List[Dict[str, Any]]:
+    @replica_read
+    def get_course_ratings(
+        self,
+        course_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        rating: Optional[int] = None,
+        include_total: bool = False
+    ) -> Dict[str, Any]:
         """
-        Get all active ratings for a specific course.
+        Get one page of the active ratings of a course, newest first.
+
+        Keyset pagination on (created_at DESC, id DESC), served by the
+        partial index ix_course_ratings_course_created_active: every page is
+        one index range scan, however deep the cursor is.
 
         Args:
             course_id: The course ID
+            limit: Page size
+            cursor: next_cursor of the previous page
+            rating: Only ratings with this star value (1-5)
+            include_total: Also return the number of matching ratings, read
+                from course_rating_summaries (no COUNT(*))
 
         Returns:
-            List of rating dictionaries with user_id, rating, timestamps
+            Dictionary with:
+            - items: list of rating dictionaries with user_id, rating, timestamps
+            - next_cursor: opaque cursor for the next page, or None
+            - total: matching active ratings, or None if not requested
 
         Raises:
-            ValueError: If course_id doesn't exist
+            ValueError: If course_id doesn't exist or the cursor is malformed
         """
-        # Validar que el curso exists
-        course = self.db.query(Course).filter(
-            Course.id == course_id,
-            Course.deleted_at.is_(None)
-        ).first()
+        self._ensure_course_exists(course_id)
 
-        if not course:
-            raise ValueError(f"Course with id {course_id} not found")
+        statement, params = course_rating_page_params(course_id, limit, cursor, rating)
+        page = course_rating_page(self.db.execute(statement, params).all(), limit)
 
-        # Query optimizado para obtener ratings
-        ratings = (
-            self.db.query(CourseRating)
-            .filter(
-                CourseRating.course_id == course_id,
-                CourseRating.deleted_at.is_(None)
-            )
-            .order_by(CourseRating.created_at.desc())
-            .all()
-        )
+        page["total"] = None
+        if include_total:
+            counts = self.db.execute(COURSE_RATING_SUMMARY_COUNTS, {"course_id": course_id}).first()
+            page["total"] = summary_rating_total(counts, rating)
 
-        return [rating.to_dict() for rating in ratings]
+        return page
 
     def add_course_rating(
         self,
@@ -183,6 +278,8 @@ class CourseService:
         if not course:
             raise ValueError(f"Course with id {course_id} not found")
 
+        self._lock_course_ratings(course_id)
+
         # Buscar rating existente ACTIVO del usuario para este curso
         existing_rating = (
             self.db.query(CourseRating)
@@ -191,15 +288,20 @@ class CourseService:
                 CourseRating.user_id == user_id,
                 CourseRating.deleted_at.is_(None)
             )
+            # Bloquea la fila: el delta se calcula sobre el valor que se reemplaza
+            .with_for_update()
             .first()
         )
 
         if existing_rating:
             # ACTUALIZAR rating existente
+            previous_rating = existing_rating.rating
             existing_rating.rating = rating
             existing_rating.updated_at = datetime.utcnow()
-            self.db.flush()
+            self._record_rating_change(course_id, previous_rating, rating)
             self.db.commit()
+            record_user_write(self.db, user_id)
+            self._invalidate_course_cache(course_id)
             self.db.refresh(existing_rating)
             return existing_rating.to_dict()
         else:
@@ -210,7 +312,10 @@ class CourseService:
                 rating=rating
             )
             self.db.add(new_rating)
+            self._record_rating_change(course_id, None, rating)
             self.db.commit()
+            record_user_write(self.db, user_id)
+            self._invalidate_course_cache(course_id)
             self.db.refresh(new_rating)
             return new_rating.to_dict()
 
@@ -241,6 +346,8 @@ class CourseService:
         if not 1 <= rating <= 5:
             raise ValueError("Rating must be between 1 and 5")
 
+        self._lock_course_ratings(course_id)
+
         # Buscar rating ACTIVO existente
         existing_rating = (
             self.db.query(CourseRating)
@@ -249,6 +356,8 @@ class CourseService:
                 CourseRating.user_id == user_id,
                 CourseRating.deleted_at.is_(None)
             )
+            # Bloquea la fila: el delta se calcula sobre el valor que se reemplaza
+            .with_for_update()
             .first()
         )
 
@@ -258,9 +367,13 @@ class CourseService:
             )
 
         # Actualizar rating
+        previous_rating = existing_rating.rating
         existing_rating.rating = rating
         existing_rating.updated_at = datetime.utcnow()
+        self._record_rating_change(course_id, previous_rating, rating)
         self.db.commit()
+        record_user_write(self.db, user_id)
+        self._invalidate_course_cache(course_id)
         self.db.refresh(existing_rating)
 
         return existing_rating.to_dict()
@@ -279,6 +392,8 @@ class CourseService:
         Returns:
             True if rating was deleted, False if rating not found
         """
+        self._lock_course_ratings(course_id)
+
         # Buscar rating ACTIVO
         rating_to_delete = (
             self.db.query(CourseRating)
@@ -287,6 +402,8 @@ class CourseService:
                 CourseRating.user_id == user_id,
                 CourseRating.deleted_at.is_(None)
             )
+            # Bloquea la fila: el delta se calcula sobre el valor que se reemplaza
+            .with_for_update()
             .first()
         )
 
@@ -296,10 +413,14 @@ class CourseService:
         # Soft delete: establecer deleted_at
         rating_to_delete.deleted_at = datetime.utcnow()
         rating_to_delete.updated_at = datetime.utcnow()
+        self._record_rating_change(course_id, rating_to_delete.rating, None)
         self.db.commit()
+        record_user_write(self.db, user_id)
+        self._invalidate_course_cache(course_id)
 
         return True
 
+    @replica_read(user_arg="user_id")
     def get_user_course_rating(
         self,
         course_id: int,
@@ -321,21 +442,79 @@ class CourseService:
             Rating dictionary if exists and active, None otherwise
         """
         # Buscar rating activo específico
-        rating = (
+        rating = self.db.execute(
+            USER_COURSE_RATING,
+            {"course_id": course_id, "user_id": user_id}
+        ).scalars().first()
+
+        if not rating:
+            return None
+
+        return rating.to_dict()
+
+    @replica_read(user_arg="user_id")
+    def get_user_ratings(
+        self,
+        user_id: int,
+        course_ids: Optional[List[int]] = None,
+        after_course_id: Optional[int] = None,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Get a user's active ratings across many courses.
+
+        Served by the partial index ix_course_ratings_user_course_active
+        (user_id, course_id) WHERE deleted_at IS NULL: one index range scan
+        instead of one request per course.
+
+        Args:
+            user_id: The user ID
+            course_ids: Restrict to these courses (no pagination)
+            after_course_id: Keyset cursor, return courses after this ID
+            limit: Page size when course_ids is not given
+
+        Returns:
+            Dictionary with:
+            - items: list of rating dictionaries ordered by course_id
+            - next_cursor: course_id to continue from, or None
+        """
+        query = (
             self.db.query(CourseRating)
             .filter(
-                CourseRating.course_id == course_id,
                 CourseRating.user_id == user_id,
                 CourseRating.deleted_at.is_(None)
             )
-            .first()
         )
 
-        if not rating:
-            return None
+        if course_ids is not None:
+            if not course_ids:
+                return {"items": [], "next_cursor": None}
 
-        return rating.to_dict()
+            ratings = (
+                query.filter(CourseRating.course_id.in_(course_ids))
+                .order_by(CourseRating.course_id)
+                .all()
+            )
+            return {
+                "items": [rating.to_dict() for rating in ratings],
+                "next_cursor": None
+            }
+
+        if after_course_id is not None:
+            query = query.filter(CourseRating.course_id > after_course_id)
+
+        # limit + 1 para saber si hay otra página sin hacer COUNT(*)
+        ratings = query.order_by(CourseRating.course_id).limit(limit + 1).all()
+        has_more = len(ratings) > limit
+        ratings = ratings[:limit]
 
+        return {
+            "items": [rating.to_dict() for rating in ratings],
+            "next_cursor": ratings[-1].course_id if has_more else None
+        }
+
+    @cached_read("rating_stats", key_arg="course_id")
+    @replica_read
     def get_course_rating_stats(self, course_id: int) -> Dict[str, Any]:
         """
         Get aggregated rating statistics for a course.
@@ -352,49 +531,407 @@ class CourseService:
             - total_ratings: int
             - rating_distribution: dict with counts per rating value (1-5)
         """
-        # Validar que el curso existe
-        course = self.db.query(Course).filter(
-            Course.id == course_id,
-            Course.deleted_at.is_(None)
-        ).first()
+        self._ensure_course_exists(course_id)
+        params = {"course_id": course_id}
 
-        if not course:
+        # Agregación SQL eficiente
+        stats = self.db.execute(COURSE_RATING_TOTALS, params).one()
+
+        # Distribución de ratings (cuántos 1, 2, 3, 4, 5 estrellas)
+        distribution_query = self.db.execute(COURSE_RATING_DISTRIBUTION, params).all()
+
+        # Construir diccionario de distribución
+        rating_distribution = {i: 0 for i in range(1, 6)}
+        for rating_value, count in distribution_query:
+            rating_distribution[rating_value] = count
+
+        return {
+            "average_rating": round(float(stats.average), 2),
+            "total_ratings": stats.total,
+            "rating_distribution": rating_distribution
+        } 
+
+    @replica_read
+    def get_bulk_rating_stats(self, course_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get rating statistics for many courses in a single query.
+
+        Reads the materialized course_rating_summaries table joined to
+        courses (one grouped read instead of 3 queries per course).
+
+        Args:
+            course_ids: The course IDs
+
+        Returns:
+            Dictionary keyed by course ID with the same shape as
+            get_course_rating_stats. Unknown or deleted courses are omitted;
+            courses without ratings get zeroed stats.
+        """
+        if not course_ids:
+            return {}
+
+        rows = (
+            self.db.query(Course.id, CourseRatingSummary)
+            .outerjoin(CourseRatingSummary, CourseRatingSummary.course_id == Course.id)
+            .filter(
+                Course.id.in_(course_ids),
+                Course.deleted_at.is_(None)
+            )
+            .all()
+        )
+
+        result = {}
+        for course_id, summary in rows:
+            if summary is None or not summary.total_ratings:
+                result[course_id] = {
+                    "average_rating": 0.0,
+                    "total_ratings": 0,
+                    "rating_distribution": {i: 0 for i in range(1, 6)}
+                }
+                continue
+
+            result[course_id] = {
+                "average_rating": summary.average_rating,
+                "total_ratings": summary.total_ratings,
+                "rating_distribution": summary.rating_distribution
+            }
+
+        return result
+
+    def _ensure_course_exists(self, course_id: int) -> None:
+        """Raise ValueError if the course doesn't exist or is deleted."""
+        found = self.db.execute(ACTIVE_COURSE_ID, {"course_id": course_id}).scalar()
+
+        if found is None:
             raise ValueError(f"Course with id {course_id} not found")
 
-        # Agregación SQL eficiente
-        stats = (
+    # ==================== LEADERBOARD ====================
+
+    @replica_read
+    def get_top_courses(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the top-rated courses ranked by Bayesian-weighted average.
+
+        Reads the materialized course_rating_summaries table: a single range
+        scan over ix_course_rating_summaries_score, no aggregation per request.
+
+        Args:
+            limit: Maximum number of courses to return
+
+        Returns:
+            List of course dictionaries ordered by bayesian_score (best first)
+        """
+        rows = (
             self.db.query(
-                func.coalesce(func.avg(CourseRating.rating), 0.0).label('average'),
-                func.count(CourseRating.id).label('total')
+                Course.id,
+                Course.name,
+                Course.description,
+                Course.thumbnail,
+                Course.slug,
+                CourseRatingSummary.total_ratings,
+                CourseRatingSummary.rating_sum,
+                CourseRatingSummary.bayesian_score
             )
+            .join(CourseRatingSummary, CourseRatingSummary.course_id == Course.id)
             .filter(
-                CourseRating.course_id == course_id,
-                CourseRating.deleted_at.is_(None)
+                Course.deleted_at.is_(None),
+                CourseRatingSummary.total_ratings > 0
             )
-            .first()
+            .order_by(
+                CourseRatingSummary.bayesian_score.desc(),
+                CourseRatingSummary.course_id
+            )
+            .limit(limit)
+            .all()
         )
 
-        # Distribución de ratings (cuántos 1, 2, 3, 4, 5 estrellas)
-        distribution_query = (
-            self.db.query(
-                CourseRating.rating,
-                func.count(CourseRating.id).label('count')
+        return [
+            {
+                "id": row.id,
+                "name": row.name,
+                "description": row.description,
+                "thumbnail": row.thumbnail,
+                "slug": row.slug,
+                "average_rating": round(row.rating_sum / row.total_ratings, 2),
+                "total_ratings": row.total_ratings,
+                "bayesian_score": round(row.bayesian_score, 4)
+            }
+            for row in rows
+        ]
+
+    def rebuild_rating_summaries(self, chunk_size: int = 100) -> int:
+        """
+        Recompute every course_rating_summaries row from course_ratings.
+
+        Used to backfill the table after the migration and to repair drift.
+        Incremental maintenance happens in _apply_rating_delta. Like the
+        rollup backfill, works in short per-chunk transactions holding the
+        courses' rating advisory locks (see _locked_course_chunks).
+
+        Args:
+            chunk_size: Number of courses per transaction
+
+        Returns:
+            Number of courses with a summary row after the rebuild
+        """
+        ratings = CourseRating.__table__
+        summary = CourseRatingSummary.__table__
+        m = settings.leaderboard_prior_weight
+        c = settings.leaderboard_prior_mean
+
+        total = func.count(ratings.c.id)
+        rating_sum = func.coalesce(func.sum(ratings.c.rating), 0)
+        aggregates = (
+            select(
+                ratings.c.course_id,
+                total,
+                rating_sum,
+                *[
+                    func.count(ratings.c.id).filter(ratings.c.rating == value)
+                    for value in range(1, 6)
+                ],
+                (m * c + rating_sum) / (m + total),
+                func.now()
             )
+            .where(ratings.c.deleted_at.is_(None))
+            .group_by(ratings.c.course_id)
+        )
+        columns = [
+            summary.c.course_id,
+            summary.c.total_ratings,
+            summary.c.rating_sum,
+            *[summary.c[f"rating_{value}_count"] for value in range(1, 6)],
+            summary.c.bayesian_score,
+            summary.c.updated_at
+        ]
+
+        rebuilt = 0
+        for ids in self._locked_course_chunks([ratings.c.course_id, summary.c.course_id], chunk_size):
+            self.db.execute(delete(summary).where(summary.c.course_id.in_(ids)))
+            result = self.db.execute(
+                pg_insert(summary).from_select(columns, aggregates.where(ratings.c.course_id.in_(ids)))
+            )
+            self.db.commit()
+            rebuilt += result.rowcount
+
+        return rebuilt
+
+    def _locked_course_chunks(self, course_id_columns: List, chunk_size: int) -> Iterator[List[int]]:
+        """
+        Course ids found in any of course_id_columns, chunk_size at a time
+        (keyset on course_id), with the chunk's rating advisory locks taken.
+
+        The caller rebuilds the chunk's derived rows and commits before
+        asking for the next one, so rating writes to a course wait only
+        while its chunk is rebuilt and readers never see it half done.
+        """
+        course_ids = union(*[select(column) for column in course_id_columns]).subquery()
+        course_id = course_ids.c[0]
+
+        last_id = 0
+        while True:
+            ids = self.db.execute(
+                select(course_id).where(course_id > last_id).order_by(course_id).limit(chunk_size)
+            ).scalars().all()
+            if not ids:
+                return
+            # En orden de id: dos reconstrucciones concurrentes no se interbloquean
+            for locked_id in ids:
+                self._lock_course_ratings(locked_id)
+            yield ids
+            last_id = ids[-1]
+
+    def _lock_course_ratings(self, course_id: int) -> None:
+        """
+        Take the course's rating advisory lock (see rating_aggregates) before
+        reading the rating to change. No-op outside PostgreSQL.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(course_ratings_lock(course_id))
+
+    def _record_rating_change(
+        self,
+        course_id: int,
+        old_rating: Optional[int],
+        new_rating: Optional[int]
+    ) -> None:
+        """
+        Propagate a rating write to every derived table.
+
+        Single hook called by all rating write paths (create, update, delete)
+        before commit, so derived data commits atomically with the rating.
+        The rating row is flushed first, before the derived tables.
+        """
+        self.db.flush()
+        self._apply_rating_delta(course_id, old_rating, new_rating)
+        self._apply_rollup_delta(course_id, old_rating, new_rating)
+
+    def _apply_rating_delta(
+        self,
+        course_id: int,
+        old_rating: Optional[int],
+        new_rating: Optional[int]
+    ) -> None:
+        """
+        Incrementally maintain the summary row of a course after a rating write.
+
+        Runs an atomic UPSERT inside the caller's transaction, so the summary
+        commits (or rolls back) together with the rating itself.
+
+        Args:
+            course_id: The course ID
+            old_rating: Previous active value (None when creating)
+            new_rating: New active value (None when deleting)
+        """
+        self.db.execute(summary_delta_statement(course_id, old_rating, new_rating))
+
+    # ==================== TREND ROLLUPS ====================
+
+    @replica_read
+    def get_course_rating_trend(
+        self,
+        course_id: int,
+        granularity: str,
+        start: datetime,
+        end: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Get rating activity per time bucket for a course.
+
+        Reads only the hourly/daily rollup tables (primary key range scan),
+        never course_ratings. Buckets without activity are omitted.
+
+        Args:
+            course_id: The course ID
+            granularity: "hour" or "day"
+            start: Inclusive lower bound (truncated to its bucket)
+            end: Exclusive upper bound
+
+        Returns:
+            List of buckets ordered by bucket_start ascending
+
+        Raises:
+            ValueError: If course_id doesn't exist or is deleted
+        """
+        self._ensure_course_exists(course_id)
+
+        model = ROLLUP_MODELS[granularity]
+
+        buckets = (
+            self.db.query(model)
             .filter(
-                CourseRating.course_id == course_id,
-                CourseRating.deleted_at.is_(None)
+                model.course_id == course_id,
+                model.bucket_start >= truncate_to_bucket(start, granularity),
+                model.bucket_start < end
             )
-            .group_by(CourseRating.rating)
+            .order_by(model.bucket_start)
             .all()
         )
 
-        # Construir diccionario de distribución
-        rating_distribution = {i: 0 for i in range(1, 6)}
-        for rating_value, count in distribution_query:
-            rating_distribution[rating_value] = count
+        return [
+            {
+                "bucket_start": bucket.bucket_start.isoformat(),
+                "submitted_count": bucket.submitted_count,
+                "average_rating": bucket.average_rating,
+                "removed_count": bucket.removed_count
+            }
+            for bucket in buckets
+        ]
 
-        return {
-            "average_rating": round(float(stats.average), 2),
-            "total_ratings": stats.total,
-            "rating_distribution": rating_distribution
-        } 
\ No newline at end of file
+    def backfill_rating_rollups(self, chunk_size: int = 100):
+        """
+        Rebuild the hourly and daily rollups from course_ratings history.
+
+        Works in chunks of courses (see _locked_course_chunks): each one is
+        a short transaction that replaces the courses' rollup rows under
+        their rating advisory locks, so no write is missed or counted twice
+        and readers see either the old or the new rollups of a course.
+
+        Note: course_ratings only keeps the latest value of each rating, so
+        the backfill attributes it to the bucket of created_at; intermediate
+        updates made before rollups existed cannot be recovered.
+
+        Args:
+            chunk_size: Number of courses per transaction
+
+        Yields:
+            Last processed course id after each committed chunk
+        """
+        ratings = CourseRating.__table__
+        rollup_course_ids = [model.__table__.c.course_id for model in ROLLUP_MODELS.values()]
+
+        for ids in self._locked_course_chunks([ratings.c.course_id, *rollup_course_ids], chunk_size):
+            for model in ROLLUP_MODELS.values():
+                self.db.execute(delete(model.__table__).where(model.__table__.c.course_id.in_(ids)))
+            for granularity, model in ROLLUP_MODELS.items():
+                self._merge_rollup_chunk(model, granularity, ratings.c.course_id.in_(ids))
+
+            self.db.commit()
+            yield ids[-1]
+
+    def _merge_rollup_chunk(self, model, granularity: str, in_chunk) -> None:
+        """Aggregate one chunk of course_ratings and add it to a rollup table."""
+        ratings = CourseRating.__table__
+        rollup = model.__table__
+        # Literal (no bind param) para que SELECT y GROUP BY usen la misma expresión
+        unit = literal_column(f"'{granularity}'")
+
+        submitted_bucket = func.date_trunc(unit, ratings.c.created_at)
+        submitted = (
+            select(
+                ratings.c.course_id,
+                submitted_bucket,
+                func.count(ratings.c.id),
+                func.sum(ratings.c.rating),
+                0
+            )
+            .where(in_chunk)
+            .group_by(ratings.c.course_id, submitted_bucket)
+        )
+
+        removed_bucket = func.date_trunc(unit, ratings.c.deleted_at)
+        removed = (
+            select(
+                ratings.c.course_id,
+                removed_bucket,
+                0,
+                0,
+                func.count(ratings.c.id)
+            )
+            .where(in_chunk, ratings.c.deleted_at.is_not(None))
+            .group_by(ratings.c.course_id, removed_bucket)
+        )
+
+        columns = [
+            rollup.c.course_id,
+            rollup.c.bucket_start,
+            rollup.c.submitted_count,
+            rollup.c.submitted_sum,
+            rollup.c.removed_count
+        ]
+        for aggregates in (submitted, removed):
+            stmt = pg_insert(rollup).from_select(columns, aggregates)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[rollup.c.course_id, rollup.c.bucket_start],
+                set_={
+                    "submitted_count": rollup.c.submitted_count + stmt.excluded.submitted_count,
+                    "submitted_sum": rollup.c.submitted_sum + stmt.excluded.submitted_sum,
+                    "removed_count": rollup.c.removed_count + stmt.excluded.removed_count
+                }
+            )
+            self.db.execute(stmt)
+
+    def _apply_rollup_delta(
+        self,
+        course_id: int,
+        old_rating: Optional[int],
+        new_rating: Optional[int]
+    ) -> None:
+        """
+        Add a rating event to the current hourly and daily buckets.
+
+        Created or changed ratings count as a submission of the new value;
+        deleted ratings count as a removal.
+        """
+        for stmt in rollup_delta_statements(course_id, old_rating, new_rating):
+            self.db.execute(stmt)
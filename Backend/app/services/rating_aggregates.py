@@ -0,0 +1,160 @@
+"""
+Derived rating data shared by the sync and async course services.
+
+Builds the statements that keep course_rating_summaries (leaderboard and
+stats) and the hourly/daily rollups in sync with every rating write. The
+statements are executed by the caller inside its own transaction.
+
+Rating writes and rebuilds of a course's derived rows serialise on a
+transaction-level advisory lock per course (course_ratings_lock), taken
+before anything else, so a rebuild never misses or double-counts a write
+and writes to other courses never wait.
+"""
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.config import settings
+from app.models.course_rating_summary import CourseRatingSummary
+from app.models.course_rating_rollup import (
+    CourseRatingRollupHourly,
+    CourseRatingRollupDaily
+)
+
+# Primera clave de pg_advisory_xact_lock(int, int); la segunda es el course_id
+RATING_LOCK_CLASS = 4201
+
+# Granularidad de tendencias -> tabla de rollup
+ROLLUP_MODELS = {
+    "hour": CourseRatingRollupHourly,
+    "day": CourseRatingRollupDaily,
+}
+
+
+def course_ratings_lock(course_id: int):
+    """SELECT taking the advisory lock of a course's ratings until commit/rollback."""
+    return select(func.pg_advisory_xact_lock(RATING_LOCK_CLASS, course_id))
+
+
+def truncate_to_bucket(timestamp: datetime, granularity: str) -> datetime:
+    """Truncate a timestamp to the start of its hourly or daily bucket."""
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def bayesian_score(rating_sum: int, total_ratings: int) -> float:
+    """
+    Bayesian-weighted average used to rank courses.
+
+    score = (m * C + rating_sum) / (m + total_ratings)
+
+    Where m (prior weight) and C (prior mean) come from settings. Courses with
+    few votes stay close to C; the score converges to the plain average as
+    votes accumulate.
+    """
+    m = settings.leaderboard_prior_weight
+    c = settings.leaderboard_prior_mean
+    return (m * c + rating_sum) / (m + max(total_ratings, 0))
+
+
+def summary_delta_statement(
+    course_id: int,
+    old_rating: Optional[int],
+    new_rating: Optional[int]
+):
+    """
+    UPSERT applying one rating write to the course summary row.
+
+    Args:
+        course_id: The course ID
+        old_rating: Previous active value (None when creating)
+        new_rating: New active value (None when deleting)
+    """
+    count_delta = int(new_rating is not None) - int(old_rating is not None)
+    sum_delta = (new_rating or 0) - (old_rating or 0)
+
+    bucket_deltas = {value: 0 for value in range(1, 6)}
+    if old_rating is not None:
+        bucket_deltas[old_rating] -= 1
+    if new_rating is not None:
+        bucket_deltas[new_rating] += 1
+
+    summary = CourseRatingSummary.__table__
+    m = settings.leaderboard_prior_weight
+    c = settings.leaderboard_prior_mean
+    new_total = summary.c.total_ratings + count_delta
+    new_sum = summary.c.rating_sum + sum_delta
+    now = datetime.utcnow()
+
+    stmt = pg_insert(summary).values(
+        course_id=course_id,
+        total_ratings=count_delta,
+        rating_sum=sum_delta,
+        **{f"rating_{value}_count": delta for value, delta in bucket_deltas.items()},
+        bayesian_score=bayesian_score(sum_delta, count_delta),
+        updated_at=now
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[summary.c.course_id],
+        set_={
+            "total_ratings": new_total,
+            "rating_sum": new_sum,
+            **{
+                f"rating_{value}_count": summary.c[f"rating_{value}_count"] + delta
+                for value, delta in bucket_deltas.items()
+                if delta
+            },
+            "bayesian_score": (m * c + new_sum) / (m + new_total),
+            "updated_at": now
+        }
+    )
+
+
+def rollup_delta_statements(
+    course_id: int,
+    old_rating: Optional[int],
+    new_rating: Optional[int]
+) -> List:
+    """
+    UPSERTs adding one rating event to the current hourly and daily buckets.
+
+    Created or changed ratings count as a submission of the new value;
+    deleted ratings count as a removal.
+    """
+    submitted = int(new_rating is not None)
+    removed = int(new_rating is None and old_rating is not None)
+    now = datetime.utcnow()
+
+    statements = []
+    for granularity, model in ROLLUP_MODELS.items():
+        rollup = model.__table__
+        stmt = pg_insert(rollup).values(
+            course_id=course_id,
+            bucket_start=truncate_to_bucket(now, granularity),
+            submitted_count=submitted,
+            submitted_sum=new_rating or 0,
+            removed_count=removed
+        )
+        statements.append(stmt.on_conflict_do_update(
+            index_elements=[rollup.c.course_id, rollup.c.bucket_start],
+            set_={
+                "submitted_count": rollup.c.submitted_count + submitted,
+                "submitted_sum": rollup.c.submitted_sum + (new_rating or 0),
+                "removed_count": rollup.c.removed_count + removed
+            }
+        ))
+
+    return statements
+
+
+def rating_change_statements(
+    course_id: int,
+    old_rating: Optional[int],
+    new_rating: Optional[int]
+) -> List:
+    """All derived-data statements for one rating write, in execution order."""
+    return [
+        summary_delta_statement(course_id, old_rating, new_rating),
+        *rollup_delta_statements(course_id, old_rating, new_rating)
+    ]
@@ -1,6 +1,12 @@
+import os
+import msgpack
 import pytest
 from unittest.mock import Mock
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter
+from app.db.statement_timeout import StatementTimeoutStats
 from app.main import app, get_course_service
 from app.services.course_service import CourseService
 
@@ -81,6 +87,11 @@ class TestRootEndpoint:
         assert response.status_code == 200
         assert response.json() == {"message": "Bienvenido a Platziflix API"}
 
+    def test_root_reports_server_timing(self, client):
+        """Test that responses carry the db Server-Timing metric"""
+        response = client.get("/")
+        assert response.headers["server-timing"] == 'db;dur=0.0;desc="0 queries"'
+
 
 class TestHealthEndpoint:
     """Tests for the health check endpoint"""
@@ -104,6 +115,32 @@ class TestHealthEndpoint:
         assert isinstance(data["version"], str)
         assert isinstance(data["database"], bool)
 
+    def test_health_rate_limited(self, client, monkeypatch):
+        """Test that health checks beyond the limit get 429 with Retry-After"""
+        monkeypatch.setattr("app.main.health_rate_limiter", RateLimiter(max_calls=1, period=30.0))
+
+        client.get("/health")
+        response = client.get("/health")
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "30"
+
+    def test_livez_never_touches_database(self, client):
+        """Test that the liveness probe answers without queries"""
+        response = client.get("/livez")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+        assert response.headers["server-timing"].endswith('desc="0 queries"')
+
+    def test_readyz_structure(self, client):
+        """Test that the readiness probe reports database and pool state"""
+        response = client.get("/readyz")
+        assert response.status_code in (200, 503)
+
+        data = response.json()
+        assert data["ready"] is (response.status_code == 200)
+        assert "saturation" in data["pool"]
+        assert "ok" in data["database"]
+
 
 class TestCoursesEndpoints:
     """Tests for courses related endpoints"""
@@ -150,6 +187,15 @@ class TestCoursesEndpoints:
         assert response.json() == []
         
         mock_course_service.get_all_courses.assert_called_once()
+
+    def test_get_course_by_slug_msgpack(self, client, mock_course_service):
+        """Test GET /courses/{slug} answers MessagePack when the client asks for it"""
+        mock_course_service.get_course_by_slug.return_value = MOCK_COURSE_DETAIL
+
+        response = client.get("/courses/curso-de-react", headers={"Accept": "application/msgpack"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/msgpack"
+        assert msgpack.unpackb(response.content) == MOCK_COURSE_DETAIL
     
     def test_get_course_by_slug_success(self, client, mock_course_service):
         """Test GET /courses/{slug} returns course details matching contract"""
@@ -218,6 +264,19 @@ class TestCoursesEndpoints:
         
         mock_course_service.get_course_by_slug.assert_called_once_with("curso-de-c++")
 
+    def test_get_course_by_slug_statement_timeout(self, client, mock_course_service, monkeypatch):
+        """Test GET /courses/{slug} answers 503 with Retry-After when the query times out"""
+        stats = StatementTimeoutStats()
+        monkeypatch.setattr("app.main.statement_timeout_stats", stats)
+        canceled = Exception("canceling statement due to statement timeout")
+        canceled.pgcode = "57014"
+        mock_course_service.get_course_by_slug.side_effect = OperationalError("SELECT", {}, canceled)
+
+        response = client.get("/courses/curso-de-react")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+        assert stats.snapshot()["cancelled"] == {"/courses/{slug}": 1}
+
 
 class TestContractCompliance:
     """Additional tests to ensure strict contract compliance"""
@@ -276,4 +335,89 @@ class TestContractCompliance:
         assert course["name"] == "Curso de React"
         assert course["description"] == "Curso de React"
         assert course["thumbnail"] == "https://via.placeholder.com/150"
-        assert course["slug"] == "curso-de-react" 
\ No newline at end of file
+        assert course["slug"] == "curso-de-react" 
+
+class TestAdminEndpoints:
+    """Tests for operational telemetry endpoints"""
+
+    @pytest.fixture
+    def admin_headers(self, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "s3cret")
+        return {"Authorization": "Bearer s3cret"}
+
+    def test_admin_requires_token(self, client, admin_headers):
+        """Test admin endpoints reject missing or wrong tokens"""
+        missing = client.get("/admin/slow-queries")
+        wrong = client.get("/admin/slow-queries", headers={"Authorization": "Bearer nope"})
+
+        assert missing.status_code == 401
+        assert wrong.status_code == 401
+        assert missing.headers["WWW-Authenticate"] == "Bearer"
+
+    def test_admin_disabled_without_token(self, client, monkeypatch):
+        """Test admin endpoints do not exist until an admin_token is configured"""
+        monkeypatch.setattr(settings, "admin_token", None)
+
+        response = client.get("/admin/pool", headers={"Authorization": "Bearer "})
+
+        assert response.status_code == 404
+
+    def test_admin_names_the_worker(self, client, admin_headers):
+        """Test admin answers say which worker process they describe"""
+        response = client.get("/admin/cache", headers=admin_headers)
+
+        assert response.headers["X-Worker-Pid"] == str(os.getpid())
+
+    def test_pool_stats_structure(self, client, admin_headers):
+        """Test that pool stats expose occupancy and checkout telemetry"""
+        response = client.get("/admin/pool", headers=admin_headers)
+        assert response.status_code == 200
+
+        data = response.json()
+        for field in ("size", "checked_out", "overflow", "timeouts", "wait_histogram"):
+            assert field in data
+        assert data["replicas"] == []
+
+    def test_statement_cache_stats_structure(self, client, admin_headers):
+        """Test that statement cache stats expose size and hit ratio"""
+        response = client.get("/admin/statement-cache", headers=admin_headers)
+        assert response.status_code == 200
+
+        data = response.json()
+        for field in ("size", "entries", "hits", "misses", "hit_ratio"):
+            assert field in data
+        assert "async" in data
+
+    def test_slow_queries_structure(self, client, admin_headers):
+        """Test that the slow-query log exposes its threshold and entries"""
+        response = client.get("/admin/slow-queries", headers=admin_headers)
+        assert response.status_code == 200
+
+        data = response.json()
+        for field in ("threshold_ms", "capacity", "entries", "plans"):
+            assert field in data
+
+    def test_compression_stats_structure(self, client, admin_headers):
+        """Test that compression stats expose encodings and cached variants"""
+        response = client.get("/admin/compression", headers=admin_headers)
+        assert response.status_code == 200
+
+        data = response.json()
+        for field in ("minimum_size", "cached_routes", "encodings", "cached_variants"):
+            assert field in data
+        assert "hit_ratio" in data["cached_variants"]
+
+    def test_cache_stats_structure(self, client, admin_headers):
+        """Test that cache stats report whether the read cache is enabled"""
+        response = client.get("/admin/cache", headers=admin_headers)
+        assert response.status_code == 200
+        assert "enabled" in response.json()
+
+    def test_http_cache_stats_structure(self, client, admin_headers):
+        """Test that HTTP cache stats list the Cache-Control per route"""
+        response = client.get("/admin/http-cache", headers=admin_headers)
+        assert response.status_code == 200
+
+        data = response.json()
+        assert "s-maxage=" in data["policies"]["/courses"]
+        assert "purge" in data
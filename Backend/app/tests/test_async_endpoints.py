@@ -0,0 +1,252 @@
+"""
+Tests for the async request path.
+Async handlers and AsyncCourseService with mocked async dependencies.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routers.async_courses import router, get_async_course_service
+from app.services import async_course_service
+from app.services.async_course_service import AsyncCourseService
+from app.models.course_rating import CourseRating
+
+
+MOCK_RATING = {
+    "id": 1,
+    "course_id": 1,
+    "user_id": 42,
+    "rating": 5,
+    "created_at": "2025-10-14T10:30:00",
+    "updated_at": "2025-10-14T10:30:00"
+}
+
+
+@pytest.fixture
+def mock_async_course_service():
+    """Create mock AsyncCourseService for testing."""
+    return AsyncMock(spec=AsyncCourseService)
+
+
+@pytest.fixture
+def client(mock_async_course_service):
+    """Create test client for an app serving only the async handlers."""
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_async_course_service] = lambda: mock_async_course_service
+    return TestClient(app)
+
+
+class TestAsyncEndpoints:
+    """Tests for async def handlers."""
+
+    def test_get_courses(self, client, mock_async_course_service):
+        """Test GET /courses awaits the async service."""
+        # Arrange
+        mock_async_course_service.get_all_courses.return_value = []
+
+        # Act
+        response = client.get("/courses")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == []
+        mock_async_course_service.get_all_courses.assert_awaited_once()
+
+    def test_get_course_by_slug_not_found(self, client, mock_async_course_service):
+        """Test 404 contract is preserved on the async path."""
+        # Arrange
+        mock_async_course_service.get_course_by_slug.return_value = None
+
+        # Act
+        response = client.get("/courses/nonexistent-course")
+
+        # Assert
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Course not found"}
+
+    def test_add_rating_course_not_found(self, client, mock_async_course_service):
+        """Test ValueError maps to 404 as in the sync handler."""
+        # Arrange
+        mock_async_course_service.add_course_rating.side_effect = ValueError("Course with id 999 not found")
+
+        # Act
+        response = client.post("/courses/999/ratings", json={"user_id": 42, "rating": 5})
+
+        # Assert
+        assert response.status_code == 404
+
+    def test_get_ratings(self, client, mock_async_course_service):
+        """Test rating list shape matches the sync contract."""
+        # Arrange
+        mock_async_course_service.get_course_ratings.return_value = {
+            "items": [MOCK_RATING],
+            "next_cursor": "abc",
+            "total": None
+        }
+
+        # Act
+        response = client.get("/courses/1/ratings?limit=1")
+
+        # Assert
+        assert response.status_code == 200
+        assert set(response.json()[0].keys()) == set(MOCK_RATING.keys())
+        assert response.headers["x-next-cursor"] == "abc"
+
+    def test_update_rating_user_mismatch(self, client, mock_async_course_service):
+        """Test PUT validates the body user_id against the path, as the sync handler."""
+        # Act
+        response = client.put("/courses/1/ratings/42", json={"user_id": 7, "rating": 3})
+
+        # Assert
+        assert response.status_code == 400
+        assert response.json() == {"detail": "user_id in body must match user_id in path"}
+        mock_async_course_service.update_course_rating.assert_not_awaited()
+
+    def test_update_rating_not_found(self, client, mock_async_course_service):
+        """Test PUT of a missing rating returns 404."""
+        # Arrange
+        mock_async_course_service.update_course_rating.side_effect = ValueError(
+            "No active rating found for user 42 on course 1"
+        )
+
+        # Act
+        response = client.put("/courses/1/ratings/42", json={"user_id": 42, "rating": 3})
+
+        # Assert
+        assert response.status_code == 404
+
+    def test_delete_rating(self, client, mock_async_course_service):
+        """Test DELETE returns 204, or 404 when there was nothing to delete."""
+        # Arrange
+        mock_async_course_service.delete_course_rating.side_effect = [True, False]
+
+        # Act
+        deleted = client.delete("/courses/1/ratings/42")
+        missing = client.delete("/courses/1/ratings/42")
+
+        # Assert
+        assert deleted.status_code == 204
+        assert missing.status_code == 404
+        assert missing.json() == {"detail": "No active rating found for user 42 on course 1"}
+
+
+class TestAsyncCourseService:
+    """Tests for AsyncCourseService with a mocked AsyncSession."""
+
+    @pytest.fixture
+    def mock_async_db(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+        db.flush = AsyncMock()
+        db.commit = AsyncMock()
+        db.refresh = AsyncMock()
+        return db
+
+    @pytest.mark.asyncio
+    async def test_get_stats_course_not_found(self, mock_async_db):
+        """Test missing course raises ValueError."""
+        # Arrange
+        mock_async_db.execute.return_value = Mock(scalar=Mock(return_value=None))
+        service = AsyncCourseService(mock_async_db)
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="Course with id 999 not found"):
+            await service.get_course_rating_stats(999)
+
+    @pytest.mark.asyncio
+    async def test_add_rating_updates_derived_tables(self, mock_async_db):
+        """Test creating a rating also runs summary and rollup upserts."""
+        # Arrange
+        course_found = Mock(scalar=Mock(return_value=1))
+        no_rating = Mock()
+        no_rating.scalars.return_value.first.return_value = None
+        mock_async_db.execute.side_effect = [course_found, None, no_rating, None, None, None]
+        service = AsyncCourseService(mock_async_db)
+
+        # Act
+        result = await service.add_course_rating(course_id=1, user_id=42, rating=5)
+
+        # Assert
+        assert result["rating"] == 5
+        assert mock_async_db.execute.await_count == 6  # curso, lock, rating, summary, 2 rollups
+        rating_query = mock_async_db.execute.await_args_list[2].args[0]
+        assert rating_query._for_update_arg is not None  # fila bloqueada antes del delta
+        added = mock_async_db.add.call_args[0][0]
+        assert isinstance(added, CourseRating)
+        mock_async_db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_add_rating_opens_read_your_writes_window(self, mock_async_db, monkeypatch):
+        """Test the writer's next reads skip the replicas, as on the sync path."""
+        # Arrange
+        recorded = Mock()
+        monkeypatch.setattr(async_course_service, "record_user_write", recorded)
+        course_found = Mock(scalar=Mock(return_value=1))
+        no_rating = Mock()
+        no_rating.scalars.return_value.first.return_value = None
+        mock_async_db.execute.side_effect = [course_found, None, no_rating, None, None, None]
+
+        # Act
+        await AsyncCourseService(mock_async_db).add_course_rating(course_id=1, user_id=42, rating=5)
+
+        # Assert
+        recorded.assert_called_once_with(mock_async_db, 42)
+
+    @pytest.mark.asyncio
+    async def test_update_rating_applies_delta(self, mock_async_db, monkeypatch):
+        """Test PUT locks the course and row, then applies the old -> new delta."""
+        # Arrange
+        recorded = Mock()
+        monkeypatch.setattr(async_course_service, "record_user_write", recorded)
+        existing = CourseRating(id=1, course_id=1, user_id=42, rating=2)
+        found = Mock()
+        found.scalars.return_value.first.return_value = existing
+        mock_async_db.execute.side_effect = [None, found, None, None, None]
+        service = AsyncCourseService(mock_async_db)
+
+        # Act
+        result = await service.update_course_rating(course_id=1, user_id=42, rating=4)
+
+        # Assert
+        assert result["rating"] == 4
+        assert mock_async_db.execute.await_count == 5  # lock, rating, summary, 2 rollups
+        rating_query = mock_async_db.execute.await_args_list[1].args[0]
+        assert rating_query._for_update_arg is not None
+        mock_async_db.commit.assert_awaited_once()
+        recorded.assert_called_once_with(mock_async_db, 42)
+
+    @pytest.mark.asyncio
+    async def test_update_rating_not_found(self, mock_async_db):
+        """Test PUT of a missing rating raises ValueError without writing."""
+        # Arrange
+        not_found = Mock()
+        not_found.scalars.return_value.first.return_value = None
+        mock_async_db.execute.side_effect = [None, not_found]
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="No active rating found"):
+            await AsyncCourseService(mock_async_db).update_course_rating(1, 42, 4)
+        mock_async_db.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_delete_rating(self, mock_async_db):
+        """Test soft delete sets deleted_at and removes the rating from the summary."""
+        # Arrange
+        existing = CourseRating(id=1, course_id=1, user_id=42, rating=5)
+        found = Mock()
+        found.scalars.return_value.first.return_value = existing
+        not_found = Mock()
+        not_found.scalars.return_value.first.return_value = None
+        mock_async_db.execute.side_effect = [None, found, None, None, None, None, not_found]
+        service = AsyncCourseService(mock_async_db)
+
+        # Act
+        deleted = await service.delete_course_rating(1, 42)
+        missing = await service.delete_course_rating(1, 42)
+
+        # Assert
+        assert deleted is True
+        assert existing.deleted_at is not None
+        assert missing is False
+        mock_async_db.commit.assert_awaited_once()
@@ -0,0 +1,774 @@
+"""
+Tests for the two-tier read cache and its Redis-protocol L2.
+The L2 runs against an in-process RESP stand-in server and the service
+tests use an in-memory SQLite engine, no PostgreSQL or Redis required.
+"""
+import asyncio
+import socketserver
+import threading
+import time
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.cache import MISSING, AsyncSingleFlight, LocalCache, TwoTierCache, cached_read
+from app.core.redis_cache import RedisCache, RedisError, encode_command, read_reply
+from app.db import cache_invalidation
+from app.db.query_counter import collect_queries
+from app.models.base import Base
+from app.models.course import Course
+from app.models.course_rating import CourseRating
+from app.services.course_service import CourseService, evict_course_reads
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    """Answers the subset of Redis commands RedisCache uses."""
+
+    def handle(self):
+        server = self.server
+        while True:
+            try:
+                command = read_reply(self.rfile)
+            except (EOFError, OSError):
+                return
+            name, args = command[0].upper(), command[1:]
+            server.commands.append(name)
+            self.wfile.write(server.reply(name, args))
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    """Local Redis stand-in: GET, SET PX, DEL, PING, AUTH, SELECT."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password=None):
+        super().__init__(("127.0.0.1", 0), RespHandler)
+        self.password = password
+        self.data = {}
+        self.commands = []
+
+    def reply(self, name, args):
+        if name == b"PING":
+            return b"+PONG\r\n"
+        if name == b"AUTH":
+            return b"+OK\r\n" if args[0].decode() == self.password else b"-WRONGPASS invalid password\r\n"
+        if name == b"SELECT":
+            return b"+OK\r\n"
+        if name == b"SET":
+            expires_at = time.monotonic() + int(args[3]) / 1000 if len(args) > 3 else None
+            self.data[args[0]] = (args[1], expires_at)
+            return b"+OK\r\n"
+        if name == b"GET":
+            value, expires_at = self.data.get(args[0], (None, None))
+            if value is None or (expires_at is not None and expires_at <= time.monotonic()):
+                return b"$-1\r\n"
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == b"DEL":
+            deleted = sum(self.data.pop(key, None) is not None for key in args)
+            return b":%d\r\n" % deleted
+        return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture
+def resp_server():
+    server = RespServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def redis_cache(resp_server):
+    host, port = resp_server.server_address
+    backend = RedisCache(host, port, timeout=1.0)
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def two_tier(l2=None, clock=None, **kwargs):
+    return TwoTierCache(LocalCache(16, clock=clock or time.monotonic), l2, **kwargs)
+
+
+def wait_for_refreshes(cache, count=1, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        refresh = cache.snapshot()["refresh"]
+        if refresh["completed"] + refresh["errors"] >= count:
+            return
+        assert time.monotonic() < deadline, "refresh did not finish"
+        time.sleep(0.001)
+
+
+class TestLocalCache:
+    """Tests for the per-process L1."""
+
+    def test_entries_expire(self, clock):
+        """Test an entry is gone once its TTL elapses."""
+        # Arrange
+        cache = LocalCache(clock=clock)
+        cache.set("key", {"a": 1}, ttl=10)
+
+        # Act
+        clock.now += 9
+        before = cache.get("key")
+        clock.now += 1
+        after = cache.get("key")
+
+        # Assert
+        assert before == {"a": 1}
+        assert after is MISSING
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest unused entry is dropped past max_entries."""
+        # Arrange
+        cache = LocalCache(max_entries=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+
+        # Act
+        cache.set("c", 3, ttl=60)
+
+        # Assert
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+
+class TestTwoTierCache:
+    """Tests for lookups across tiers."""
+
+    def test_loader_runs_once(self):
+        """Test the second lookup is an L1 hit."""
+        # Arrange
+        cache = two_tier()
+        loader = Mock(return_value=[1, 2])
+
+        # Act
+        first = cache.get_or_load("courses", "all", loader)
+        second = cache.get_or_load("courses", "all", loader)
+
+        # Assert
+        assert first == second == [1, 2]
+        loader.assert_called_once()
+        stats = cache.snapshot()
+        assert stats["loads"] == 1
+        assert stats["l1"]["hits"] == 1
+        assert stats["l1"]["misses"] == 1
+
+    def test_l2_shared_between_workers(self, redis_cache):
+        """Test a value loaded by one worker is an L2 hit for another, then L1."""
+        # Arrange
+        worker_a = two_tier(redis_cache)
+        worker_b = two_tier(redis_cache)
+        value = {"average_rating": 4.5, "rating_distribution": {1: 0, 5: 2}}
+        worker_a.get_or_load("rating_stats", 1, lambda: value)
+        loader = Mock()
+
+        # Act
+        first = worker_b.get_or_load("rating_stats", 1, loader)
+        second = worker_b.get_or_load("rating_stats", 1, loader)
+
+        # Assert
+        assert first == second == value  # claves int conservadas
+        loader.assert_not_called()
+        stats = worker_b.snapshot()
+        assert stats["l2"]["hits"] == 1
+        assert stats["l1"]["hits"] == 1
+
+    def test_versioned_keys(self, redis_cache, resp_server):
+        """Test bumping the version ignores entries written by the old one."""
+        # Arrange
+        two_tier(redis_cache, version="1").get_or_load("courses", "all", lambda: ["old"])
+
+        # Act
+        result = two_tier(redis_cache, version="2").get_or_load("courses", "all", lambda: ["new"])
+
+        # Assert
+        assert result == ["new"]
+        assert set(resp_server.data) == {b"platziflix:v1:courses:all", b"platziflix:v2:courses:all"}
+
+    def test_ttl_per_namespace(self, clock):
+        """Test each namespace expires after its own TTL."""
+        # Arrange
+        cache = two_tier(clock=clock, ttls={"rating_stats": 5}, default_ttl=60)
+        cache.set("rating_stats", 1, "stats")
+        cache.set("course", "react", "detail")
+
+        # Act
+        clock.now += 10
+
+        # Assert
+        assert cache.get("rating_stats", 1) is MISSING
+        assert cache.get("course", "react") == "detail"
+
+    def test_l2_ttl_sent_in_milliseconds(self, redis_cache):
+        """Test SET carries the namespace TTL as PX."""
+        # Arrange
+        cache = two_tier(redis_cache, ttls={"course": 0.05})
+
+        # Act
+        cache.set("course", "react", "detail")
+        time.sleep(0.1)
+
+        # Assert
+        assert redis_cache.get("platziflix:v1:course:react") is None
+
+    def test_invalidate_drops_both_tiers(self, redis_cache, resp_server):
+        """Test invalidation reaches L1 and the shared L2."""
+        # Arrange
+        cache = two_tier(redis_cache)
+        cache.set("rating_stats", 1, "stats")
+
+        # Act
+        cache.invalidate("rating_stats", 1)
+
+        # Assert
+        assert cache.get("rating_stats", 1) is MISSING
+        assert resp_server.data == {}
+
+    def test_none_is_not_cached(self):
+        """Test missing values (e.g. unknown slug) are loaded every time."""
+        # Arrange
+        cache = two_tier()
+        loader = Mock(return_value=None)
+
+        # Act
+        cache.get_or_load("course", "missing", loader)
+        cache.get_or_load("course", "missing", loader)
+
+        # Assert
+        assert loader.call_count == 2
+
+    def test_unavailable_l2_is_a_miss(self):
+        """Test a dead L2 never fails the read and is counted as an error."""
+        # Arrange
+        cache = two_tier(RedisCache("127.0.0.1", 1, timeout=0.1))
+
+        # Act
+        result = cache.get_or_load("courses", "all", lambda: ["loaded"])
+
+        # Assert
+        assert result == ["loaded"]
+        assert cache.snapshot()["l2"]["errors"] == 1
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent misses of one key."""
+
+    def test_concurrent_threads_share_one_load(self):
+        """Test threads missing the same key wait for a single loader call."""
+        # Arrange
+        cache = two_tier()
+        release = threading.Event()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            release.wait(2)
+            return ["catalog"]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load("courses", "all", loader)))
+            for _ in range(20)
+        ]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 2
+        while cache.snapshot()["coalesced"] < 19 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        assert len(calls) == 1
+        assert results == [["catalog"]] * 20
+        stats = cache.snapshot()
+        assert stats["loads"] == 1
+        assert stats["coalesced"] == 19
+        assert stats["in_flight"] == 0
+
+    def test_leader_error_reaches_waiters_and_is_not_cached(self):
+        """Test waiters re-raise the leader's exception and the next call reloads."""
+        # Arrange
+        cache = two_tier()
+        release = threading.Event()
+        errors = []
+
+        def failing():
+            release.wait(2)
+            raise ValueError("Course not found")
+
+        def call():
+            try:
+                cache.get_or_load("rating_stats", 1, failing)
+            except ValueError as exc:
+                errors.append(str(exc))
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 2
+        while cache.snapshot()["coalesced"] < 4 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        # Act
+        release.set()
+        for thread in threads:
+            thread.join()
+        value = cache.get_or_load("rating_stats", 1, lambda: {"total_ratings": 0})
+
+        # Assert
+        assert errors == ["Course not found"] * 5
+        assert value == {"total_ratings": 0}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_share_one_load(self):
+        """Test tasks missing the same key await a single loader coroutine."""
+        # Arrange
+        cache = two_tier()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return ["catalog"]
+
+        # Act
+        results = await asyncio.gather(*(
+            cache.aget_or_load("courses", "all", loader) for _ in range(50)
+        ))
+        again = await cache.aget_or_load("courses", "all", loader)
+
+        # Assert
+        assert calls == 1
+        assert results == [["catalog"]] * 50
+        assert again == ["catalog"]
+        assert cache.snapshot()["coalesced"] == 49
+
+    @pytest.mark.asyncio
+    async def test_async_l2_shared(self, redis_cache):
+        """Test the async path reads and fills the shared L2 too."""
+        # Arrange
+        worker_a = two_tier(redis_cache)
+        worker_b = two_tier(redis_cache)
+
+        async def loader():
+            return {"total_ratings": 3}
+
+        # Act
+        await worker_a.aget_or_load("rating_stats", 7, loader)
+        value = await worker_b.aget_or_load("rating_stats", 7, Mock(side_effect=AssertionError))
+
+        # Assert
+        assert value == {"total_ratings": 3}
+        assert worker_b.snapshot()["l2"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_hands_over(self):
+        """Test a waiter runs the load itself when the leader is cancelled."""
+        # Arrange
+        flights = AsyncSingleFlight()
+        started = asyncio.Event()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            started.set()
+            await asyncio.sleep(0.05)
+            return calls
+
+        leader = asyncio.create_task(flights.do("key", load))
+        await started.wait()
+        follower = asyncio.create_task(flights.do("key", load))
+        await asyncio.sleep(0)
+
+        # Act
+        leader.cancel()
+        result = await follower
+
+        # Assert
+        assert leader.cancelled()
+        assert result == 2
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_cached_read_on_coroutine_method(self):
+        """Test cached_read serves async methods through aget_or_load."""
+        # Arrange
+        class Service:
+            def __init__(self):
+                self.cache = two_tier()
+                self.calls = 0
+
+            @cached_read("course", key_arg="slug")
+            async def get(self, slug):
+                self.calls += 1
+                await asyncio.sleep(0.01)
+                return {"slug": slug}
+
+        service = Service()
+
+        # Act
+        results = await asyncio.gather(service.get("react"), service.get(slug="react"), service.get("vue"))
+
+        # Assert
+        assert results == [{"slug": "react"}, {"slug": "react"}, {"slug": "vue"}]
+        assert service.calls == 2
+
+
+class TestStaleWhileRevalidate:
+    """Tests for soft/hard TTLs with background refresh."""
+
+    def swr_cache(self, clock, **kwargs):
+        return two_tier(clock=clock, ttls={"courses": 10}, stale_ttls={"courses": 60}, **kwargs)
+
+    def test_stale_value_served_while_refreshing(self, clock):
+        """Test a soft-expired value returns at once and the refresh replaces it."""
+        # Arrange
+        cache = self.swr_cache(clock)
+        cache.get_or_load("courses", "all", lambda: ["v1"])
+        clock.now += 15
+        loader = Mock(side_effect=AssertionError("caller must not block"))
+
+        # Act
+        stale = cache.get_or_load("courses", "all", loader, refresh=lambda: ["v2"])
+        wait_for_refreshes(cache)
+        fresh = cache.get_or_load("courses", "all", loader, refresh=loader)
+
+        # Assert
+        assert stale == ["v1"]
+        assert fresh == ["v2"]
+        stats = cache.snapshot()
+        assert stats["stale_served"] == 1
+        assert stats["refresh"]["completed"] == 1
+        assert stats["refreshing"] == 0
+
+    def test_hard_expiry_blocks(self, clock):
+        """Test past soft + stale TTL the caller runs the loader."""
+        # Arrange
+        cache = self.swr_cache(clock)
+        cache.get_or_load("courses", "all", lambda: ["v1"])
+        clock.now += 70
+        refresh = Mock()
+
+        # Act
+        value = cache.get_or_load("courses", "all", lambda: ["v2"], refresh=refresh)
+
+        # Assert
+        assert value == ["v2"]
+        refresh.assert_not_called()
+        assert cache.snapshot()["stale_served"] == 0
+
+    def test_without_refresh_stale_is_a_miss(self, clock):
+        """Test callers that cannot refresh in the background block instead."""
+        # Arrange
+        cache = self.swr_cache(clock)
+        cache.get_or_load("courses", "all", lambda: ["v1"])
+        clock.now += 15
+
+        # Act
+        value = cache.get_or_load("courses", "all", lambda: ["v2"])
+
+        # Assert
+        assert value == ["v2"]
+
+    def test_one_refresh_per_key(self, clock):
+        """Test concurrent stale hits schedule a single refresh."""
+        # Arrange
+        cache = self.swr_cache(clock)
+        cache.get_or_load("courses", "all", lambda: ["v1"])
+        clock.now += 15
+        release = threading.Event()
+        calls = []
+
+        def refresh():
+            calls.append(1)
+            release.wait(2)
+            return ["v2"]
+
+        # Act
+        values = [cache.get_or_load("courses", "all", Mock(), refresh=refresh) for _ in range(5)]
+        release.set()
+        wait_for_refreshes(cache)
+
+        # Assert
+        assert values == [["v1"]] * 5
+        assert len(calls) == 1
+        assert cache.snapshot()["stale_served"] == 5
+
+    def test_failed_refresh_keeps_serving_stale(self, clock):
+        """Test a refresh error is recorded and the stale value stays."""
+        # Arrange
+        cache = self.swr_cache(clock)
+        cache.get_or_load("courses", "all", lambda: ["v1"])
+        clock.now += 15
+
+        def refresh():
+            raise RuntimeError("database unavailable")
+
+        # Act
+        cache.get_or_load("courses", "all", Mock(), refresh=refresh)
+        wait_for_refreshes(cache)
+        value = cache.get("courses", "all")
+
+        # Assert
+        assert value == ["v1"]
+        refresh_stats = cache.snapshot()["refresh"]
+        assert refresh_stats["errors"] == 1
+        assert refresh_stats["last_error"] == "database unavailable"
+
+    @pytest.mark.asyncio
+    async def test_async_stale_value_served_while_refreshing(self, clock):
+        """Test the event-loop path refreshes in a background task."""
+        # Arrange
+        cache = self.swr_cache(clock)
+
+        async def load(value):
+            return value
+
+        await cache.aget_or_load("courses", "all", lambda: load(["v1"]))
+        clock.now += 15
+
+        # Act
+        stale = await cache.aget_or_load("courses", "all", Mock(), refresh=lambda: load(["v2"]))
+        await asyncio.gather(*cache._refresh_tasks)
+        fresh = await cache.aget_or_load("courses", "all", Mock())
+
+        # Assert
+        assert stale == ["v1"]
+        assert fresh == ["v2"]
+        assert cache.snapshot()["refresh"]["completed"] == 1
+
+    def test_l2_freshness_shared_between_workers(self, redis_cache):
+        """Test a worker reading from L2 sees the writer's soft expiry."""
+        # Arrange
+        worker_a = two_tier(redis_cache, ttls={"courses": 10}, stale_ttls={"courses": 60})
+        worker_b = two_tier(
+            redis_cache, ttls={"courses": 10}, stale_ttls={"courses": 60},
+            wall_clock=lambda: time.time() + 15
+        )
+        worker_a.get_or_load("courses", "all", lambda: ["v1"])
+
+        # Act
+        value = worker_b.get_or_load("courses", "all", Mock(), refresh=lambda: ["v2"])
+        wait_for_refreshes(worker_b)
+
+        # Assert
+        assert value == ["v1"]
+        assert worker_b.snapshot()["stale_served"] == 1
+        assert worker_a.get_or_load("courses", "all", Mock()) == ["v1"]  # su L1 sigue fresco
+
+
+class TestRedisCache:
+    """Tests for the RESP client against the stand-in server."""
+
+    def test_round_trip(self, redis_cache):
+        """Test SET/GET/DEL on binary values and connection reuse."""
+        # Act
+        redis_cache.set("key", b"\x00\xffvalue", ttl=60)
+        stored = redis_cache.get("key")
+        redis_cache.delete("key")
+
+        # Assert
+        assert stored == b"\x00\xffvalue"
+        assert redis_cache.get("key") is None
+        assert redis_cache.ping() is True
+        assert len(redis_cache._idle) == 1
+
+    def test_from_url_authenticates(self, resp_server):
+        """Test the URL password and db are sent on connect."""
+        # Arrange
+        host, port = resp_server.server_address
+        resp_server.password = "s3cret"
+        backend = RedisCache.from_url(f"redis://:s3cret@{host}:{port}/2")
+
+        # Act
+        backend.ping()
+
+        # Assert
+        assert resp_server.commands[:3] == [b"AUTH", b"SELECT", b"PING"]
+        backend.close()
+
+    def test_error_reply_raises(self, redis_cache):
+        """Test error replies surface as RedisError."""
+        with pytest.raises(RedisError, match="unknown command"):
+            redis_cache.execute("FLUSHALL")
+
+    def test_fails_fast_while_down(self, clock):
+        """Test a connection error skips the backend for retry_interval."""
+        # Arrange
+        backend = RedisCache("127.0.0.1", 1, timeout=0.1, retry_interval=5, clock=clock)
+        with pytest.raises(OSError):
+            backend.get("key")
+
+        # Act & Assert
+        with pytest.raises(RedisError, match="unavailable"):
+            backend.get("key")
+        clock.now += 5
+        with pytest.raises(OSError):
+            backend.get("key")
+
+    def test_invalid_scheme(self):
+        """Test only redis:// URLs are accepted."""
+        with pytest.raises(ValueError):
+            RedisCache.from_url("memcached://localhost")
+
+    def test_encode_command(self):
+        """Test commands are RESP arrays of bulk strings."""
+        assert encode_command(("SET", "k", b"v", "PX", 10)) == (
+            b"*5\r\n$3\r\nSET\r\n$1\r\nk\r\n$1\r\nv\r\n$2\r\nPX\r\n$2\r\n10\r\n"
+        )
+
+
+@pytest.fixture
+def db_session():
+    """In-memory database with one course."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(Course(id=1, name="Curso", description="d", thumbnail="t", slug="curso"))
+        db.commit()
+        yield db
+    engine.dispose()
+
+
+class TestCourseServiceCache:
+    """Tests for CourseService reads through the cache."""
+
+    def test_cached_reads_skip_the_database(self, db_session):
+        """Test repeated catalog, detail and stats reads run no queries."""
+        # Arrange
+        service = CourseService(db_session, cache=two_tier())
+        first = (service.get_all_courses(), service.get_course_by_slug("curso"))
+
+        # Act
+        with collect_queries() as queries:
+            second = (service.get_all_courses(), service.get_course_by_slug("curso"))
+
+        # Assert
+        assert queries.count == 0
+        assert first == second
+
+    def test_stale_catalog_refreshed_on_own_session(self, db_session, clock):
+        """Test a stale catalog is served and refreshed through background_copy."""
+        # Arrange
+        cache = two_tier(clock=clock, ttls={"courses": 10}, stale_ttls={"courses": 60})
+        service = CourseService(
+            db_session, cache=cache, session_factory=sessionmaker(bind=db_session.get_bind())
+        )
+        service.get_all_courses()
+        db_session.add(Course(id=2, name="Nuevo", description="d", thumbnail="t", slug="nuevo"))
+        db_session.commit()
+        clock.now += 15
+
+        # Act
+        stale = service.get_all_courses()
+        wait_for_refreshes(cache)
+        refreshed = service.get_all_courses()
+
+        # Assert
+        assert [course["slug"] for course in stale] == ["curso"]
+        assert [course["slug"] for course in refreshed] == ["curso", "nuevo"]
+
+    def test_without_cache_reads_hit_the_database(self, db_session):
+        """Test the default (no cache) keeps querying every time."""
+        # Arrange
+        service = CourseService(db_session)
+        service.get_course_rating_stats(1)
+
+        # Act
+        with collect_queries() as queries:
+            service.get_course_rating_stats(1)
+
+        # Assert
+        assert queries.count == 3
+
+    def test_rating_write_invalidates_stats_and_catalog(self):
+        """Test a committed rating drops the course stats and the catalog."""
+        # Arrange
+        cache = two_tier()
+        cache.set("rating_stats", 1, "stale")
+        cache.set("courses", "all", ["stale"])
+        cache.set("course", "curso", "detail")
+        db = Mock()
+        db.query.return_value.filter.return_value.first.return_value = Course(id=1, slug="curso")
+        db.query.return_value.filter.return_value.with_for_update.return_value.first.return_value = CourseRating(
+            id=1, course_id=1, user_id=42, rating=3, created_at=datetime.utcnow()
+        )
+
+        # Act
+        CourseService(db, cache=cache).add_course_rating(course_id=1, user_id=42, rating=5)
+
+        # Assert
+        assert cache.get("rating_stats", 1) is MISSING
+        assert cache.get("courses", "all") is MISSING
+        assert cache.get("course", "curso") == "detail"
+
+    def test_course_write_invalidates_shared_l2(self, db_session, redis_cache, monkeypatch):
+        """Test another worker does not get a changed course back from L2."""
+        # Arrange
+        writer = two_tier(redis_cache)
+        reader = two_tier(redis_cache)
+        monkeypatch.setattr(cache_invalidation, "course_cache", writer)
+        service = CourseService(db_session, cache=reader)
+        service.get_all_courses()
+        service.get_course_by_slug("curso")
+
+        # Act
+        db_session.get(Course, 1).name = "Renombrado"
+        db_session.commit()
+        evict_course_reads(reader, "course", 1)  # lo que hace el listener del lector
+
+        # Assert
+        assert service.get_course_by_slug("curso")["name"] == "Renombrado"
+        assert service.get_all_courses()[0]["name"] == "Renombrado"
+
+    def test_cached_read_key_argument(self):
+        """Test the key comes from the named argument, positional or keyword."""
+        # Arrange
+        class Service:
+            def __init__(self):
+                self.cache = two_tier()
+                self.calls = 0
+
+            @cached_read("course", key_arg="slug")
+            def get(self, slug):
+                self.calls += 1
+                return {"slug": slug}
+
+        service = Service()
+
+        # Act
+        service.get("react")
+        service.get(slug="react")
+        service.get("vue")
+
+        # Assert
+        assert service.calls == 2
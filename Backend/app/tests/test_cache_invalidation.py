@@ -0,0 +1,295 @@
+"""
+Tests for cross-worker cache invalidation (LISTEN/NOTIFY).
+Payload and listener tests need no database; the notifier and the
+end-to-end listener run against the test PostgreSQL database.
+"""
+import asyncio
+import time
+
+import psycopg2
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+import app.db.cache_invalidation as cache_invalidation
+from app.core.cache import MISSING, LocalCache, TwoTierCache
+from app.core.config import settings
+from app.db.base import engine as pg_engine
+from app.db.cache_invalidation import (
+    CacheInvalidationListener,
+    CacheNotifier,
+    changed_course_slugs,
+    changed_courses,
+    listen_dsn,
+    parse_payload,
+)
+from app.models.base import Base
+from app.models.course import Course
+from app.models.course_rating import CourseRating
+from app.models.lesson import Lesson
+from app.services.course_service import evict_course_reads
+
+
+class FakeConnection:
+    """Stand-in for an asyncpg connection."""
+
+    def __init__(self):
+        self.listeners = {}
+        self.termination = None
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def add_termination_listener(self, callback):
+        self.termination = callback
+
+    async def execute(self, query):
+        return "SELECT 1"
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self, timeout=None):
+        self.closed = True
+
+    def notify(self, channel, payload):
+        self.listeners[channel](self, 1, channel, payload)
+
+    def terminate(self):
+        self.closed = True
+        self.termination(self)
+
+
+class Recorder:
+    def __init__(self):
+        self.changes = []
+        self.flushes = 0
+
+    def on_change(self, kind, course_id):
+        self.changes.append((kind, course_id))
+
+    def on_reconnect(self):
+        self.flushes += 1
+
+
+async def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+class TestPayloads:
+    """Tests for what the writers send and the listener accepts."""
+
+    def test_changed_courses(self):
+        """Test ratings, courses and lessons map to their course id and kind."""
+        # Arrange
+        session = Session(bind=create_engine("sqlite://"))
+        session.add_all([
+            CourseRating(course_id=1, user_id=42, rating=5),
+            CourseRating(course_id=1, user_id=43, rating=4),
+            Course(id=2, name="c", description="d", thumbnail="t", slug="c"),
+            Lesson(course_id=3, name="l", description="d", slug="l"),
+        ])
+
+        # Act
+        changes = changed_courses(session)
+
+        # Assert
+        assert changes == {("rating", 1), ("course", 2), ("course", 3)}
+
+    def test_changed_course_slugs(self):
+        """Test renamed courses yield both slugs and lessons their course's slug."""
+        # Arrange
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        session = Session(bind=engine)
+        session.add_all([
+            Course(id=1, name="a", description="d", thumbnail="t", slug="a"),
+            Course(id=2, name="b", description="d", thumbnail="t", slug="b"),
+            Course(id=3, name="c", description="d", thumbnail="t", slug="c"),
+        ])
+        session.commit()
+        session.get(Course, 1).slug = "a-2"
+        session.add(Lesson(course_id=2, name="l", description="d", slug="l", video_url="v"))
+
+        # Act
+        slugs = changed_course_slugs(session)
+
+        # Assert
+        assert slugs == {"a", "a-2", "b"}
+
+    @pytest.mark.parametrize("payload, expected", [
+        ("rating:7", ("rating", 7)),
+        ("course:12", ("course", 12)),
+        ("rating:", None),
+        ("rating:²", None),
+        ("teacher:1", None),
+        ("garbage", None),
+    ])
+    def test_parse_payload(self, payload, expected):
+        """Test only known kinds with numeric ids are accepted."""
+        assert parse_payload(payload) == expected
+
+    def test_listen_dsn_drops_driver(self):
+        """Test SQLAlchemy driver suffixes are removed for asyncpg."""
+        assert listen_dsn("postgresql+psycopg2://u:p@h:5432/db") == "postgresql://u:p@h:5432/db"
+
+
+class TestEvictCourseReads:
+    """Tests for the L1 eviction applied by the listener."""
+
+    def test_rating_change_keeps_details(self):
+        """Test a rating change drops stats and catalog, not course details."""
+        # Arrange
+        cache = TwoTierCache(LocalCache())
+        cache.set("rating_stats", 1, "stats")
+        cache.set("rating_stats", 2, "other")
+        cache.set("courses", "all", "catalog")
+        cache.set("course", "react", "detail")
+
+        # Act
+        evict_course_reads(cache, "rating", 1)
+
+        # Assert
+        assert cache.get("rating_stats", 1) is MISSING
+        assert cache.get("courses", "all") is MISSING
+        assert cache.get("rating_stats", 2) == "other"
+        assert cache.get("course", "react") == "detail"
+
+    def test_course_change_drops_details(self):
+        """Test course data changes also drop cached details (keyed by slug)."""
+        # Arrange
+        cache = TwoTierCache(LocalCache())
+        cache.set("course", "react", "detail")
+        cache.set("courses", "all", "catalog")
+
+        # Act
+        evict_course_reads(cache, "course", 1)
+
+        # Assert
+        assert cache.get("course", "react") is MISSING
+        assert len(cache.l1) == 0
+
+
+class TestCacheInvalidationListener:
+    """Tests for the LISTEN loop with a fake connection."""
+
+    @pytest.mark.asyncio
+    async def test_flushes_on_connect_and_dispatches(self):
+        """Test the first connect flushes L1, then notifications are applied."""
+        # Arrange
+        connection = FakeConnection()
+        recorder = Recorder()
+
+        async def connect(dsn):
+            return connection
+
+        listener = CacheInvalidationListener(
+            "dsn", "channel", recorder.on_change, recorder.on_reconnect, connect=connect
+        )
+
+        # Act
+        listener.start()
+        await wait_for(lambda: listener.connected)
+        connection.notify("channel", "rating:5")
+        connection.notify("channel", "bogus")
+        await listener.stop()
+
+        # Assert
+        assert recorder.changes == [("rating", 5)]
+        assert recorder.flushes == 2  # conexión + payload desconocido
+        snapshot = listener.snapshot()
+        assert snapshot["notifications"] == 2
+        assert snapshot["ignored"] == 1
+        assert connection.closed
+
+    @pytest.mark.asyncio
+    async def test_reconnects_with_full_flush(self):
+        """Test a dropped connection is replaced and L1 flushed again."""
+        # Arrange
+        connections = []
+        recorder = Recorder()
+        attempts = 0
+
+        async def connect(dsn):
+            nonlocal attempts
+            attempts += 1
+            if attempts == 2:
+                raise OSError("connection refused")
+            connections.append(FakeConnection())
+            return connections[-1]
+
+        listener = CacheInvalidationListener(
+            "dsn", "channel", recorder.on_change, recorder.on_reconnect,
+            retry_interval=0.01, connect=connect
+        )
+        listener.start()
+        await wait_for(lambda: listener.connected)
+
+        # Act
+        connections[0].terminate()
+        await wait_for(lambda: listener.snapshot()["connects"] == 2)
+        await listener.stop()
+
+        # Assert
+        assert attempts == 3
+        assert recorder.flushes == 2
+        assert listener.snapshot()["last_error"] == "connection refused"
+
+
+class TestInvalidationOnPostgres:
+    """NOTIFY from the write path and LISTEN against the test database."""
+
+    def test_flush_emits_notify_in_transaction(self, monkeypatch):
+        """Test a flushed rating sends pg_notify inside the write transaction."""
+        # Arrange
+        monkeypatch.setattr(cache_invalidation, "cache_notifier", CacheNotifier("test_cache"))
+        payloads = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if "pg_notify" in statement:
+                payloads.extend(value for value in parameters.values() if value != "test_cache")
+
+        event.listen(pg_engine, "before_cursor_execute", capture)
+        session = Session(bind=pg_engine)
+        try:
+            course_id = session.query(Course.id).first()[0]
+            session.add(CourseRating(course_id=course_id, user_id=99999991, rating=5))
+
+            # Act
+            session.flush()
+        finally:
+            session.rollback()
+            session.close()
+            event.remove(pg_engine, "before_cursor_execute", capture)
+
+        # Assert
+        assert payloads == [f"rating:{course_id}"]
+
+    @pytest.mark.asyncio
+    async def test_listener_receives_committed_notify(self):
+        """Test a committed NOTIFY reaches the listener within milliseconds."""
+        # Arrange
+        recorder = Recorder()
+        listener = CacheInvalidationListener(
+            listen_dsn(settings.database_url), "test_cache", recorder.on_change, recorder.on_reconnect
+        )
+        listener.start()
+        await wait_for(lambda: listener.connected)
+
+        # Act
+        sent = time.monotonic()
+        connection = psycopg2.connect(listen_dsn(settings.database_url))
+        connection.autocommit = True
+        connection.cursor().execute("SELECT pg_notify('test_cache', 'course:3')")
+        connection.close()
+        await wait_for(lambda: recorder.changes)
+        latency = time.monotonic() - sent
+        await listener.stop()
+
+        # Assert
+        assert recorder.changes == [("course", 3)]
+        assert latency < 1.0
@@ -0,0 +1,192 @@
+"""
+Tests for response compression and pre-compressed variants.
+Uses a standalone FastAPI app, no PostgreSQL required.
+"""
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import (
+    CompressedVariants,
+    CompressionMiddleware,
+    CompressionStats,
+    negotiate_encoding,
+)
+
+BODY = "curso de react " * 100
+
+
+@pytest.fixture
+def variants():
+    return CompressedVariants(max_entries=4)
+
+
+@pytest.fixture
+def stats():
+    return CompressionStats()
+
+
+@pytest.fixture
+def client(variants, stats):
+    app = FastAPI()
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=100,
+        cached_routes=["/courses/{slug}"],
+        variants=variants,
+        stats=stats
+    )
+
+    @app.get("/courses/{slug}")
+    def course(slug: str):
+        return PlainTextResponse(BODY + slug)
+
+    @app.get("/plain")
+    def plain():
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" * 200, media_type="image/png")
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(gzip.compress(BODY.encode()), media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BODY, BODY]), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def get_raw(client, path, accept_encoding):
+    """Response and body bytes as sent by the middleware (not decoded)."""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+class TestNegotiateEncoding:
+    """Tests for Accept-Encoding parsing."""
+
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("*", "br"),
+        ("*;q=0.1, gzip;q=0.5", "gzip"),
+        ("identity", None),
+        ("", None),
+        ("gzip;q=abc", None),
+    ])
+    def test_negotiation(self, header, expected):
+        """Test q-values, wildcard and server preference on ties."""
+        assert negotiate_encoding(header) == expected
+
+
+class TestCompressionMiddleware:
+    """Tests for the compression middleware."""
+
+    def test_brotli_preferred(self, client, stats):
+        """Test brotli is used when accepted and the body round-trips."""
+        # Act
+        response, raw = get_raw(client, "/plain", "gzip, br")
+
+        # Assert
+        assert response.headers["content-encoding"] == "br"
+        assert response.headers["content-length"] == str(len(raw))
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert brotli.decompress(raw).decode() == BODY
+        assert stats.snapshot()["br"]["responses"] == 1
+
+    def test_gzip_fallback(self, client):
+        """Test gzip is used when brotli is not accepted."""
+        # Act
+        response, raw = get_raw(client, "/plain", "gzip")
+
+        # Assert
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(raw).decode() == BODY
+
+    def test_identity_without_accept_encoding(self, client):
+        """Test no compression when the client accepts none, but Vary is set."""
+        # Act
+        response, raw = get_raw(client, "/plain", "identity")
+
+        # Assert
+        assert "content-encoding" not in response.headers
+        assert raw.decode() == BODY
+        assert "Accept-Encoding" in response.headers["vary"]
+
+    @pytest.mark.parametrize("path", ["/small", "/image", "/stream"])
+    def test_skipped_responses(self, client, stats, path):
+        """Test small, non-compressible and streaming bodies pass through."""
+        # Act
+        response, _ = get_raw(client, path, "br")
+
+        # Assert
+        assert "content-encoding" not in response.headers
+        assert stats.snapshot() == {}
+
+    def test_already_encoded_is_untouched(self, client):
+        """Test a response with its own Content-Encoding is not recompressed."""
+        # Act
+        response, raw = get_raw(client, "/encoded", "br")
+
+        # Assert
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(raw).decode() == BODY
+
+    def test_cached_route_compresses_once_per_version(self, client, variants):
+        """Test repeated bodies of a cached route reuse the compressed variant."""
+        # Act
+        first, first_raw = get_raw(client, "/courses/react", "br")
+        second, second_raw = get_raw(client, "/courses/react", "br")
+        get_raw(client, "/courses/react", "gzip")
+        get_raw(client, "/courses/vue", "br")
+
+        # Assert
+        assert first_raw == second_raw
+        assert brotli.decompress(second_raw).decode() == BODY + "react"
+        snapshot = variants.snapshot()
+        assert snapshot["hits"] == 1
+        assert snapshot["misses"] == 3
+        assert snapshot["entries"] == 3
+
+    def test_uncached_route_does_not_store_variants(self, client, variants):
+        """Test routes outside cached_routes are compressed per request."""
+        # Act
+        get_raw(client, "/plain", "br")
+        get_raw(client, "/plain", "br")
+
+        # Assert
+        assert variants.snapshot()["entries"] == 0
+
+
+class TestCompressedVariants:
+    """Tests for the variant LRU."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest unused variant is dropped past max_entries."""
+        # Arrange
+        variants = CompressedVariants(max_entries=2)
+        variants.put((b"a", "br"), b"1")
+        variants.put((b"b", "br"), b"2")
+        variants.get((b"a", "br"))
+
+        # Act
+        variants.put((b"c", "br"), b"3")
+
+        # Assert
+        assert variants.get((b"b", "br")) is None
+        assert variants.get((b"a", "br")) == b"1"
+        assert variants.get((b"c", "br")) == b"3"
@@ -0,0 +1,199 @@
+"""
+Tests for the tuple-row, keyset-paginated rating listing.
+Uses an in-memory SQLite engine, no PostgreSQL required.
+"""
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from app.models.base import Base
+from app.models.course import Course
+from app.models.course_rating import CourseRating
+from app.models.course_rating_summary import CourseRatingSummary
+from app.services.course_queries import (
+    decode_rating_cursor,
+    encode_rating_cursor,
+    rating_rows_as_dicts,
+)
+from app.services.course_service import CourseService
+
+
+@pytest.fixture
+def db_session():
+    """Course with two active ratings and one deleted."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(Course(id=1, name="Curso", description="d", thumbnail="t", slug="curso"))
+        db.add_all([
+            CourseRating(course_id=1, user_id=1, rating=5, created_at=datetime(2025, 1, 1, 10)),
+            CourseRating(course_id=1, user_id=2, rating=3, created_at=datetime(2025, 1, 2, 10, 0, 0, 1500)),
+            CourseRating(
+                course_id=1,
+                user_id=3,
+                rating=1,
+                created_at=datetime(2025, 1, 3),
+                deleted_at=datetime(2025, 1, 4)
+            ),
+        ])
+        db.commit()
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+class TestRatingRows:
+    """Tests for get_course_ratings without ORM hydration."""
+
+    def test_rows_match_orm_to_dict(self, db_session):
+        """Test the tuple path returns exactly what to_dict() returned."""
+        # Arrange
+        expected = [
+            rating.to_dict()
+            for rating in db_session.execute(
+                select(CourseRating)
+                .where(CourseRating.deleted_at.is_(None))
+                .order_by(CourseRating.created_at.desc())
+            ).scalars()
+        ]
+        db_session.expunge_all()
+
+        # Act
+        result = CourseService(db_session).get_course_ratings(1)["items"]
+
+        # Assert
+        assert result == expected
+        assert result[0]["created_at"] == "2025-01-02T10:00:00.001500"
+
+    def test_listing_leaves_identity_map_empty(self, db_session):
+        """Test no CourseRating entities are loaded into the session."""
+        # Act
+        CourseService(db_session).get_course_ratings(1)
+
+        # Assert
+        assert len(db_session.identity_map) == 0
+
+    def test_missing_timestamps_are_none(self):
+        """Test NULL timestamps stay None as in to_dict()."""
+        # Act
+        result = rating_rows_as_dicts([(1, 1, 42, 5, None, None)])
+
+        # Assert
+        assert result == [{
+            "id": 1,
+            "course_id": 1,
+            "user_id": 42,
+            "rating": 5,
+            "created_at": None,
+            "updated_at": None,
+        }]
+
+
+@pytest.fixture
+def paged_session():
+    """Course with 7 active ratings; users 3 and 4 share a created_at."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(Course(id=1, name="Curso", description="d", thumbnail="t", slug="curso"))
+        db.add_all([
+            CourseRating(
+                course_id=1,
+                user_id=user_id,
+                rating=5 if user_id % 2 else 3,
+                created_at=datetime(2025, 1, 1, 10, 0, 3 if user_id == 4 else user_id)
+            )
+            for user_id in range(1, 8)
+        ])
+        db.add(CourseRatingSummary(
+            course_id=1,
+            total_ratings=7,
+            rating_sum=29,
+            rating_3_count=3,
+            rating_5_count=4
+        ))
+        db.commit()
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+def _all_pages(service, **kwargs):
+    pages, cursor = [], None
+    while True:
+        page = service.get_course_ratings(1, cursor=cursor, **kwargs)
+        pages.append(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+class TestRatingPages:
+    """Tests for keyset pagination of get_course_ratings."""
+
+    def test_pages_cover_all_ratings_in_order(self, paged_session):
+        """Test walking the cursor returns every rating once, newest first, ties by id."""
+        # Arrange
+        service = CourseService(paged_session)
+        expected = [
+            (row["created_at"], row["id"])
+            for row in service.get_course_ratings(1, limit=100)["items"]
+        ]
+
+        # Act
+        pages = _all_pages(service, limit=2)
+
+        # Assert
+        flat = [(row["created_at"], row["id"]) for page in pages for row in page]
+        assert [len(page) for page in pages] == [2, 2, 2, 1]
+        assert flat == expected
+        assert flat == sorted(flat, reverse=True)
+
+    def test_star_filter(self, paged_session):
+        """Test the star filter applies to every page."""
+        # Act
+        pages = _all_pages(CourseService(paged_session), limit=3, rating=5)
+
+        # Assert
+        ratings = [row["rating"] for page in pages for row in page]
+        assert ratings == [5, 5, 5, 5]
+
+    def test_total_from_summary(self, paged_session):
+        """Test the total comes from course_rating_summaries, per star if filtered."""
+        # Arrange
+        service = CourseService(paged_session)
+
+        # Act
+        total = service.get_course_ratings(1, limit=1, include_total=True)["total"]
+        total_3 = service.get_course_ratings(1, limit=1, rating=3, include_total=True)["total"]
+        not_requested = service.get_course_ratings(1, limit=1)["total"]
+
+        # Assert
+        assert (total, total_3, not_requested) == (7, 3, None)
+
+    def test_total_without_summary_row(self, db_session):
+        """Test a course without summary row reports zero."""
+        # Act
+        result = CourseService(db_session).get_course_ratings(1, include_total=True)
+
+        # Assert
+        assert result["total"] == 0
+
+    def test_cursor_round_trip(self):
+        """Test cursors decode to the row they were built from."""
+        # Arrange
+        created_at = datetime(2025, 1, 2, 10, 0, 0, 1500)
+
+        # Act
+        cursor = encode_rating_cursor(created_at, 42)
+
+        # Assert
+        assert decode_rating_cursor(cursor) == (created_at, 42)
+        assert "=" not in cursor
+
+    @pytest.mark.parametrize("cursor", ["garbage", "", encode_rating_cursor(datetime(2025, 1, 1), 1)[:-3]])
+    def test_invalid_cursor(self, paged_session, cursor):
+        """Test malformed cursors raise ValueError."""
+        # Act & Assert
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            CourseService(paged_session).get_course_ratings(1, cursor=cursor)
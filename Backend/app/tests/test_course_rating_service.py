@@ -5,9 +5,13 @@ Tests business logic in isolation using mocked database.
 import pytest
 from unittest.mock import Mock, MagicMock
 from datetime import datetime
+from app.services.course_queries import RATING_FIELDS
 from app.services.course_service import CourseService
+from app.services.rating_aggregates import bayesian_score, truncate_to_bucket
 from app.models.course import Course
 from app.models.course_rating import CourseRating
+from app.models.course_rating_rollup import CourseRatingRollupDaily
+from app.models.course_rating_summary import CourseRatingSummary
 
 
 @pytest.fixture
@@ -65,22 +69,23 @@ class TestGetCourseRatings:
     ):
         """Test retrieving ratings for existing course."""
         # Arrange
-        mock_db_session.query.return_value.filter.return_value.first.return_value = sample_course
-        mock_db_session.query.return_value.filter.return_value.order_by.return_value.all.return_value = [sample_rating]
+        mock_db_session.execute.return_value.scalar.return_value = sample_course.id
+        mock_db_session.execute.return_value.all.return_value = [
+            tuple(getattr(sample_rating, field) for field in RATING_FIELDS)
+        ]
 
         # Act
         result = course_service.get_course_ratings(course_id=1)
 
         # Assert
-        assert isinstance(result, list)
-        assert len(result) == 1
-        assert result[0]["rating"] == 5
-        assert result[0]["user_id"] == 42
+        assert result["items"] == [sample_rating.to_dict()]
+        assert result["next_cursor"] is None
+        assert result["total"] is None
 
     def test_get_ratings_course_not_found(self, course_service, mock_db_session):
         """Test retrieving ratings for non-existent course."""
         # Arrange
-        mock_db_session.query.return_value.filter.return_value.first.return_value = None
+        mock_db_session.execute.return_value.scalar.return_value = None
 
         # Act & Assert
         with pytest.raises(ValueError, match="Course with id 1 not found"):
@@ -94,14 +99,15 @@ class TestGetCourseRatings:
     ):
         """Test retrieving ratings for course with no ratings."""
         # Arrange
-        mock_db_session.query.return_value.filter.return_value.first.return_value = sample_course
-        mock_db_session.query.return_value.filter.return_value.order_by.return_value.all.return_value = []
+        mock_db_session.execute.return_value.scalar.return_value = sample_course.id
+        mock_db_session.execute.return_value.all.return_value = []
 
         # Act
         result = course_service.get_course_ratings(course_id=1)
 
         # Assert
-        assert result == []
+        assert result["items"] == []
+        assert result["next_cursor"] is None
 
 
 class TestAddCourseRating:
@@ -115,10 +121,8 @@ class TestAddCourseRating:
     ):
         """Test creating new rating when user hasn't rated before."""
         # Arrange
-        mock_db_session.query.return_value.filter.return_value.first.side_effect = [
-            sample_course,  # Course exists check
-            None  # No existing rating
-        ]
+        mock_db_session.query.return_value.filter.return_value.first.return_value = sample_course  # Course exists check
+        mock_db_session.query.return_value.filter.return_value.with_for_update.return_value.first.return_value = None  # No existing rating
 
         new_rating = CourseRating(
             id=1,
@@ -154,10 +158,8 @@ class TestAddCourseRating:
         """Test updating existing rating instead of creating duplicate."""
         # Arrange
         sample_rating.rating = 3  # Original rating
-        mock_db_session.query.return_value.filter.return_value.first.side_effect = [
-            sample_course,  # Course exists
-            sample_rating  # Existing rating
-        ]
+        mock_db_session.query.return_value.filter.return_value.first.return_value = sample_course  # Course exists
+        mock_db_session.query.return_value.filter.return_value.with_for_update.return_value.first.return_value = sample_rating  # Existing rating
 
         # Act
         result = course_service.add_course_rating(
@@ -211,7 +213,7 @@ class TestUpdateCourseRating:
         """Test updating existing rating."""
         # Arrange
         sample_rating.rating = 3
-        mock_db_session.query.return_value.filter.return_value.first.return_value = sample_rating
+        mock_db_session.query.return_value.filter.return_value.with_for_update.return_value.first.return_value = sample_rating
 
         # Act
         result = course_service.update_course_rating(
@@ -228,7 +230,7 @@ class TestUpdateCourseRating:
     def test_update_nonexistent_rating(self, course_service, mock_db_session):
         """Test updating rating that doesn't exist."""
         # Arrange
-        mock_db_session.query.return_value.filter.return_value.first.return_value = None
+        mock_db_session.query.return_value.filter.return_value.with_for_update.return_value.first.return_value = None
 
         # Act & Assert
         with pytest.raises(ValueError, match="No active rating found"):
@@ -242,7 +244,7 @@ class TestUpdateCourseRating:
     ):
         """Test updating with invalid rating value."""
         # Arrange
-        mock_db_session.query.return_value.filter.return_value.first.return_value = sample_rating
+        mock_db_session.query.return_value.filter.return_value.with_for_update.return_value.first.return_value = sample_rating
 
         # Act & Assert
         with pytest.raises(ValueError, match="Rating must be between 1 and 5"):
@@ -260,7 +262,7 @@ class TestDeleteCourseRating:
     ):
         """Test soft deleting existing rating."""
         # Arrange
-        mock_db_session.query.return_value.filter.return_value.first.return_value = sample_rating
+        mock_db_session.query.return_value.filter.return_value.with_for_update.return_value.first.return_value = sample_rating
 
         # Act
         result = course_service.delete_course_rating(course_id=1, user_id=42)
@@ -273,7 +275,7 @@ class TestDeleteCourseRating:
     def test_delete_nonexistent_rating(self, course_service, mock_db_session):
         """Test deleting rating that doesn't exist."""
         # Arrange
-        mock_db_session.query.return_value.filter.return_value.first.return_value = None
+        mock_db_session.query.return_value.filter.return_value.with_for_update.return_value.first.return_value = None
 
         # Act
         result = course_service.delete_course_rating(course_id=1, user_id=42)
@@ -294,7 +296,7 @@ class TestGetUserCourseRating:
     ):
         """Test retrieving existing user rating."""
         # Arrange
-        mock_db_session.query.return_value.filter.return_value.first.return_value = sample_rating
+        mock_db_session.execute.return_value.scalars.return_value.first.return_value = sample_rating
 
         # Act
         result = course_service.get_user_course_rating(course_id=1, user_id=42)
@@ -307,7 +309,7 @@ class TestGetUserCourseRating:
     def test_get_user_rating_not_exists(self, course_service, mock_db_session):
         """Test retrieving non-existent user rating."""
         # Arrange
-        mock_db_session.query.return_value.filter.return_value.first.return_value = None
+        mock_db_session.execute.return_value.scalars.return_value.first.return_value = None
 
         # Act
         result = course_service.get_user_course_rating(course_id=1, user_id=42)
@@ -327,13 +329,11 @@ class TestGetCourseRatingStats:
     ):
         """Test retrieving statistics for course with ratings."""
         # Arrange
-        mock_db_session.query.return_value.filter.return_value.first.side_effect = [
-            sample_course,  # Course exists
-            Mock(average=4.5, total=10)  # Stats query result
-        ]
+        mock_db_session.execute.return_value.scalar.return_value = sample_course.id  # Course exists
+        mock_db_session.execute.return_value.one.return_value = Mock(average=4.5, total=10)  # Stats query result
 
         distribution_results = [(5, 6), (4, 3), (3, 1)]
-        mock_db_session.query.return_value.filter.return_value.group_by.return_value.all.return_value = distribution_results
+        mock_db_session.execute.return_value.all.return_value = distribution_results
 
         # Act
         result = course_service.get_course_rating_stats(course_id=1)
@@ -355,11 +355,9 @@ class TestGetCourseRatingStats:
     ):
         """Test retrieving statistics for course with no ratings."""
         # Arrange
-        mock_db_session.query.return_value.filter.return_value.first.side_effect = [
-            sample_course,
-            Mock(average=0.0, total=0)
-        ]
-        mock_db_session.query.return_value.filter.return_value.group_by.return_value.all.return_value = []
+        mock_db_session.execute.return_value.scalar.return_value = sample_course.id
+        mock_db_session.execute.return_value.one.return_value = Mock(average=0.0, total=0)
+        mock_db_session.execute.return_value.all.return_value = []
 
         # Act
         result = course_service.get_course_rating_stats(course_id=1)
@@ -372,8 +370,244 @@ class TestGetCourseRatingStats:
     def test_get_stats_course_not_found(self, course_service, mock_db_session):
         """Test retrieving stats for non-existent course."""
         # Arrange
-        mock_db_session.query.return_value.filter.return_value.first.return_value = None
+        mock_db_session.execute.return_value.scalar.return_value = None
 
         # Act & Assert
         with pytest.raises(ValueError, match="Course with id 999 not found"):
             course_service.get_course_rating_stats(course_id=999)
+
+
+class TestRatingSummaryMaintenance:
+    """Tests for incremental leaderboard summary maintenance."""
+
+    def test_bayesian_score_pulls_few_votes_towards_prior(self):
+        """A single 5-star vote must not outrank many high votes."""
+        # Act
+        single_vote = bayesian_score(rating_sum=5, total_ratings=1)
+        many_votes = bayesian_score(rating_sum=4 * 200, total_ratings=200)
+
+        # Assert
+        assert many_votes > single_vote
+
+    def test_add_rating_updates_summary(
+        self,
+        course_service,
+        mock_db_session,
+        sample_course
+    ):
+        """Test creating a rating upserts the course summary before commit."""
+        # Arrange
+        mock_db_session.query.return_value.filter.return_value.first.return_value = sample_course
+        mock_db_session.query.return_value.filter.return_value.with_for_update.return_value.first.return_value = None
+        course_service._apply_rating_delta = Mock()
+
+        # Act
+        course_service.add_course_rating(course_id=1, user_id=42, rating=5)
+
+        # Assert
+        course_service._apply_rating_delta.assert_called_once_with(1, None, 5)
+
+    def test_delete_rating_updates_summary(
+        self,
+        course_service,
+        mock_db_session,
+        sample_rating
+    ):
+        """Test soft delete removes the rating from the course summary."""
+        # Arrange
+        mock_db_session.query.return_value.filter.return_value.with_for_update.return_value.first.return_value = sample_rating
+        course_service._apply_rating_delta = Mock()
+
+        # Act
+        course_service.delete_course_rating(course_id=1, user_id=42)
+
+        # Assert
+        course_service._apply_rating_delta.assert_called_once_with(1, 5, None)
+
+    def test_apply_rating_delta_executes_upsert(self, course_service, mock_db_session):
+        """Test the summary delta is a single UPSERT statement."""
+        # Act
+        course_service._apply_rating_delta(course_id=1, old_rating=3, new_rating=5)
+
+        # Assert
+        mock_db_session.execute.assert_called_once()
+        statement = str(mock_db_session.execute.call_args[0][0])
+        assert "ON CONFLICT" in statement
+
+    def test_get_top_courses(self, course_service, mock_db_session):
+        """Test leaderboard rows are mapped to response dictionaries."""
+        # Arrange
+        row = Mock(
+            id=1,
+            name="Test Course",
+            description="Test Description",
+            thumbnail="https://example.com/thumb.jpg",
+            slug="test-course",
+            total_ratings=4,
+            rating_sum=18,
+            bayesian_score=3.2142857
+        )
+        (
+            mock_db_session.query.return_value
+            .join.return_value
+            .filter.return_value
+            .order_by.return_value
+            .limit.return_value
+            .all.return_value
+        ) = [row]
+
+        # Act
+        result = course_service.get_top_courses(limit=5)
+
+        # Assert
+        assert result[0]["average_rating"] == 4.5
+        assert result[0]["bayesian_score"] == 3.2143
+        mock_db_session.query.return_value.join.return_value.filter.return_value.order_by.return_value.limit.assert_called_once_with(5)
+
+
+class TestRatingTrendRollups:
+    """Tests for time-bucketed rating rollups."""
+
+    def test_truncate_to_bucket(self):
+        """Test timestamps are truncated to hour and day buckets."""
+        timestamp = datetime(2025, 10, 14, 10, 37, 12, 5000)
+
+        assert truncate_to_bucket(timestamp, "hour") == datetime(2025, 10, 14, 10)
+        assert truncate_to_bucket(timestamp, "day") == datetime(2025, 10, 14)
+
+    def test_rollup_delta_upserts_hourly_and_daily(self, course_service, mock_db_session):
+        """Test a rating event updates both rollup granularities."""
+        # Act
+        course_service._apply_rollup_delta(course_id=1, old_rating=None, new_rating=4)
+
+        # Assert
+        statements = [str(call[0][0]) for call in mock_db_session.execute.call_args_list]
+        assert len(statements) == 2
+        assert "course_rating_rollups_hourly" in statements[0]
+        assert "course_rating_rollups_daily" in statements[1]
+
+    def test_get_trend_maps_buckets(self, course_service, mock_db_session):
+        """Test trend buckets are read from the rollup table."""
+        # Arrange
+        bucket = CourseRatingRollupDaily(
+            course_id=1,
+            bucket_start=datetime(2025, 10, 14),
+            submitted_count=4,
+            submitted_sum=18,
+            removed_count=1
+        )
+        mock_db_session.query.return_value.filter.return_value.order_by.return_value.all.return_value = [bucket]
+
+        # Act
+        result = course_service.get_course_rating_trend(
+            course_id=1,
+            granularity="day",
+            start=datetime(2025, 10, 1, 15),
+            end=datetime(2025, 10, 15)
+        )
+
+        # Assert
+        mock_db_session.query.assert_called_once_with(CourseRatingRollupDaily)
+        assert result == [
+            {
+                "bucket_start": "2025-10-14T00:00:00",
+                "submitted_count": 4,
+                "average_rating": 4.5,
+                "removed_count": 1
+            }
+        ]
+
+    def test_get_trend_course_not_found(self, course_service, mock_db_session):
+        """Test unknown or deleted courses raise instead of returning an empty series."""
+        # Arrange
+        mock_db_session.execute.return_value.scalar.return_value = None
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="Course with id 999 not found"):
+            course_service.get_course_rating_trend(
+                course_id=999,
+                granularity="day",
+                start=datetime(2025, 10, 1),
+                end=datetime(2025, 10, 15)
+            )
+        mock_db_session.query.assert_not_called()
+
+
+class TestGetBulkRatingStats:
+    """Tests for get_bulk_rating_stats method."""
+
+    def test_bulk_stats_from_summaries(self, course_service, mock_db_session):
+        """Test stats are built from summary rows in one query."""
+        # Arrange
+        summary = CourseRatingSummary(
+            course_id=1,
+            total_ratings=4,
+            rating_sum=18,
+            rating_1_count=0,
+            rating_2_count=0,
+            rating_3_count=0,
+            rating_4_count=2,
+            rating_5_count=2
+        )
+        mock_db_session.query.return_value.outerjoin.return_value.filter.return_value.all.return_value = [
+            (1, summary),
+            (2, None)  # Curso sin ratings
+        ]
+
+        # Act
+        result = course_service.get_bulk_rating_stats([1, 2, 3])
+
+        # Assert
+        mock_db_session.query.assert_called_once()
+        assert result[1]["average_rating"] == 4.5
+        assert result[1]["rating_distribution"][5] == 2
+        assert result[2]["total_ratings"] == 0
+        assert 3 not in result
+
+    def test_bulk_stats_empty_ids(self, course_service, mock_db_session):
+        """Test no query is executed without ids."""
+        assert course_service.get_bulk_rating_stats([]) == {}
+        mock_db_session.query.assert_not_called()
+
+
+class TestGetUserRatings:
+    """Tests for get_user_ratings method."""
+
+    def test_paginated_has_next_page(self, course_service, mock_db_session, sample_rating):
+        """Test next_cursor is set when more rows than limit exist."""
+        # Arrange
+        second_rating = CourseRating(
+            id=2,
+            course_id=2,
+            user_id=42,
+            rating=4,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+            deleted_at=None
+        )
+        mock_db_session.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+            sample_rating,
+            second_rating
+        ]
+
+        # Act
+        result = course_service.get_user_ratings(user_id=42, limit=1)
+
+        # Assert
+        assert len(result["items"]) == 1
+        assert result["next_cursor"] == 1
+        mock_db_session.query.return_value.filter.return_value.order_by.return_value.limit.assert_called_once_with(2)
+
+    def test_course_ids_not_paginated(self, course_service, mock_db_session, sample_rating):
+        """Test course_ids lookup returns every match without cursor."""
+        # Arrange
+        mock_db_session.query.return_value.filter.return_value.filter.return_value.order_by.return_value.all.return_value = [
+            sample_rating
+        ]
+
+        # Act
+        result = course_service.get_user_ratings(user_id=42, course_ids=[1, 5])
+
+        # Assert
+        assert result["items"][0]["course_id"] == 1
+        assert result["next_cursor"] is None
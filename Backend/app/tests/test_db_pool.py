@@ -0,0 +1,74 @@
+"""
+Tests for connection pool telemetry.
+Uses an in-memory SQLite engine, no PostgreSQL required.
+"""
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.db.pool import InstrumentedQueuePool, PoolStats, pool_status
+
+
+@pytest.fixture
+def stats():
+    """Isolated stats so tests don't touch the process-wide pool_stats."""
+    return PoolStats()
+
+
+@pytest.fixture
+def engine(stats):
+    """Engine with a single-connection instrumented pool."""
+    engine = create_engine(
+        "sqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05
+    )
+    engine.pool.stats = stats
+    yield engine
+    engine.dispose()
+
+
+class TestPoolStats:
+    """Tests for PoolStats counters."""
+
+    def test_histogram_buckets(self, stats):
+        """Test waits are counted in the first bucket that fits."""
+        # Act
+        stats.record_checkout(0.5)
+        stats.record_checkout(7)
+        stats.record_checkout(60000)
+
+        # Assert
+        snapshot = stats.snapshot()
+        assert snapshot["checkouts"] == 3
+        assert snapshot["wait_histogram"]["le_1ms"] == 1
+        assert snapshot["wait_histogram"]["le_10ms"] == 1
+        assert snapshot["wait_histogram"]["le_inf"] == 1
+        assert snapshot["wait_max_ms"] == 60000
+
+
+class TestInstrumentedQueuePool:
+    """Tests for checkout instrumentation."""
+
+    def test_checkout_is_recorded(self, engine, stats):
+        """Test a successful checkout records its wait time."""
+        # Act
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            status = pool_status(engine.pool)
+
+        # Assert
+        assert status["checked_out"] == 1
+        assert status["saturation"] == 1.0
+        assert stats.snapshot()["checkouts"] == 1
+
+    def test_timeout_is_recorded(self, engine, stats):
+        """Test exhausting the pool counts a timeout."""
+        # Arrange
+        with engine.connect():
+            # Act & Assert
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        assert stats.snapshot()["timeouts"] == 1
+        assert pool_status(engine.pool)["checked_out"] == 0
@@ -0,0 +1,329 @@
+"""
+Tests for read-replica routing.
+Uses two SQLite databases (primary and replica) with different contents,
+so the data returned tells which one served the query.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from app.core.cache import LocalCache, TwoTierCache
+from app.db.lazy_session import LazySession
+from app.db.routing import (
+    ReadYourWritesMiddleware,
+    ReadYourWritesTracker,
+    ReplicaSet,
+    RoutingSession,
+    parse_writes_cookie,
+    record_user_write,
+    replica_reads,
+)
+from app.models.base import Base
+from app.models.course import Course
+from app.models.course_rating import CourseRating
+from app.services.course_service import CourseService
+
+
+def _make_database(path, course_name):
+    """Create a database file with one course (and one rating from user 7)."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(Course(id=1, name=course_name, description="d", thumbnail="t", slug="curso"))
+        db.add(CourseRating(course_id=1, user_id=7, rating=5 if course_name == "primary" else 1))
+        db.commit()
+    return engine
+
+
+@pytest.fixture
+def primary(tmp_path):
+    engine = _make_database(tmp_path / "primary.db", "primary")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def replica(tmp_path):
+    engine = _make_database(tmp_path / "replica.db", "replica")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def tracker():
+    return ReadYourWritesTracker(window=60)
+
+
+@pytest.fixture
+def session_factory(primary, replica, tracker):
+    return sessionmaker(
+        class_=RoutingSession,
+        bind=primary,
+        replicas=ReplicaSet([replica]),
+        read_your_writes=tracker
+    )
+
+
+class TestRoutingSession:
+    """Tests for statement routing between primary and replica."""
+
+    def test_read_only_methods_use_replica(self, session_factory):
+        """Test @replica_read service methods are served by the replica."""
+        # Arrange
+        with session_factory() as db:
+            service = CourseService(db)
+
+            # Act
+            courses = service.get_all_courses()
+
+        # Assert
+        assert courses[0]["name"] == "replica"
+
+    def test_unmarked_reads_use_primary(self, session_factory):
+        """Test reads outside a read-only scope go to the primary."""
+        # Act
+        with session_factory() as db:
+            course = db.query(Course).first()
+
+        # Assert
+        assert course.name == "primary"
+
+    def test_reads_after_write_stay_on_primary(self, session_factory):
+        """Test a session that flushed a write no longer reads the replica."""
+        # Arrange
+        with session_factory() as db:
+            db.add(Course(id=2, name="nuevo", description="d", thumbnail="t", slug="nuevo"))
+            db.flush()
+
+            # Act
+            with replica_reads(db):
+                names = sorted(course.name for course in db.query(Course).all())
+
+        # Assert
+        assert names == ["nuevo", "primary"]
+
+    def test_falls_back_to_primary_without_replicas(self, primary):
+        """Test an empty replica set routes everything to the primary."""
+        # Arrange
+        factory = sessionmaker(class_=RoutingSession, bind=primary, replicas=ReplicaSet([]))
+
+        # Act
+        with factory() as db:
+            courses = CourseService(db).get_all_courses()
+
+        # Assert
+        assert courses[0]["name"] == "primary"
+
+    def test_lazy_session_routes_reads(self, session_factory):
+        """Test routing works through the lazy get_db proxy."""
+        # Arrange
+        db = LazySession(session_factory)
+
+        # Act
+        courses = CourseService(db).get_all_courses()
+
+        # Assert
+        assert courses[0]["name"] == "replica"
+        db.close()
+
+
+class TestReadYourWrites:
+    """Tests for the read-your-writes window."""
+
+    def test_user_reads_primary_inside_window(self, session_factory, tracker):
+        """Test a user who just wrote reads their own rating from the primary."""
+        # Arrange
+        tracker.record_write(7)
+
+        # Act
+        with session_factory() as db:
+            rating = CourseService(db).get_user_course_rating(1, user_id=7)
+
+        # Assert
+        assert rating["rating"] == 5
+
+    def test_other_users_keep_reading_replica(self, session_factory, tracker):
+        """Test the window only applies to the user who wrote."""
+        # Arrange
+        tracker.record_write(99)
+
+        # Act
+        with session_factory() as db:
+            rating = CourseService(db).get_user_course_rating(1, 7)
+
+        # Assert
+        assert rating["rating"] == 1
+
+    def test_async_session_writes_open_the_window(self, tracker):
+        """Test a write through an AsyncSession pins the user for sync reads."""
+        # Arrange
+        db = AsyncSession(sync_session_class=RoutingSession, read_your_writes=tracker)
+
+        # Act
+        record_user_write(db, 7)
+
+        # Assert
+        assert tracker.is_pinned(7) is True
+
+    def test_window_expires(self):
+        """Test a zero-length window never pins the user."""
+        # Arrange
+        tracker = ReadYourWritesTracker(window=0)
+
+        # Act
+        tracker.record_write(7)
+
+        # Assert
+        assert tracker.is_pinned(7) is False
+
+
+def worker(tracker):
+    """One worker process: writes open the window, reads report whether user 7 is pinned."""
+    def write(request):
+        tracker.record_write(7)
+        return JSONResponse({})
+
+    def pinned(request):
+        return JSONResponse({"pinned": tracker.is_pinned(7)})
+
+    app = Starlette(routes=[Route("/write", write, methods=["POST"]), Route("/pinned", pinned)])
+    app.add_middleware(ReadYourWritesMiddleware, tracker=tracker)
+    return TestClient(app)
+
+
+class TestCacheRefillAfterInvalidation:
+    """Tests for cache refills that must not read a lagging replica."""
+
+    def test_invalidated_entries_refill_from_primary(self, session_factory):
+        """Test the first loads after an invalidation skip the replica."""
+        # Arrange
+        cache = TwoTierCache(LocalCache(16), primary_window=60)
+        with session_factory() as db:
+            service = CourseService(db, cache=cache)
+            before = service.get_all_courses()[0]["name"]
+
+            # Act
+            cache.invalidate("courses", "all")
+            cache.evict_local_namespace("course")
+            catalog = service.get_all_courses()[0]["name"]
+            detail = service.get_course_by_slug("curso")["name"]
+
+        # Assert
+        assert before == "replica"
+        assert catalog == detail == "primary"
+
+    def test_other_entries_keep_using_replica(self, session_factory):
+        """Test only the invalidated key is pinned, not keys sharing its prefix."""
+        # Arrange
+        cache = TwoTierCache(LocalCache(16), primary_window=60)
+        cache.invalidate("rating_stats", 10)
+
+        # Act & Assert
+        assert cache.needs_primary("rating_stats", 10) is True
+        assert cache.needs_primary("rating_stats", 1) is False
+        assert cache.needs_primary("courses", "all") is False
+
+
+class TestReadYourWritesAcrossWorkers:
+    """Tests for the window carried by the client's cookie."""
+
+    def test_window_follows_the_client_to_another_worker(self):
+        """Test a write on one worker pins the user's next read on another."""
+        # Arrange
+        worker_a = worker(ReadYourWritesTracker(window=60))
+        worker_b = worker(ReadYourWritesTracker(window=60))
+
+        # Act
+        without_cookie = worker_b.get("/pinned")
+        written = worker_a.post("/write")
+        worker_b.cookies.set("ryw", written.cookies["ryw"])
+        with_cookie = worker_b.get("/pinned")
+
+        # Assert
+        assert "HttpOnly" in written.headers["set-cookie"]
+        assert with_cookie.json() == {"pinned": True}
+        assert without_cookie.json() == {"pinned": False}
+
+    def test_reads_do_not_set_the_cookie(self):
+        """Test requests that write nothing leave the cookie alone."""
+        # Act
+        response = worker(ReadYourWritesTracker(window=60)).get("/pinned")
+
+        # Assert
+        assert "set-cookie" not in response.headers
+
+    def test_cookie_windows_are_bounded(self):
+        """Test expired and malformed entries are dropped and long ones capped."""
+        # Act
+        writes = parse_writes_cookie("7:50_8:99999_9:103_x:1_10", now=100, window=5)
+
+        # Assert
+        assert writes == {8: 105, 9: 103}
+
+
+class TestReplicaSet:
+    """Tests for replica health and selection."""
+
+    def test_round_robin(self, primary, replica):
+        """Test healthy replicas are used in turn."""
+        # Arrange
+        replicas = ReplicaSet([primary, replica])
+
+        # Act
+        chosen = [replicas.choose() for _ in range(4)]
+
+        # Assert
+        assert chosen == [primary, replica, primary, replica]
+
+    def test_unhealthy_replica_is_skipped(self, primary, replica):
+        """Test a replica marked down is not chosen before the retry interval."""
+        # Arrange
+        replicas = ReplicaSet([primary, replica], retry_interval=60)
+        replicas.mark_down(0)
+
+        # Act
+        chosen = {replicas.choose() for _ in range(4)}
+
+        # Assert
+        assert chosen == {replica}
+        assert [item["healthy"] for item in replicas.status()] == [False, True]
+
+    def test_recovered_replica_is_probed_back(self, replica):
+        """Test a replica passing the probe after the retry interval is used again."""
+        # Arrange
+        replicas = ReplicaSet([replica], retry_interval=0)
+        replicas.mark_down(0)
+
+        # Act
+        chosen = replicas.choose()
+
+        # Assert
+        assert chosen is replica
+        assert replicas.status()[0]["healthy"] is True
+
+    def test_all_replicas_down_returns_none(self, tmp_path):
+        """Test choose() returns None when no replica answers the probe."""
+        # Arrange
+        broken = create_engine(f"sqlite:///{tmp_path}/missing/dir.db")
+        replicas = ReplicaSet([broken], retry_interval=0)
+        replicas.mark_down(0)
+
+        # Act & Assert
+        assert replicas.choose() is None
+
+
+class TestReplicaReadsWithoutRouting:
+    """Tests for non-routing sessions (mocks, plain Session)."""
+
+    def test_replica_reads_is_noop_for_plain_objects(self):
+        """Test the scope does nothing for sessions that can't route."""
+        # Arrange
+        db = object()
+
+        # Act & Assert
+        with replica_reads(db, user_id=1):
+            pass
@@ -0,0 +1,155 @@
+"""
+Tests for the readiness probe and the health rate limiter.
+Uses SQLite engines, no PostgreSQL required.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool, StaticPool
+from app.core.rate_limit import RateLimiter
+from app.db.health import ReadinessProbe, estimated_row_count
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    yield engine
+    engine.dispose()
+
+
+def _count_selects(engine):
+    """List that grows by one per SELECT 1 run on the engine."""
+    from sqlalchemy import event
+
+    calls = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement == "SELECT 1":
+            calls.append(statement)
+
+    return calls
+
+
+class TestReadinessProbe:
+    """Tests for the cached readiness check."""
+
+    def test_ready_when_database_answers(self, engine, clock):
+        """Test a reachable database makes the worker ready."""
+        # Arrange
+        probe = ReadinessProbe(engine, ttl=2.0, clock=clock)
+
+        # Act
+        result = probe.check()
+
+        # Assert
+        assert result["ready"] is True
+        assert result["reason"] is None
+        assert result["database"]["cached"] is False
+        assert set(result["pool"]) == {"checked_out", "capacity", "saturation"}
+
+    def test_result_cached_within_ttl(self, engine, clock):
+        """Test repeated probes within the TTL reuse the SELECT 1 result."""
+        # Arrange
+        probe = ReadinessProbe(engine, ttl=2.0, clock=clock)
+        selects = _count_selects(engine)
+
+        # Act
+        probe.check()
+        clock.now += 1.5
+        cached = probe.check()
+        clock.now += 1.0
+        refreshed = probe.check()
+
+        # Assert
+        assert len(selects) == 2
+        assert cached["database"]["cached"] is True
+        assert cached["database"]["age_s"] == 1.5
+        assert refreshed["database"]["cached"] is False
+
+    def test_not_ready_when_database_fails(self, clock):
+        """Test a connection error is reported as not ready with the reason."""
+        # Arrange
+        engine = create_engine("sqlite:////nonexistent/dir/db.sqlite")
+        probe = ReadinessProbe(engine, clock=clock)
+
+        # Act
+        result = probe.check()
+
+        # Assert
+        assert result["ready"] is False
+        assert "unable to open database file" in result["reason"]
+
+    def test_not_ready_when_pool_saturated(self, tmp_path, clock):
+        """Test a saturated pool fails readiness without checking out a connection."""
+        # Arrange
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'ready.db'}",
+            poolclass=QueuePool,
+            pool_size=1,
+            max_overflow=0
+        )
+        probe = ReadinessProbe(engine, clock=clock)
+        selects = _count_selects(engine)
+
+        # Act
+        with engine.connect():
+            result = probe.check()
+
+        # Assert
+        assert result["ready"] is False
+        assert result["reason"] == "pool saturated"
+        assert result["pool"]["saturation"] == 1.0
+        assert selects == []
+        engine.dispose()
+
+    def test_estimated_row_count_only_on_postgresql(self, engine):
+        """Test the reltuples estimate is skipped on other databases."""
+        # Act & Assert
+        with engine.connect() as connection:
+            assert estimated_row_count(connection, "courses") is None
+
+
+class TestRateLimiter:
+    """Tests for the sliding-window rate limiter."""
+
+    def test_allows_up_to_max_calls(self, clock):
+        """Test calls beyond the limit get the wait until the oldest expires."""
+        # Arrange
+        limiter = RateLimiter(max_calls=2, period=60.0, clock=clock)
+
+        # Act
+        first = limiter.acquire()
+        clock.now += 10
+        second = limiter.acquire()
+        third = limiter.acquire()
+
+        # Assert
+        assert first == 0.0
+        assert second == 0.0
+        assert third == 50.0
+
+    def test_window_slides(self, clock):
+        """Test a slot frees up once the oldest call leaves the window."""
+        # Arrange
+        limiter = RateLimiter(max_calls=1, period=60.0, clock=clock)
+        limiter.acquire()
+
+        # Act
+        clock.now += 60
+        result = limiter.acquire()
+
+        # Assert
+        assert result == 0.0
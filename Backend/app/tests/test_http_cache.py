@@ -0,0 +1,251 @@
+"""
+Tests for CDN caching headers and surrogate-key purging.
+Handlers run against mocked services and the purge hooks against an
+in-memory SQLite session, no PostgreSQL or CDN required.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import Mock
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.db.cache_invalidation as cache_invalidation
+from app.core.http_cache import (
+    CachePolicy,
+    HttpPurgeSink,
+    MemoryPurgeSink,
+    PurgeDispatcher,
+)
+from app.db.cache_invalidation import purge_keys
+from app.main import app, get_course_service
+from app.models.base import Base
+from app.models.course import Course
+from app.models.course_rating import CourseRating
+from app.services.course_service import CourseService
+
+COURSES = [
+    {"id": 1, "name": "React", "description": "d", "thumbnail": "t", "slug": "react"},
+    {"id": 2, "name": "Python", "description": "d", "thumbnail": "t", "slug": "python"},
+]
+
+
+@pytest.fixture
+def service():
+    return Mock(spec=CourseService)
+
+
+@pytest.fixture
+def client(service):
+    app.dependency_overrides[get_course_service] = lambda: service
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def purge_sink(monkeypatch):
+    """Route the write hooks to a local stand-in CDN."""
+    sink = MemoryPurgeSink()
+    dispatcher = PurgeDispatcher(sink)
+    monkeypatch.setattr(cache_invalidation, "cdn_purger", dispatcher)
+    return sink, dispatcher
+
+
+@pytest.fixture
+def db_session():
+    """In-memory database with one course."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(Course(id=1, name="Curso", description="d", thumbnail="t", slug="curso"))
+        db.commit()
+        yield db
+    engine.dispose()
+
+
+class TestCachePolicy:
+    """Tests for the Cache-Control rendered per route."""
+
+    def test_header(self):
+        """Test shared-cache directives and browser revalidation."""
+        policy = CachePolicy(s_maxage=60, stale_while_revalidate=300)
+        assert policy.header == "public, max-age=0, s-maxage=60, stale-while-revalidate=300"
+
+    def test_from_config(self):
+        """Test settings map route paths to policies."""
+        # Act
+        policies = CachePolicy.from_config({"/courses": {"s_maxage": 30, "stale_if_error": 600}})
+
+        # Assert
+        assert policies["/courses"].header == "public, max-age=0, s-maxage=30, stale-if-error=600"
+
+
+class TestHttpCacheHeaders:
+    """Tests for Cache-Control and Surrogate-Key on the read endpoints."""
+
+    def test_catalog_lists_every_course(self, client, service):
+        """Test the catalog is tagged with the catalog key and each course."""
+        # Arrange
+        service.get_all_courses.return_value = COURSES
+
+        # Act
+        response = client.get("/courses")
+
+        # Assert
+        assert response.headers["Cache-Control"] == "public, max-age=0, s-maxage=60, stale-while-revalidate=300"
+        assert response.headers["Surrogate-Key"] == "course-1 course-2 courses"
+
+    def test_detail_tagged_with_its_course(self, client, service):
+        """Test a course detail is tagged with its own id only."""
+        # Arrange
+        service.get_course_by_slug.return_value = {**COURSES[0], "teacher_id": [], "classes": []}
+
+        # Act
+        response = client.get("/courses/react")
+
+        # Assert
+        assert response.headers["Surrogate-Key"] == "course-1"
+        assert "s-maxage=300" in response.headers["Cache-Control"]
+
+    def test_course_id_routes_tagged_automatically(self, client, service):
+        """Test routes with a {course_id} parameter get its key without handler code."""
+        # Arrange
+        service.get_course_rating_stats.return_value = {
+            "average_rating": 4.0, "total_ratings": 1, "rating_distribution": {4: 1}
+        }
+
+        # Act
+        response = client.get("/courses/7/ratings/stats")
+
+        # Assert
+        assert response.headers["Surrogate-Key"] == "course-7"
+        assert "s-maxage=30" in response.headers["Cache-Control"]
+
+    def test_bulk_stats_tagged_with_requested_ids(self, client, service):
+        """Test ids missing from the answer are tagged too (creating them purges)."""
+        # Arrange
+        service.get_bulk_rating_stats.return_value = {}
+
+        # Act
+        response = client.get("/ratings/stats?course_ids=1,3")
+
+        # Assert
+        assert response.headers["Surrogate-Key"] == "course-1 course-3"
+
+    def test_errors_and_private_routes_not_stored(self, client, service):
+        """Test 404s, per-user and admin routes tell every cache not to store them."""
+        # Arrange
+        service.get_course_by_slug.return_value = None
+        service.get_user_ratings.return_value = {"items": [], "next_cursor": None}
+
+        # Act
+        missing = client.get("/courses/unknown")
+        private = client.get("/users/42/ratings")
+        admin = client.get("/admin/http-cache")
+
+        # Assert
+        assert missing.status_code == 404
+        assert missing.headers["Cache-Control"] == "private, no-store"
+        assert "Surrogate-Key" not in missing.headers
+        assert private.status_code == 200
+        assert private.headers["Cache-Control"] == "private, no-store"
+        assert admin.headers["Cache-Control"] == "private, no-store"
+
+
+class TestPurgeOnWrite:
+    """Tests for the purge hooks of the write path."""
+
+    def test_purge_keys(self):
+        """Test changed courses purge their key and the catalog."""
+        assert purge_keys({("rating", 1), ("course", 2)}) == {"course-1", "course-2", "courses"}
+        assert purge_keys(set()) == set()
+
+    def test_committed_rating_purges(self, db_session, purge_sink):
+        """Test a committed rating write purges its course and the catalog once."""
+        # Arrange
+        sink, dispatcher = purge_sink
+        db_session.add(CourseRating(course_id=1, user_id=42, rating=5))
+
+        # Act
+        db_session.commit()
+        dispatcher.wait()
+
+        # Assert
+        assert sink.purges == [{"course-1", "courses"}]
+        assert dispatcher.snapshot()["keys"] == 2
+
+    def test_rollback_does_not_purge(self, db_session, purge_sink):
+        """Test flushed but rolled back changes are not purged."""
+        # Arrange
+        sink, dispatcher = purge_sink
+        db_session.add(CourseRating(course_id=1, user_id=42, rating=5))
+        db_session.flush()
+
+        # Act
+        db_session.rollback()
+        db_session.commit()
+        dispatcher.wait()
+
+        # Assert
+        assert sink.purges == []
+
+    def test_failed_purge_is_recorded(self):
+        """Test a sink error is counted and does not stop later purges."""
+        # Arrange
+        sink = Mock()
+        sink.purge.side_effect = [OSError("CDN unavailable"), None]
+        dispatcher = PurgeDispatcher(sink)
+
+        # Act
+        dispatcher.submit(["course-1"])
+        dispatcher.wait()
+        dispatcher.submit(["course-2"])
+        dispatcher.wait()
+
+        # Assert
+        snapshot = dispatcher.snapshot()
+        assert snapshot["errors"] == 1
+        assert snapshot["purges"] == 1
+        assert snapshot["last_error"] == "CDN unavailable"
+
+
+class TestHttpPurgeSink:
+    """Tests for the HTTP purge call against a local stand-in endpoint."""
+
+    def test_posts_keys(self):
+        """Test keys travel in the Surrogate-Key header and the JSON body."""
+        # Arrange
+        received = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                received.append((dict(self.headers), json.loads(body)))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        sink = HttpPurgeSink(
+            f"http://127.0.0.1:{server.server_address[1]}/purge", headers={"Fastly-Key": "secret"}
+        )
+
+        # Act
+        try:
+            sink.purge({"courses", "course-1"})
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        # Assert
+        headers, body = received[0]
+        assert headers["Surrogate-Key"] == "course-1 courses"
+        assert headers["Fastly-Key"] == "secret"
+        assert body == {"surrogate_keys": ["course-1", "courses"]}
@@ -0,0 +1,130 @@
+"""
+Tests for the lazy session dependency.
+Uses an in-memory SQLite engine, no PostgreSQL required.
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+import app.db.base as db_base
+from app.db.lazy_session import LazySession, track_checkouts
+from app.db.pool import RequestCheckoutStats
+
+
+@pytest.fixture
+def factory():
+    """Session factory with checkout tracking on an in-memory database."""
+    engine = create_engine("sqlite://")
+    factory = sessionmaker(bind=engine)
+    track_checkouts(factory)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def stats(monkeypatch, factory):
+    """Route get_db to the test factory and isolated request stats."""
+    stats = RequestCheckoutStats()
+    monkeypatch.setattr(db_base, "SessionLocal", factory)
+    monkeypatch.setattr(db_base, "request_checkout_stats", stats)
+    return stats
+
+
+def _run_request(handler=None):
+    """Drive get_db like FastAPI does for one request."""
+    dependency = db_base.get_db()
+    db = next(dependency)
+    if handler is not None:
+        handler(db)
+    with pytest.raises(StopIteration):
+        next(dependency)
+    return db
+
+
+class TestLazySession:
+    """Tests for LazySession."""
+
+    def test_session_not_created_until_used(self, factory):
+        """Test the proxy creates nothing until a session attribute is used."""
+        # Arrange
+        db = LazySession(factory)
+
+        # Act
+        db.info["flag"] = True
+
+        # Assert
+        assert db.created is False
+        assert db.checked_out is False
+
+    def test_first_query_checks_out_connection(self, factory):
+        """Test the first query creates the session and takes a connection."""
+        # Arrange
+        db = LazySession(factory)
+
+        # Act
+        result = db.execute(text("SELECT 1")).scalar()
+
+        # Assert
+        assert result == 1
+        assert db.created is True
+        assert db.checked_out is True
+        db.close()
+
+    def test_pending_info_copied_to_session(self, factory):
+        """Test info set before creation is visible on the real session."""
+        # Arrange
+        db = LazySession(factory)
+        db.info["flag"] = True
+
+        # Act
+        session = db.session
+
+        # Assert
+        assert session.info["flag"] is True
+        assert db.info is session.info
+
+    def test_close_without_session_is_noop(self, factory):
+        """Test closing an unused proxy doesn't create a session."""
+        # Arrange
+        db = LazySession(factory)
+
+        # Act
+        db.close()
+
+        # Assert
+        assert db.created is False
+
+
+class TestGetDbCheckoutStats:
+    """Tests for zero-checkout request instrumentation in get_db."""
+
+    def test_unused_request_counts_as_zero_checkout(self, stats):
+        """Test a request that never queries is counted as zero checkout."""
+        # Act
+        _run_request()
+
+        # Assert
+        snapshot = stats.snapshot()
+        assert snapshot["requests"] == 1
+        assert snapshot["sessions_created"] == 0
+        assert snapshot["zero_checkout_requests"] == 1
+
+    def test_querying_request_counts_checkout(self, stats):
+        """Test a request that runs a query is not zero checkout."""
+        # Act
+        _run_request(lambda db: db.execute(text("SELECT 1")))
+
+        # Assert
+        snapshot = stats.snapshot()
+        assert snapshot["sessions_created"] == 1
+        assert snapshot["zero_checkout_requests"] == 0
+        assert snapshot["zero_checkout_ratio"] == 0.0
+
+    def test_session_without_query_counts_as_zero_checkout(self, stats):
+        """Test a session created but never queried took no connection."""
+        # Act
+        _run_request(lambda db: db.add_all([]))
+
+        # Assert
+        snapshot = stats.snapshot()
+        assert snapshot["sessions_created"] == 1
+        assert snapshot["zero_checkout_requests"] == 1
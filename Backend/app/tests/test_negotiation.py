@@ -0,0 +1,127 @@
+"""
+Tests for MessagePack content negotiation.
+Uses a standalone FastAPI app, no PostgreSQL required.
+"""
+from datetime import datetime
+from typing import List
+
+import msgpack
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.core.negotiation import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    ContentNegotiationMiddleware,
+    NegotiatedJSONResponse,
+    NegotiatedORJSONResponse,
+    negotiate_media_type,
+)
+
+ROWS = [
+    {"id": 1, "rating": 5, "created_at": datetime(2025, 1, 1, 12, 30)},
+    {"id": 2, "rating": 3, "created_at": datetime(2025, 1, 2, 8, 0, 0, 250)},
+]
+
+
+class Rating(BaseModel):
+    id: int
+    rating: int
+    created_at: datetime
+
+
+@pytest.fixture
+def client():
+    app = FastAPI(default_response_class=NegotiatedJSONResponse)
+    app.add_middleware(ContentNegotiationMiddleware)
+
+    @app.get("/models", response_model=List[Rating])
+    def models():
+        return ROWS
+
+    @app.get("/rows", response_model=List[Rating])
+    def rows():
+        return NegotiatedORJSONResponse(ROWS, headers={"X-Next-Cursor": "abc"})
+
+    @app.get("/missing")
+    def missing():
+        raise HTTPException(status_code=404, detail="Course not found")
+
+    return TestClient(app)
+
+
+def get_msgpack(client, path):
+    return client.get(path, headers={"Accept": MSGPACK_MEDIA_TYPE})
+
+
+class TestNegotiateMediaType:
+    """Tests for Accept header parsing."""
+
+    @pytest.mark.parametrize("header, expected", [
+        ("application/msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/x-msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/msgpack, application/json", MSGPACK_MEDIA_TYPE),
+        ("application/msgpack;q=0.5, application/json", JSON_MEDIA_TYPE),
+        ("application/json;q=0.5, application/msgpack;q=0.9", MSGPACK_MEDIA_TYPE),
+        ("application/msgpack;q=0", JSON_MEDIA_TYPE),
+        ("*/*", JSON_MEDIA_TYPE),
+        ("application/*", JSON_MEDIA_TYPE),
+        ("", JSON_MEDIA_TYPE),
+    ])
+    def test_negotiation(self, header, expected):
+        """Test q-values and that wildcards never select MessagePack."""
+        assert negotiate_media_type(header) == expected
+
+
+class TestNegotiatedResponses:
+    """Tests for the negotiated response classes."""
+
+    @pytest.mark.parametrize("path", ["/models", "/rows"])
+    def test_msgpack_matches_json_payload(self, client, path):
+        """Test both formats decode to the same payload."""
+        # Act
+        as_json = client.get(path)
+        as_msgpack = get_msgpack(client, path)
+
+        # Assert
+        assert as_json.headers["content-type"] == JSON_MEDIA_TYPE
+        assert as_msgpack.headers["content-type"] == MSGPACK_MEDIA_TYPE
+        assert msgpack.unpackb(as_msgpack.content) == as_json.json()
+
+    def test_datetimes_are_iso_strings(self, client):
+        """Test pre-serialized rows keep their datetimes as ISO 8601 strings."""
+        # Act
+        body = msgpack.unpackb(get_msgpack(client, "/rows").content)
+
+        # Assert
+        assert body[0]["created_at"] == "2025-01-01T12:30:00"
+        assert body[1]["created_at"] == "2025-01-02T08:00:00.000250"
+
+    @pytest.mark.parametrize("path", ["/models", "/rows"])
+    def test_vary_accept(self, client, path):
+        """Test responses declare they vary on Accept."""
+        # Act
+        response = get_msgpack(client, path)
+
+        # Assert
+        assert response.headers["vary"] == "Accept"
+
+    def test_custom_headers_are_kept(self, client):
+        """Test headers passed by the handler survive negotiation."""
+        # Act
+        response = get_msgpack(client, "/rows")
+
+        # Assert
+        assert response.headers["x-next-cursor"] == "abc"
+
+    def test_errors_stay_json(self, client):
+        """Test error responses are JSON even when MessagePack is accepted."""
+        # Act
+        response = get_msgpack(client, "/missing")
+
+        # Assert
+        assert response.status_code == 404
+        assert response.headers["content-type"] == JSON_MEDIA_TYPE
+        assert response.json() == {"detail": "Course not found"}
@@ -0,0 +1,151 @@
+"""
+Tests for per-request query counting and the Server-Timing middleware.
+Uses an in-memory SQLite engine, no PostgreSQL required.
+"""
+import logging
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.query_timing import QueryTimingMiddleware
+from app.db.query_counter import collect_queries, current_collector
+from app.models.base import Base
+from app.models.course import Course
+from app.services.course_service import CourseService
+
+
+@pytest.fixture
+def engine():
+    """Shared in-memory database with two courses."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        for course_id in (1, 2):
+            db.add(Course(
+                id=course_id,
+                name=f"Curso {course_id}",
+                description="d",
+                thumbnail="t",
+                slug=f"curso-{course_id}"
+            ))
+        db.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(engine):
+    with sessionmaker(bind=engine)() as session:
+        yield session
+
+
+@pytest.fixture
+def client(engine):
+    """App with the middleware and routes running a known number of queries."""
+    app = FastAPI()
+    app.add_middleware(QueryTimingMiddleware, default_budget=2, budgets={"/unlimited/{n}": 0})
+
+    def run_queries(n: int) -> dict:
+        with engine.connect() as connection:
+            for _ in range(n):
+                connection.execute(text("SELECT 1"))
+        return {"n": n}
+
+    @app.get("/queries/{n}")
+    def queries(n: int) -> dict:
+        return run_queries(n)
+
+    @app.get("/unlimited/{n}")
+    def unlimited(n: int) -> dict:
+        return run_queries(n)
+
+    return TestClient(app)
+
+
+class TestCollectQueries:
+    """Tests for the collector used directly (e.g. from tests)."""
+
+    def test_counts_service_queries(self, db_session):
+        """Test get_course_rating_stats runs existence, totals and distribution queries."""
+        # Act
+        with collect_queries() as queries:
+            CourseService(db_session).get_course_rating_stats(1)
+
+        # Assert
+        assert queries.count == 3
+        assert queries.duration_ms > 0
+
+    def test_counts_n_plus_one(self, db_session):
+        """Test get_all_courses cost grows with the number of courses."""
+        # Act
+        with collect_queries() as queries:
+            CourseService(db_session).get_all_courses()
+
+        # Assert
+        assert queries.count == 1 + 3 * 2  # listado + stats por curso
+
+    def test_no_collector_outside_scope(self, db_session):
+        """Test queries outside collect_queries() are not recorded anywhere."""
+        # Act
+        with collect_queries():
+            pass
+        CourseService(db_session).get_course_rating_stats(1)
+
+        # Assert
+        assert current_collector() is None
+
+    def test_server_timing_format(self):
+        """Test the header value follows the Server-Timing syntax."""
+        # Arrange
+        with collect_queries() as queries:
+            queries.record("SELECT 1", 1.25)
+
+        # Act & Assert
+        assert queries.server_timing() == 'db;dur=1.2;desc="1 query"'
+
+
+class TestQueryTimingMiddleware:
+    """Tests for the Server-Timing header and query budgets."""
+
+    def test_server_timing_header(self, client):
+        """Test the response reports the queries run by the endpoint."""
+        # Act
+        response = client.get("/queries/2")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["server-timing"].startswith("db;dur=")
+        assert response.headers["server-timing"].endswith('desc="2 queries"')
+
+    def test_budget_exceeded_logs_warning(self, client, caplog):
+        """Test exceeding the route budget logs the route template and count."""
+        # Act
+        with caplog.at_level(logging.WARNING, logger="app.core.query_timing"):
+            client.get("/queries/3")
+
+        # Assert
+        assert "GET /queries/{n} ran 3 queries" in caplog.text
+
+    def test_within_budget_no_warning(self, client, caplog):
+        """Test no warning is logged within the budget."""
+        # Act
+        with caplog.at_level(logging.WARNING, logger="app.core.query_timing"):
+            client.get("/queries/2")
+
+        # Assert
+        assert "Query budget exceeded" not in caplog.text
+
+    def test_route_budget_zero_disables_check(self, client, caplog):
+        """Test a per-route budget of 0 disables the warning."""
+        # Act
+        with caplog.at_level(logging.WARNING, logger="app.core.query_timing"):
+            client.get("/unlimited/10")
+
+        # Assert
+        assert "Query budget exceeded" not in caplog.text
@@ -0,0 +1,161 @@
+"""
+Query plan tests for the hot read paths (requires test database).
+
+Captures the SQL a CourseService method runs and checks its EXPLAIN plan
+against the indexes from migrations 14fd8a4965ad and 5c1f0e9b7d42. Sequential and bitmap
+scans are disabled so the tiny test tables don't make the planner skip
+the indexes; everything runs in a transaction that is rolled back.
+"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.db.base import engine
+from app.models.course import Course
+from app.models.course_rating import CourseRating
+from app.models.lesson import Lesson
+from app.services.course_service import CourseService
+
+
+@pytest.fixture
+def connection():
+    """Connection in a rolled-back transaction with index-friendly planner settings."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    connection.exec_driver_sql("SET LOCAL enable_bitmapscan = off")
+    yield connection
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def db_session(connection):
+    """Session joined to the test transaction."""
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def course(db_session, connection):
+    """Course with one active and one deleted lesson and some ratings."""
+    course = Course(
+        name="Plan Course",
+        description="Test Description",
+        thumbnail="https://example.com/thumb.jpg",
+        slug="plan-course"
+    )
+    db_session.add(course)
+    db_session.flush()
+
+    db_session.add_all([
+        Lesson(course_id=course.id, name="Intro", description="d", slug="intro", video_url="v"),
+        *[
+            CourseRating(course_id=course.id, user_id=user_id, rating=user_id % 5 + 1)
+            for user_id in range(1, 21)
+        ]
+    ])
+    db_session.flush()
+    connection.exec_driver_sql("ANALYZE courses, lessons, course_ratings")
+    return course
+
+
+def _plans_of(connection, call):
+    """Run call() and return the EXPLAIN plan of every statement it executed."""
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", _capture)
+    try:
+        call()
+    finally:
+        event.remove(connection, "before_cursor_execute", _capture)
+
+    return [
+        (statement, connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()[0]["Plan"])
+        for statement, parameters in statements
+    ]
+
+
+def _scans(plan):
+    """(node type, index name, relation) of every scan node in a plan tree."""
+    scans = []
+    if "Scan" in plan["Node Type"]:
+        scans.append((plan["Node Type"], plan.get("Index Name"), plan.get("Relation Name")))
+    for child in plan.get("Plans", []):
+        scans.extend(_scans(child))
+    return scans
+
+
+def _rating_scans(plans):
+    return [
+        scan
+        for _, plan in plans
+        for scan in _scans(plan)
+        if scan[2] == "course_ratings"
+    ]
+
+
+class TestQueryPlans:
+    """EXPLAIN-based checks for index usage."""
+
+    def test_rating_stats_use_index_only_scan(self, db_session, connection, course):
+        """Test avg/count and distribution are served from the covering index."""
+        # Act
+        plans = _plans_of(
+            connection,
+            lambda: CourseService(db_session).get_course_rating_stats(course.id)
+        )
+
+        # Assert
+        rating_scans = _rating_scans(plans)
+        assert len(rating_scans) == 2  # totales + distribución
+        assert all(
+            scan[:2] == ("Index Only Scan", "ix_course_ratings_course_active")
+            for scan in rating_scans
+        )
+
+    def test_course_by_slug_uses_partial_indexes(self, db_session, connection, course):
+        """Test the detail query uses the partial slug/lesson indexes and index-only stats."""
+        # Act
+        plans = _plans_of(
+            connection,
+            lambda: CourseService(db_session).get_course_by_slug(course.slug)
+        )
+
+        # Assert
+        detail_scans = _scans(plans[0][1])
+        assert ("Index Scan", "ix_courses_slug_active", "courses") in detail_scans
+        assert ("Index Scan", "ix_lessons_course_active", "lessons") in detail_scans
+
+        rating_scans = _rating_scans(plans)
+        assert rating_scans
+        assert all(scan[0] == "Index Only Scan" for scan in rating_scans)
+
+        assert not any(
+            scan[0] == "Seq Scan"
+            for _, plan in plans
+            for scan in _scans(plan)
+        )
+
+    def test_rating_page_uses_keyset_index(self, db_session, connection, course):
+        """Test a cursor page is one backward range scan with the cursor in the index condition."""
+        # Arrange
+        service = CourseService(db_session)
+        cursor = service.get_course_ratings(course.id, limit=5)["next_cursor"]
+
+        # Act
+        plans = _plans_of(
+            connection,
+            lambda: service.get_course_ratings(course.id, limit=5, cursor=cursor)
+        )
+
+        # Assert
+        page_plan = plans[-1][1]
+        assert page_plan["Node Type"] == "Limit"
+        scan = page_plan["Plans"][0]
+        assert (scan["Node Type"], scan["Index Name"]) == ("Index Scan", "ix_course_ratings_course_created_active")
+        assert scan["Scan Direction"] == "Backward"
+        assert "created_at, id" in scan["Index Cond"]
@@ -4,10 +4,15 @@ Tests actual database constraints (requires test database).
 """
 import pytest
 from datetime import datetime
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, select, text, update
+from sqlalchemy.exc import IntegrityError, OperationalError
 from app.db.base import SessionLocal
 from app.models.course import Course
 from app.models.course_rating import CourseRating
+from app.models.course_rating_rollup import CourseRatingRollupHourly
+from app.models.course_rating_summary import CourseRatingSummary
+from app.services.course_service import CourseService
+from app.services.rating_aggregates import course_ratings_lock
 
 
 @pytest.fixture
@@ -144,3 +149,74 @@ class TestRatingConstraints:
         # Act & Assert
         with pytest.raises(IntegrityError, match="fk_course_ratings_course_id"):
             db_session.commit()
+
+
+class TestRollupBackfill:
+    """Derived-data rebuilds lock one chunk of courses at a time."""
+
+    def test_writes_wait_only_for_their_course(self, db_session, sample_course):
+        """Test a rating write waits for its course's lock, not for other courses."""
+        # Arrange: lo que mantiene un chunk del backfill mientras reconstruye
+        holder = SessionLocal()
+        holder.execute(course_ratings_lock(sample_course.id))
+        other_course = Course(
+            name="Other",
+            description="d",
+            thumbnail="t",
+            slug=f"other-{datetime.utcnow().timestamp()}"
+        )
+        db_session.add(other_course)
+        db_session.commit()
+        writer = SessionLocal()
+
+        try:
+            # Act & Assert
+            writer.execute(text("SET LOCAL lock_timeout = '200ms'"))
+            with pytest.raises(OperationalError, match="lock timeout"):
+                CourseService(writer).add_course_rating(sample_course.id, user_id=43, rating=5)
+            writer.rollback()
+
+            writer.execute(text("SET LOCAL lock_timeout = '200ms'"))
+            result = CourseService(writer).add_course_rating(other_course.id, user_id=43, rating=5)
+            assert result["rating"] == 5
+        finally:
+            writer.rollback()
+            writer.close()
+            holder.rollback()
+            holder.close()
+
+    def test_backfill_does_not_double_count_live_deltas(self, db_session, sample_course):
+        """Test rebuilt rollups replace the ones kept by the write path."""
+        # Arrange
+        CourseService(db_session).add_course_rating(sample_course.id, user_id=42, rating=4)
+
+        # Act
+        chunks = list(CourseService(db_session).backfill_rating_rollups(chunk_size=50))
+        submitted = db_session.execute(
+            select(func.sum(CourseRatingRollupHourly.submitted_count))
+            .where(CourseRatingRollupHourly.course_id == sample_course.id)
+        ).scalar()
+
+        # Assert
+        assert chunks[-1] >= sample_course.id
+        assert submitted == 1
+
+    def test_summary_rebuild_repairs_drift(self, db_session, sample_course):
+        """Test the summary rebuild recomputes a drifted row from course_ratings."""
+        # Arrange
+        CourseService(db_session).add_course_rating(sample_course.id, user_id=42, rating=4)
+        db_session.execute(
+            update(CourseRatingSummary)
+            .where(CourseRatingSummary.course_id == sample_course.id)
+            .values(total_ratings=99)
+        )
+        db_session.commit()
+
+        # Act
+        rebuilt = CourseService(db_session).rebuild_rating_summaries(chunk_size=50)
+        summary = db_session.get(CourseRatingSummary, sample_course.id)
+        db_session.refresh(summary)
+
+        # Assert
+        assert rebuilt >= 1
+        assert (summary.total_ratings, summary.rating_sum) == (1, 4)
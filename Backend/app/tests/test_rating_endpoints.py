@@ -2,10 +2,16 @@
 Integration tests for course rating API endpoints.
 Tests HTTP interface with mocked service layer.
 """
+import msgpack
 import pytest
+from datetime import datetime
 from unittest.mock import Mock
+from typing import List
 from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
 from app.main import app, get_course_service
+from app.models.course_rating import CourseRating
+from app.schemas.rating import RatingResponse
 from app.services.course_service import CourseService
 
 
@@ -25,6 +31,11 @@ MOCK_RATING_STATS = {
 }
 
 
+def page_of(*items, next_cursor=None, total=None):
+    """Page dict as returned by CourseService.get_course_ratings."""
+    return {"items": list(items), "next_cursor": next_cursor, "total": total}
+
+
 @pytest.fixture
 def mock_course_service():
     """Create mock CourseService for testing."""
@@ -112,7 +123,7 @@ class TestGetCourseRatingsEndpoint:
     def test_get_ratings_success(self, client, mock_course_service):
         """Test retrieving course ratings."""
         # Arrange
-        mock_course_service.get_course_ratings.return_value = [MOCK_RATING]
+        mock_course_service.get_course_ratings.return_value = page_of(MOCK_RATING)
 
         # Act
         response = client.get("/courses/1/ratings")
@@ -127,7 +138,7 @@ class TestGetCourseRatingsEndpoint:
     def test_get_ratings_empty(self, client, mock_course_service):
         """Test retrieving ratings for course with no ratings."""
         # Arrange
-        mock_course_service.get_course_ratings.return_value = []
+        mock_course_service.get_course_ratings.return_value = page_of()
 
         # Act
         response = client.get("/courses/1/ratings")
@@ -147,6 +158,102 @@ class TestGetCourseRatingsEndpoint:
         # Assert
         assert response.status_code == 404
 
+    def test_get_ratings_pagination_headers(self, client, mock_course_service):
+        """Test next cursor and total travel in headers, body stays a list."""
+        # Arrange
+        mock_course_service.get_course_ratings.return_value = page_of(
+            MOCK_RATING,
+            next_cursor="abc",
+            total=142
+        )
+
+        # Act
+        response = client.get("/courses/1/ratings?limit=1&rating=5&include_total=true&cursor=xyz")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == [MOCK_RATING]
+        assert response.headers["x-next-cursor"] == "abc"
+        assert response.headers["x-total-count"] == "142"
+        mock_course_service.get_course_ratings.assert_called_once_with(
+            1,
+            limit=1,
+            cursor="xyz",
+            rating=5,
+            include_total=True
+        )
+
+    def test_get_ratings_last_page_has_no_headers(self, client, mock_course_service):
+        """Test the last page omits X-Next-Cursor and X-Total-Count unless requested."""
+        # Arrange
+        mock_course_service.get_course_ratings.return_value = page_of(MOCK_RATING)
+
+        # Act
+        response = client.get("/courses/1/ratings")
+
+        # Assert
+        assert "x-next-cursor" not in response.headers
+        assert "x-total-count" not in response.headers
+        mock_course_service.get_course_ratings.assert_called_once_with(
+            1,
+            limit=50,
+            cursor=None,
+            rating=None,
+            include_total=False
+        )
+
+    def test_get_ratings_invalid_cursor(self, client, mock_course_service):
+        """Test a malformed cursor is a 400."""
+        # Arrange
+        mock_course_service.get_course_ratings.side_effect = ValueError("Invalid cursor")
+
+        # Act
+        response = client.get("/courses/1/ratings?cursor=garbage")
+
+        # Assert
+        assert response.status_code == 400
+
+    def test_get_ratings_invalid_filters(self, client):
+        """Test star filter and page size are validated."""
+        # Act & Assert
+        assert client.get("/courses/1/ratings?rating=6").status_code == 422
+        assert client.get("/courses/1/ratings?limit=0").status_code == 422
+        assert client.get("/courses/1/ratings?limit=100000").status_code == 422
+
+    def test_get_ratings_body_matches_response_model(self, client, mock_course_service):
+        """Test the orjson fast path still honors the documented schema."""
+        # Arrange
+        rating = CourseRating(
+            id=7,
+            course_id=1,
+            user_id=42,
+            rating=4,
+            created_at=datetime(2025, 10, 14, 10, 30),
+            updated_at=datetime(2025, 10, 14, 10, 31)
+        )
+        mock_course_service.get_course_ratings.return_value = page_of(rating.to_dict())
+
+        # Act
+        response = client.get("/courses/1/ratings")
+
+        # Assert
+        assert response.headers["content-type"] == "application/json"
+        validated = TypeAdapter(List[RatingResponse]).validate_json(response.content)
+        assert validated[0].model_dump() == rating.to_dict()
+
+    def test_get_ratings_msgpack(self, client, mock_course_service):
+        """Test a MessagePack page has the same rows and pagination headers."""
+        # Arrange
+        mock_course_service.get_course_ratings.return_value = page_of(MOCK_RATING, next_cursor="abc")
+
+        # Act
+        response = client.get("/courses/1/ratings", headers={"Accept": "application/msgpack"})
+
+        # Assert
+        assert response.headers["content-type"] == "application/msgpack"
+        assert msgpack.unpackb(response.content) == [MOCK_RATING]
+        assert response.headers["x-next-cursor"] == "abc"
+
 
 class TestGetCourseRatingStatsEndpoint:
     """Tests for GET /courses/{course_id}/ratings/stats"""
@@ -282,13 +389,50 @@ class TestDeleteCourseRatingEndpoint:
         assert response.status_code == 404
 
 
+class TestTopCoursesEndpoint:
+    """Tests for GET /courses/top"""
+
+    def test_get_top_courses_success(self, client, mock_course_service):
+        """Test leaderboard is served and not routed as a course slug."""
+        # Arrange
+        mock_course_service.get_top_courses.return_value = [
+            {
+                "id": 1,
+                "name": "Curso de React",
+                "description": "Aprende React desde cero",
+                "thumbnail": "https://via.placeholder.com/150",
+                "slug": "curso-de-react",
+                "average_rating": 4.5,
+                "total_ratings": 120,
+                "bayesian_score": 4.42
+            }
+        ]
+
+        # Act
+        response = client.get("/courses/top?limit=5")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()[0]["bayesian_score"] == 4.42
+        mock_course_service.get_top_courses.assert_called_once_with(limit=5)
+        mock_course_service.get_course_by_slug.assert_not_called()
+
+    def test_get_top_courses_limit_too_large(self, client, mock_course_service):
+        """Test limit is capped by settings."""
+        # Act
+        response = client.get("/courses/top?limit=100000")
+
+        # Assert
+        assert response.status_code == 422
+
+
 class TestRatingEndpointsContractCompliance:
     """Tests to ensure API contract compliance."""
 
     def test_rating_response_structure(self, client, mock_course_service):
         """Verify rating response contains exactly expected fields."""
         # Arrange
-        mock_course_service.get_course_ratings.return_value = [MOCK_RATING]
+        mock_course_service.get_course_ratings.return_value = page_of(MOCK_RATING)
 
         # Act
         response = client.get("/courses/1/ratings")
@@ -312,3 +456,163 @@ class TestRatingEndpointsContractCompliance:
         expected_fields = {"average_rating", "total_ratings", "rating_distribution"}
         actual_fields = set(data.keys())
         assert actual_fields == expected_fields
+
+
+class TestRatingTrendEndpoint:
+    """Tests for GET /courses/{course_id}/ratings/trend"""
+
+    def test_get_trend_success(self, client, mock_course_service):
+        """Test trend is read from rollups for the requested range."""
+        # Arrange
+        mock_course_service.get_course_rating_trend.return_value = [
+            {
+                "bucket_start": "2025-10-14T00:00:00",
+                "submitted_count": 12,
+                "average_rating": 4.25,
+                "removed_count": 1
+            }
+        ]
+
+        # Act
+        response = client.get(
+            "/courses/1/ratings/trend",
+            params={
+                "granularity": "hour",
+                "from": "2025-10-14T00:00:00Z",
+                "to": "2025-10-15T00:00:00Z"
+            }
+        )
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["granularity"] == "hour"
+        assert data["points"][0]["submitted_count"] == 12
+        mock_course_service.get_course_rating_trend.assert_called_once_with(
+            course_id=1,
+            granularity="hour",
+            start=datetime(2025, 10, 14),
+            end=datetime(2025, 10, 15)
+        )
+
+    def test_get_trend_course_not_found(self, client, mock_course_service):
+        """Test unknown or deleted courses return 404 like the other rating routes."""
+        # Arrange
+        mock_course_service.get_course_rating_trend.side_effect = ValueError(
+            "Course with id 999 not found"
+        )
+
+        # Act
+        response = client.get("/courses/999/ratings/trend")
+
+        # Assert
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Course with id 999 not found"}
+
+    def test_get_trend_inverted_range(self, client, mock_course_service):
+        """Test 'from' after 'to' is rejected."""
+        # Act
+        response = client.get(
+            "/courses/1/ratings/trend",
+            params={"from": "2025-10-15", "to": "2025-10-14"}
+        )
+
+        # Assert
+        assert response.status_code == 400
+        mock_course_service.get_course_rating_trend.assert_not_called()
+
+    def test_get_trend_too_many_buckets(self, client, mock_course_service):
+        """Test hourly trends over very long ranges are rejected."""
+        # Act
+        response = client.get(
+            "/courses/1/ratings/trend",
+            params={"granularity": "hour", "from": "2020-01-01", "to": "2025-01-01"}
+        )
+
+        # Assert
+        assert response.status_code == 400
+
+
+class TestBulkRatingStatsEndpoint:
+    """Tests for GET /ratings/stats"""
+
+    def test_get_bulk_stats_success(self, client, mock_course_service):
+        """Test stats for several courses are returned keyed by course id."""
+        # Arrange
+        mock_course_service.get_bulk_rating_stats.return_value = {
+            1: MOCK_RATING_STATS,
+            2: MOCK_RATING_STATS
+        }
+
+        # Act
+        response = client.get("/ratings/stats?course_ids=1,2&course_ids=2")
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data.keys()) == {"1", "2"}
+        assert data["1"]["total_ratings"] == 142
+        mock_course_service.get_bulk_rating_stats.assert_called_once_with([1, 2])
+
+    @pytest.mark.parametrize("course_ids", ["1,abc", "1,²", "1,١"])
+    def test_get_bulk_stats_invalid_id(self, client, mock_course_service, course_ids):
+        """Test non-numeric ids, including non-ASCII digits, are rejected."""
+        # Act
+        response = client.get(f"/ratings/stats?course_ids={course_ids}")
+
+        # Assert
+        assert response.status_code == 400
+        mock_course_service.get_bulk_rating_stats.assert_not_called()
+
+    def test_get_bulk_stats_too_many_ids(self, client, mock_course_service):
+        """Test the number of ids per call is capped."""
+        # Act
+        ids = ",".join(str(i) for i in range(1, 500))
+        response = client.get(f"/ratings/stats?course_ids={ids}")
+
+        # Assert
+        assert response.status_code == 400
+        assert "Too many" in response.json()["detail"]
+
+
+class TestGetUserRatingsEndpoint:
+    """Tests for GET /users/{user_id}/ratings"""
+
+    def test_get_user_ratings_for_courses(self, client, mock_course_service):
+        """Test lookup of a user's ratings for specific courses."""
+        # Arrange
+        mock_course_service.get_user_ratings.return_value = {
+            "items": [MOCK_RATING],
+            "next_cursor": None
+        }
+
+        # Act
+        response = client.get("/users/42/ratings?course_ids=1,2,3")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["items"][0]["course_id"] == 1
+        mock_course_service.get_user_ratings.assert_called_once_with(
+            user_id=42,
+            course_ids=[1, 2, 3]
+        )
+
+    def test_get_user_ratings_paginated(self, client, mock_course_service):
+        """Test paginated variant passes the keyset cursor."""
+        # Arrange
+        mock_course_service.get_user_ratings.return_value = {
+            "items": [MOCK_RATING],
+            "next_cursor": 1
+        }
+
+        # Act
+        response = client.get("/users/42/ratings?after=0&limit=1")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["next_cursor"] == 1
+        mock_course_service.get_user_ratings.assert_called_once_with(
+            user_id=42,
+            after_course_id=0,
+            limit=1
+        )
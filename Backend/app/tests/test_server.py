@@ -0,0 +1,78 @@
+"""
+Tests for the production launcher settings.
+No server is started and no PostgreSQL is required.
+"""
+import os
+
+import pytest
+
+from app.core.config import Settings
+from app.server import ProductionWorker, available_cpus, gunicorn_options, post_fork, worker_count
+
+
+class TestAvailableCpus:
+    """Tests for the CPU count used to size the workers."""
+
+    def test_affinity_without_quota(self, monkeypatch, tmp_path):
+        """Test an unlimited cgroup leaves the affinity mask as is."""
+        # Arrange
+        monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1, 2, 3})
+        cpu_max = tmp_path / "cpu.max"
+        cpu_max.write_text("max 100000\n")
+
+        # Act / Assert
+        assert available_cpus(str(cpu_max)) == 4
+
+    @pytest.mark.parametrize("quota, expected", [("200000 100000", 2), ("150000 100000", 2), ("50000 100000", 1)])
+    def test_quota_caps_cpus(self, monkeypatch, tmp_path, quota, expected):
+        """Test a container CPU quota is rounded up and caps the count."""
+        # Arrange
+        monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(16)))
+        cpu_max = tmp_path / "cpu.max"
+        cpu_max.write_text(quota)
+
+        # Act / Assert
+        assert available_cpus(str(cpu_max)) == expected
+
+    def test_missing_cgroup_file(self, monkeypatch, tmp_path):
+        """Test hosts without cgroup v2 fall back to the affinity mask."""
+        monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1})
+        assert available_cpus(str(tmp_path / "missing")) == 2
+
+
+class TestGunicornOptions:
+    """Tests for the mapping of server_* settings to gunicorn."""
+
+    def test_explicit_workers(self):
+        """Test server_workers overrides the CPU count."""
+        assert worker_count(Settings(server_workers=3)) == 3
+
+    def test_options(self, monkeypatch):
+        """Test bind, preload, keep-alive, backlog and recycling are passed through."""
+        # Arrange
+        monkeypatch.setattr("app.server.available_cpus", lambda: 6)
+        config = Settings(
+            server_host="127.0.0.1",
+            server_port=9000,
+            server_keepalive=90,
+            server_max_requests=500,
+            server_max_requests_jitter=50
+        )
+
+        # Act
+        options = gunicorn_options(config)
+
+        # Assert
+        assert options["bind"] == "127.0.0.1:9000"
+        assert options["workers"] == 6
+        assert options["worker_class"] is ProductionWorker
+        assert options["preload_app"] is True
+        assert options["keepalive"] == 90
+        assert options["backlog"] == 2048
+        assert (options["max_requests"], options["max_requests_jitter"]) == (500, 50)
+        assert options["accesslog"] is None
+        assert options["post_fork"] is post_fork
+
+    def test_worker_uses_uvloop_and_httptools(self):
+        """Test the worker class pins the fast loop and parser."""
+        assert ProductionWorker.CONFIG_KWARGS == {"loop": "uvloop", "http": "httptools"}
@@ -0,0 +1,148 @@
+"""
+Tests for the slow-query recorder.
+Uses an in-memory SQLite engine, no PostgreSQL required.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import app.db.slow_queries as slow_queries
+from app.db.slow_queries import SlowQueryRecorder, fingerprint, parameter_shape
+from app.models.base import Base
+from app.models.course import Course
+from app.services.course_service import CourseService
+
+
+@pytest.fixture
+def engine():
+    """In-memory database with one course."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(Course(id=1, name="Curso", description="d", thumbnail="t", slug="curso"))
+        db.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    """Process-wide recorder replaced by one that records every statement."""
+    recorder = SlowQueryRecorder(threshold_ms=0.000001, capacity=5)
+    monkeypatch.setattr(slow_queries, "slow_query_recorder", recorder)
+    return recorder
+
+
+class TestFingerprint:
+    """Tests for query fingerprints and parameter shapes."""
+
+    def test_fingerprint_ignores_whitespace_and_in_list_length(self):
+        """Test statements differing only in layout or IN-list size match."""
+        # Arrange
+        short = "SELECT * FROM courses WHERE id IN (%(id_1)s)"
+        long = "SELECT *\n  FROM courses WHERE id IN (%(id_1)s, %(id_2)s, %(id_3)s)"
+
+        # Act & Assert
+        assert fingerprint(short) == fingerprint(long)
+        assert fingerprint(short) != fingerprint("SELECT * FROM lessons")
+
+    def test_parameter_shape_hides_values(self):
+        """Test only parameter types are kept."""
+        # Act
+        shape = parameter_shape({"slug": "curso-secreto", "course_id": 1})
+
+        # Assert
+        assert shape == {"slug": "str", "course_id": "int"}
+
+    def test_parameter_shape_executemany(self):
+        """Test executemany parameters are summarized by count and first shape."""
+        # Act
+        shape = parameter_shape([{"id": 1}, {"id": 2}])
+
+        # Assert
+        assert shape == {"rows": 2, "shape": {"id": "int"}}
+
+
+class TestSlowQueryRecorder:
+    """Tests for recording slow statements."""
+
+    def test_records_calling_service_method(self, engine, recorder):
+        """Test entries name the service method that issued the statement."""
+        # Act
+        with sessionmaker(bind=engine)() as db:
+            CourseService(db).get_course_rating_stats(1)
+
+        # Assert
+        entries = recorder.snapshot()["entries"]
+        assert len(entries) == 3
+        assert entries[-1]["service_method"] == "CourseService._ensure_course_exists"
+        assert entries[-1]["call_path"] == [
+            "CourseService.get_course_rating_stats",
+            "CourseService._ensure_course_exists"
+        ]
+        assert entries[-1]["parameters"] == ["int"]  # paramstyle posicional de SQLite
+        assert entries[0]["service_method"] == "CourseService.get_course_rating_stats"
+
+    def test_fast_queries_not_recorded(self, engine, recorder):
+        """Test statements under the threshold are ignored."""
+        # Arrange
+        recorder.configure(threshold_ms=60000, capacity=5)
+
+        # Act
+        with sessionmaker(bind=engine)() as db:
+            CourseService(db).get_course_rating_stats(1)
+
+        # Assert
+        assert recorder.snapshot()["entries"] == []
+
+    def test_ring_buffer_is_bounded(self, recorder):
+        """Test only the newest `capacity` entries are kept, newest first."""
+        # Act
+        for index in range(8):
+            recorder.record(f"SELECT {index}", {}, 500.0)
+
+        # Assert
+        entries = recorder.snapshot()["entries"]
+        assert len(entries) == 5
+        assert entries[0]["sql"] == "SELECT 7"
+
+    def test_explain_runs_once_per_fingerprint(self, engine, recorder):
+        """Test EXPLAIN is captured in the background for new fingerprints only."""
+        # Arrange
+        recorder.configure(threshold_ms=0.000001, capacity=5, explain_engine=engine)
+        calls = []
+        recorder._explain = lambda *args: calls.append(args[1])
+
+        # Act
+        recorder.record("SELECT 1", {}, 500.0, dialect_driver=engine.dialect.driver)
+        recorder.record("SELECT  1", {}, 500.0, dialect_driver=engine.dialect.driver)
+        recorder.record("SELECT 2", {}, 500.0, dialect_driver="asyncpg")
+        recorder._executor.shutdown(wait=True)
+
+        # Assert
+        assert calls == [fingerprint("SELECT 1")]
+
+    def test_explain_failure_is_stored(self, engine, recorder):
+        """Test a failed EXPLAIN stores the error instead of raising."""
+        # Arrange
+        query_id = fingerprint("SELECT 1")
+        recorder.plans[query_id] = None
+
+        # Act (SQLite no soporta la sintaxis EXPLAIN (...) de PostgreSQL)
+        recorder._explain(engine, query_id, "SELECT 1", ())
+
+        # Assert
+        assert "error" in recorder.snapshot()["plans"][query_id]
+
+    def test_disabled_with_zero_threshold(self, engine, recorder):
+        """Test threshold 0 disables recording."""
+        # Arrange
+        recorder.configure(threshold_ms=0, capacity=5)
+
+        # Act
+        with sessionmaker(bind=engine)() as db:
+            CourseService(db).get_course_rating_stats(1)
+
+        # Assert
+        assert recorder.enabled is False
+        assert recorder.snapshot()["entries"] == []
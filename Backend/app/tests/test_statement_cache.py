@@ -0,0 +1,106 @@
+"""
+Tests for prebuilt statements and compiled cache telemetry.
+Uses an in-memory SQLite engine, no PostgreSQL required.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.statement_cache import (
+    StatementCacheStats,
+    instrument_statement_cache,
+    statement_cache_status,
+)
+from app.models.base import Base
+from app.models.course import Course
+from app.services.course_queries import ACTIVE_COURSE_ID, COURSE_RATING_TOTALS
+from app.services.course_service import CourseService
+
+
+@pytest.fixture
+def stats():
+    """Isolated stats so tests don't touch the process-wide counters."""
+    return StatementCacheStats()
+
+
+@pytest.fixture
+def engine(stats):
+    """SQLite engine with one course and instrumented statement cache."""
+    engine = create_engine("sqlite://", query_cache_size=50)
+    instrument_statement_cache(engine, stats)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(Course(id=1, name="Curso", description="d", thumbnail="t", slug="curso"))
+        db.commit()
+    stats.reset()
+    yield engine
+    engine.dispose()
+
+
+class TestStatementCache:
+    """Tests for compiled cache reuse of the prebuilt statements."""
+
+    def test_repeated_statement_hits_cache(self, engine, stats):
+        """Test the same statement with new parameters is compiled once."""
+        # Act
+        with engine.connect() as connection:
+            for course_id in (1, 2, 3):
+                connection.execute(ACTIVE_COURSE_ID, {"course_id": course_id})
+
+        # Assert
+        snapshot = stats.snapshot()
+        assert snapshot["misses"] == 1
+        assert snapshot["hits"] == 2
+        assert snapshot["hit_ratio"] == pytest.approx(2 / 3, abs=1e-4)
+
+    def test_service_stats_reuse_compiled_sql(self, engine, stats):
+        """Test repeated CourseService calls only compile on the first call."""
+        # Arrange
+        with sessionmaker(bind=engine)() as db:
+            service = CourseService(db)
+            service.get_course_rating_stats(1)
+            first_misses = stats.snapshot()["misses"]
+
+            # Act
+            for _ in range(5):
+                service.get_course_rating_stats(1)
+
+        # Assert
+        snapshot = stats.snapshot()
+        assert snapshot["misses"] == first_misses
+        assert snapshot["hits"] >= 15  # 3 sentencias por llamada
+
+    def test_textual_sql_counted_as_uncached(self, engine, stats):
+        """Test statements without a cache key don't skew the hit ratio."""
+        # Act
+        with engine.connect() as connection:
+            connection.exec_driver_sql("SELECT 1")
+
+        # Assert
+        snapshot = stats.snapshot()
+        assert snapshot["uncached"] == 1
+        assert snapshot["hit_ratio"] == 0.0
+
+    def test_status_reports_configured_size(self, engine, stats):
+        """Test status exposes capacity and current entries."""
+        # Arrange
+        with engine.connect() as connection:
+            connection.execute(COURSE_RATING_TOTALS, {"course_id": 1})
+
+        # Act
+        status = statement_cache_status(engine, stats)
+
+        # Assert
+        assert status["size"] == 50
+        assert status["entries"] >= 1
+
+    def test_status_with_cache_disabled(self, stats):
+        """Test query_cache_size=0 reports an empty cache."""
+        # Arrange
+        engine = create_engine("sqlite://", query_cache_size=0)
+
+        # Act
+        status = statement_cache_status(engine, stats)
+
+        # Assert
+        assert status["size"] == 0
+        assert status["entries"] == 0
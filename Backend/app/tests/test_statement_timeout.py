@@ -0,0 +1,149 @@
+"""
+Tests for per-route statement timeouts.
+
+TestStatementTimeoutOnPostgres requires the test database; the rest run
+without PostgreSQL.
+"""
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+from app.db.base import engine as pg_engine
+from app.db.lazy_session import LazySession
+from app.db.statement_timeout import (
+    STATEMENT_TIMEOUT_KEY,
+    StatementTimeouts,
+    StatementTimeoutStats,
+    is_query_canceled,
+    route_path,
+)
+
+
+class FakeDriverError(Exception):
+    def __init__(self, pgcode):
+        super().__init__("canceling statement due to statement timeout")
+        self.pgcode = pgcode
+
+
+def _scope(path):
+    return {"path": path.replace("{slug}", "curso"), "route": SimpleNamespace(path=path)}
+
+
+class TestStatementTimeouts:
+    """Tests for timeout lookup and session tagging."""
+
+    def test_route_override_and_default(self):
+        """Test routes use their own timeout or fall back to the default."""
+        # Arrange
+        timeouts = StatementTimeouts(default_ms=5000, routes={"/courses/{slug}": 200})
+
+        # Act & Assert
+        assert timeouts.for_route("/courses/{slug}") == 200
+        assert timeouts.for_route("/courses") == 5000
+
+    def test_apply_sets_lazy_session_info(self):
+        """Test the timeout is stored without creating the session."""
+        # Arrange
+        db = LazySession(sessionmaker(bind=create_engine("sqlite://")))
+        timeouts = StatementTimeouts(routes={"/courses/{slug}": 200})
+
+        # Act
+        timeouts.apply(db, _scope("/courses/{slug}"))
+
+        # Assert
+        assert db.info[STATEMENT_TIMEOUT_KEY] == 200
+        assert db.created is False
+
+    def test_apply_without_timeout_leaves_info_untouched(self):
+        """Test routes without a timeout don't tag the session."""
+        # Arrange
+        db = LazySession(sessionmaker(bind=create_engine("sqlite://")))
+
+        # Act
+        StatementTimeouts(default_ms=0).apply(db, _scope("/courses"))
+
+        # Assert
+        assert STATEMENT_TIMEOUT_KEY not in db.info
+
+    def test_route_path_falls_back_to_path(self):
+        """Test unmatched requests are reported by their raw path."""
+        # Act & Assert
+        assert route_path({"path": "/missing"}) == "/missing"
+
+    def test_sqlite_sessions_skip_set_local(self):
+        """Test the SET LOCAL is only issued on PostgreSQL connections."""
+        # Arrange
+        session = Session(bind=create_engine("sqlite://"), info={STATEMENT_TIMEOUT_KEY: 100})
+
+        # Act & Assert
+        assert session.execute(text("SELECT 1")).scalar() == 1
+        session.close()
+
+
+class TestQueryCanceled:
+    """Tests for recognizing statement_timeout cancellations."""
+
+    def test_query_canceled_sqlstate(self):
+        """Test SQLSTATE 57014 is a cancellation."""
+        # Arrange
+        error = OperationalError("SELECT 1", {}, FakeDriverError("57014"))
+
+        # Act & Assert
+        assert is_query_canceled(error) is True
+
+    def test_other_database_errors(self):
+        """Test other SQLSTATEs and non-DBAPI errors are not cancellations."""
+        # Arrange
+        error = OperationalError("SELECT 1", {}, FakeDriverError("08006"))
+
+        # Act & Assert
+        assert is_query_canceled(error) is False
+        assert is_query_canceled(ValueError("x")) is False
+
+    def test_stats_count_per_route(self):
+        """Test cancellations are counted per route."""
+        # Arrange
+        stats = StatementTimeoutStats()
+
+        # Act
+        stats.record_cancel("/courses/{slug}")
+        stats.record_cancel("/courses/{slug}")
+        stats.record_cancel("/courses")
+
+        # Assert
+        assert stats.snapshot() == {
+            "cancelled_total": 3,
+            "cancelled": {"/courses/{slug}": 2, "/courses": 1},
+        }
+
+
+class TestStatementTimeoutOnPostgres:
+    """SET LOCAL statement_timeout against the test database."""
+
+    def test_slow_statement_is_cancelled(self):
+        """Test a statement over the session timeout is cancelled."""
+        # Arrange
+        session = Session(bind=pg_engine, info={STATEMENT_TIMEOUT_KEY: 50})
+
+        # Act
+        with pytest.raises(DBAPIError) as error:
+            session.execute(text("SELECT pg_sleep(1)"))
+        session.close()
+
+        # Assert
+        assert is_query_canceled(error.value)
+
+    def test_timeout_does_not_leak_to_pooled_connection(self):
+        """Test the timeout ends with the transaction (SET LOCAL)."""
+        # Arrange
+        with Session(bind=pg_engine, info={STATEMENT_TIMEOUT_KEY: 50}) as session:
+            inside = session.execute(text("SHOW statement_timeout")).scalar()
+
+        # Act
+        with pg_engine.connect() as connection:
+            after = connection.exec_driver_sql("SHOW statement_timeout").scalar()
+
+        # Assert
+        assert inside == "50ms"
+        assert after == "0"
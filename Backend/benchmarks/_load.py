@@ -0,0 +1,125 @@
+"""
+Shared helpers for the HTTP benchmarks: server launcher and load generator.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class LoadResult:
+    label: str
+    requests: int = 0
+    errors: int = 0
+    duration: float = 0.0
+    latencies_ms: List[float] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def row(self) -> str:
+        return (
+            f"{self.label:<28} {self.throughput:>10.1f} req/s"
+            f"  p50 {self.percentile(50):>8.1f} ms"
+            f"  p99 {self.percentile(99):>8.1f} ms"
+            f"  errors {self.errors}"
+        )
+
+
+@contextmanager
+def run_server(
+    command: List[str],
+    port: int,
+    env: Optional[Dict[str, str]] = None,
+    startup_timeout: float = 30.0
+) -> Iterator[str]:
+    """Start a server process from the Backend dir and wait until it answers."""
+    process = subprocess.Popen(
+        command,
+        cwd=BACKEND_DIR,
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                httpx.get(f"{base_url}/", timeout=1.0)
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError(f"Server did not start: {' '.join(command)}")
+                time.sleep(0.2)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def uvicorn_command(port: int, *extra: str) -> List[str]:
+    return [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning", *extra]
+
+
+async def _drive(
+    label: str,
+    url: str,
+    concurrency: int,
+    duration: float,
+    headers: Optional[Dict[str, str]] = None
+) -> LoadResult:
+    result = LoadResult(label=label)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(limits=limits, timeout=30.0, headers=headers) as client:
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code >= 400:
+                        result.errors += 1
+                except httpx.HTTPError:
+                    result.errors += 1
+                result.requests += 1
+                result.latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        result.duration = time.perf_counter() - started
+
+    return result
+
+
+def drive(
+    label: str,
+    url: str,
+    concurrency: int,
+    duration: float,
+    headers: Optional[Dict[str, str]] = None
+) -> LoadResult:
+    """Keep `concurrency` clients busy against url for `duration` seconds."""
+    return asyncio.run(_drive(label, url, concurrency, duration, headers))
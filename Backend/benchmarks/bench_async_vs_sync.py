@@ -0,0 +1,50 @@
+"""
+Throughput and latency of the sync handlers vs the async (asyncpg) handlers.
+
+Starts the API twice, once with ASYNC_ENDPOINTS=false and once with
+ASYNC_ENDPOINTS=true, and drives both with the same number of concurrent
+clients. Requires a migrated and seeded database reachable through
+DATABASE_URL.
+
+Usage (from Backend/):
+    python benchmarks/bench_async_vs_sync.py --concurrency 500 --duration 20
+    python benchmarks/bench_async_vs_sync.py --path /courses/curso-de-react
+
+Give both engines the same pool budget (DB_POOL_SIZE / DB_MAX_OVERFLOW) so
+only the execution model differs.
+
+Expect the sync run to report timeouts once concurrency exceeds the pool:
+get_db() is a sync generator, so db.close() needs a free threadpool thread
+(40 by default) while those threads are blocked in handlers waiting for a
+connection. Requests then fail after DB_POOL_TIMEOUT. The async path does
+not use the threadpool and degrades by queueing instead. Keep the total of
+both pools below the server's max_connections.
+"""
+import argparse
+
+from _load import drive, run_server, uvicorn_command
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="/courses")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    results = []
+    for label, async_enabled in (("sync def (threadpool)", "false"), ("async def (asyncpg)", "true")):
+        with run_server(uvicorn_command(args.port), args.port, env={"ASYNC_ENDPOINTS": async_enabled}) as base_url:
+            url = f"{base_url}{args.path}"
+            drive(label, url, args.concurrency, args.warmup)
+            results.append(drive(label, url, args.concurrency, args.duration))
+
+    print(f"\nGET {args.path} - {args.concurrency} concurrent clients, {args.duration:.0f}s")
+    for result in results:
+        print(result.row())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+CPU time per request of the hot CourseService reads, with and without the
+compiled statement cache.
+
+Runs in-process (no HTTP): each iteration opens a session, calls the
+service method and closes the session, like one request does. CPU time is
+measured with time.process_time(), so time spent waiting on PostgreSQL is
+excluded and what remains is statement construction, compilation, driver
+and ORM work. Requires a migrated and seeded database reachable through
+DATABASE_URL.
+
+Usage (from Backend/):
+    python benchmarks/bench_cpu_per_request.py --iterations 2000
+    python benchmarks/bench_cpu_per_request.py --cache-sizes 0 50 500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.statement_cache import (  # noqa: E402
+    StatementCacheStats,
+    instrument_statement_cache,
+)
+from app.services.course_service import CourseService  # noqa: E402
+
+
+SCENARIOS = {
+    "GET /courses": lambda service, course: service.get_all_courses(),
+    "GET /courses/{slug}": lambda service, course: service.get_course_by_slug(course["slug"]),
+    "GET /courses/{id}/ratings/stats": lambda service, course: service.get_course_rating_stats(course["id"]),
+}
+
+
+def measure(cache_size: int, iterations: int) -> None:
+    engine = create_engine(settings.database_url, query_cache_size=cache_size)
+    stats = StatementCacheStats()
+    instrument_statement_cache(engine, stats)
+    Session = sessionmaker(bind=engine)
+
+    with Session() as db:
+        course = CourseService(db).get_all_courses()[0]
+
+    for name, call in SCENARIOS.items():
+        # Calentamiento: conexiones abiertas y (si hay caché) SQL compilado
+        for _ in range(20):
+            with Session() as db:
+                call(CourseService(db), course)
+        stats.reset()
+
+        start = time.process_time()
+        for _ in range(iterations):
+            with Session() as db:
+                call(CourseService(db), course)
+        cpu_us = (time.process_time() - start) / iterations * 1_000_000
+
+        snapshot = stats.snapshot()
+        print(
+            f"cache={cache_size:<5} {name:<32} {cpu_us:>9.1f} us CPU/request"
+            f"  hit_ratio {snapshot['hit_ratio']:.3f}"
+        )
+
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--cache-sizes", type=int, nargs="+", default=[0, settings.db_query_cache_size])
+    args = parser.parse_args()
+
+    for cache_size in args.cache_sizes:
+        measure(cache_size, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
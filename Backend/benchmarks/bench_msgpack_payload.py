@@ -0,0 +1,158 @@
+"""
+Payload size and server encode time: JSON vs MessagePack.
+
+Drives the real handlers of GET /courses, GET /courses/{slug} and
+GET /courses/{course_id}/ratings through TestClient, once with the default
+Accept header and once with `Accept: application/msgpack`. The
+CourseService is a stub returning generated rows, so no database is
+needed.
+
+For each endpoint and format it reports:
+- bytes: raw body size, and the size after brotli/gzip (what travels when
+  the client sends Accept-Encoding).
+- encode ms: CPU time of render() alone on the same content.
+- request ms: CPU time per request (routing, validation, rendering).
+
+Usage (from Backend/):
+    python benchmarks/bench_msgpack_payload.py --courses 200 --ratings 200 --iterations 200
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import brotli  # noqa: E402
+import msgpack  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.negotiation import (  # noqa: E402
+    MSGPACK_MEDIA_TYPE,
+    NegotiatedJSONResponse,
+    NegotiatedORJSONResponse,
+    response_media_type,
+)
+from app.main import app, get_course_service  # noqa: E402
+from app.services.course_service import CourseService  # noqa: E402
+
+FORMATS = {"json": "application/json", "msgpack": MSGPACK_MEDIA_TYPE}
+
+
+def make_courses(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": index,
+            "name": f"Curso de tecnología {index}",
+            "description": "Aprende desde cero con proyectos prácticos " * 3,
+            "thumbnail": f"https://cdn.platziflix.com/thumbnails/{index}.png",
+            "slug": f"curso-de-tecnologia-{index}",
+            "average_rating": round(3 + index % 20 / 10, 2),
+            "total_ratings": index * 7,
+        }
+        for index in range(1, count + 1)
+    ]
+
+
+def make_course_detail(classes: int) -> Dict[str, Any]:
+    return {
+        **make_courses(1)[0],
+        "teacher_id": [1, 2],
+        "rating_distribution": {str(star): star * 3 for star in range(1, 6)},
+        "classes": [
+            {
+                "id": index,
+                "name": f"Clase {index}",
+                "description": "Conceptos y práctica guiada",
+                "slug": f"clase-{index}",
+            }
+            for index in range(1, classes + 1)
+        ],
+    }
+
+
+def make_ratings(count: int) -> List[Dict[str, Any]]:
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "id": index,
+            "course_id": 1,
+            "user_id": index,
+            "rating": index % 5 + 1,
+            "created_at": start + timedelta(seconds=index),
+            "updated_at": start + timedelta(seconds=index),
+        }
+        for index in range(1, count + 1)
+    ]
+
+
+def cpu_ms(call: Callable[[], Any], iterations: int) -> float:
+    call()
+    start = time.process_time()
+    for _ in range(iterations):
+        call()
+    return (time.process_time() - start) * 1000 / iterations
+
+
+def render_ms(response_class, content: Any, media_type: str, iterations: int) -> float:
+    token = response_media_type.set(media_type)
+    try:
+        return cpu_ms(lambda: response_class(content), iterations)
+    finally:
+        response_media_type.reset(token)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--classes", type=int, default=30)
+    parser.add_argument("--ratings", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    courses = make_courses(args.courses)
+    ratings = make_ratings(args.ratings)
+    service = Mock(spec=CourseService)
+    service.get_all_courses.return_value = courses
+    service.get_course_by_slug.return_value = make_course_detail(args.classes)
+    service.get_course_ratings.return_value = {"items": ratings, "next_cursor": None, "total": None}
+    app.dependency_overrides[get_course_service] = lambda: service
+    client = TestClient(app)
+
+    endpoints = [
+        ("/courses", NegotiatedJSONResponse, courses),
+        ("/courses/curso-de-tecnologia-1", NegotiatedJSONResponse, service.get_course_by_slug.return_value),
+        ("/courses/1/ratings", NegotiatedORJSONResponse, ratings),
+    ]
+
+    print(
+        f"{'endpoint':<32} {'format':<8} {'bytes':>8} {'br':>7} {'gzip':>7} "
+        f"{'encode ms':>10} {'request ms':>11}"
+    )
+    for path, response_class, content in endpoints:
+        bodies = {}
+        for name, media_type in FORMATS.items():
+            headers = {"Accept": media_type, "Accept-Encoding": "identity"}
+            body = client.get(path, headers=headers).content
+            bodies[name] = body
+            encode = render_ms(response_class, content, media_type, args.iterations)
+            request = cpu_ms(lambda: client.get(path, headers=headers), args.iterations)
+            print(
+                f"{path[:32]:<32} {name:<8} {len(body):>8} "
+                f"{len(brotli.compress(body, quality=11)):>7} {len(gzip.compress(body, 6)):>7} "
+                f"{encode:>10.3f} {request:>11.3f}"
+            )
+
+        # Ambos formatos deben decodificar al mismo contenido
+        assert msgpack.unpackb(bodies["msgpack"]) == json.loads(bodies["json"]), path
+
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Memory and CPU per call of the course rating listing: ORM entities versus
+column tuples.
+
+- orm: select(CourseRating) hydrated into the identity map, then
+  to_dict() per entity (the previous CourseService.get_course_ratings).
+- rows: COURSE_RATING_ROWS tuples formatted by rating_rows_as_dicts
+  (the current implementation, here without the page limit).
+
+A temporary course with --ratings active ratings is inserted in a
+transaction that is rolled back at the end. Peak memory is measured with
+tracemalloc around one call (including the session's identity map) and
+CPU with time.process_time(). Requires a migrated database reachable
+through DATABASE_URL.
+
+The rolled-back rows stay behind as dead tuples until (auto)vacuum runs;
+run `VACUUM ANALYZE course_ratings` afterwards before app/tests/test_query_plans.py,
+which expects index-only scans.
+
+Usage (from Backend/):
+    python benchmarks/bench_rating_listing.py --ratings 50000 --iterations 10
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.models.course import Course  # noqa: E402
+from app.models.course_rating import CourseRating  # noqa: E402
+from app.services.course_queries import COURSE_RATING_ROWS, rating_rows_as_dicts  # noqa: E402
+
+
+def list_orm(db: Session, course_id: int) -> list:
+    ratings = db.execute(
+        select(CourseRating)
+        .where(CourseRating.course_id == course_id, CourseRating.deleted_at.is_(None))
+        .order_by(CourseRating.created_at.desc())
+    ).scalars().all()
+    return [rating.to_dict() for rating in ratings]
+
+
+def list_rows(db: Session, course_id: int) -> list:
+    rows = db.execute(COURSE_RATING_ROWS, {"course_id": course_id}).all()
+    return rating_rows_as_dicts(rows)
+
+
+VARIANTS = {"orm": list_orm, "rows": list_rows}
+
+
+def measure(connection, course_id: int, ratings: int, iterations: int) -> None:
+    print(f"{'variant':<8} {'peak MiB':>10} {'bytes/row':>10} {'cpu ms/call':>12}")
+    for name, call in VARIANTS.items():
+        # Memoria: una llamada con la sesión viva hasta tomar el pico
+        gc.collect()
+        tracemalloc.start()
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        result = call(db, course_id)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(result) == ratings
+        db.close()
+        del result
+
+        start = time.process_time()
+        for _ in range(iterations):
+            with Session(bind=connection, join_transaction_mode="create_savepoint") as db:
+                call(db, course_id)
+        cpu_ms = (time.process_time() - start) * 1000 / iterations
+
+        print(f"{name:<8} {peak / 2**20:>10.1f} {peak / ratings:>10.0f} {cpu_ms:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ratings", type=int, default=50000)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    engine = create_engine(settings.database_url)
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            course_id = connection.execute(
+                insert(Course)
+                .values(name="Bench", description="Bench", thumbnail="t", slug="bench-rating-listing")
+                .returning(Course.id)
+            ).scalar_one()
+            connection.execute(
+                insert(CourseRating),
+                [
+                    {"course_id": course_id, "user_id": user_id, "rating": user_id % 5 + 1}
+                    for user_id in range(1, args.ratings + 1)
+                ]
+            )
+            measure(connection, course_id, args.ratings, args.iterations)
+        finally:
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
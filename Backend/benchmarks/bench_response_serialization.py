@@ -0,0 +1,103 @@
+"""
+CPU cost of serializing a 10k-rating list response.
+
+Compares three ways of answering GET /courses/{course_id}/ratings with the
+same service rows (dicts shaped like CourseRating.to_dict()):
+
+- models: RatingResponse(**row) per row, then FastAPI validates and
+  serializes again through response_model (the previous handler).
+- adapter: one precompiled TypeAdapter(List[RatingResponse]) validating
+  and serializing to bytes in pydantic-core.
+- orjson: rows serialized straight to bytes (the current handler).
+
+Each variant is a real FastAPI route driven with TestClient, so routing
+and response building are included; the service is a stub, so no
+database is needed. CPU time is measured with time.process_time().
+
+Usage (from Backend/):
+    python benchmarks/bench_response_serialization.py --rows 10000 --iterations 50
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Response  # noqa: E402
+from fastapi.responses import ORJSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.schemas.rating import RatingResponse  # noqa: E402
+
+
+def make_rows(count: int) -> List[dict]:
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "id": index,
+            "course_id": 1,
+            "user_id": index,
+            "rating": index % 5 + 1,
+            "created_at": (start + timedelta(seconds=index)).isoformat(),
+            "updated_at": (start + timedelta(seconds=index)).isoformat(),
+        }
+        for index in range(1, count + 1)
+    ]
+
+
+def build_app(rows: List[dict]) -> FastAPI:
+    app = FastAPI()
+    rating_list = TypeAdapter(List[RatingResponse])
+
+    @app.get("/models", response_model=List[RatingResponse])
+    def models() -> List[RatingResponse]:
+        return [RatingResponse(**row) for row in rows]
+
+    @app.get("/adapter", response_model=List[RatingResponse])
+    def adapter() -> Response:
+        return Response(
+            rating_list.dump_json(rating_list.validate_python(rows)),
+            media_type="application/json"
+        )
+
+    @app.get("/orjson", response_model=List[RatingResponse])
+    def orjson_rows() -> ORJSONResponse:
+        return ORJSONResponse(rows)
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    client = TestClient(build_app(rows))
+
+    baseline = None
+    print(f"{'variant':<10} {'cpu ms/request':>15} {'vs models':>10} {'bytes':>10}")
+    for variant in ("models", "adapter", "orjson"):
+        # Calentamiento y verificación de que los tres cuerpos son equivalentes
+        body = client.get(f"/{variant}").json()
+        assert body == rows, variant
+
+        start = time.process_time()
+        for _ in range(args.iterations):
+            response = client.get(f"/{variant}")
+        cpu_ms = (time.process_time() - start) * 1000 / args.iterations
+
+        baseline = baseline or cpu_ms
+        print(
+            f"{variant:<10} {cpu_ms:>15.2f} {cpu_ms / baseline:>9.0%} "
+            f"{len(response.content):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Throughput and latency: the old Docker command vs the production launcher.
+
+Starts the API with `uvicorn app.main:app --reload` (one process with a
+file watcher and access logs, what the Dockerfile used to run) and then
+with `python -m app.server` (gunicorn + uvloop/httptools uvicorn workers,
+preloaded app) for each requested worker count, and drives every server
+with the same number of concurrent clients. Requires a migrated and seeded
+database reachable through DATABASE_URL.
+
+Usage (from Backend/):
+    python benchmarks/bench_server.py --concurrency 200 --duration 20
+    python benchmarks/bench_server.py --workers 1 4 8 --path /courses/curso-de-react
+
+--workers 0 means the launcher's default (one per available CPU). Keep
+workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) below the server's
+max_connections, and run the load generator on other cores than the API
+when possible, or both compete for the same CPUs.
+"""
+import argparse
+import sys
+
+from _load import drive, run_server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="/courses")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0])
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    runs = [(
+        "uvicorn --reload",
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--reload"],
+        {},
+    )]
+    for workers in args.workers:
+        runs.append((
+            f"app.server, {workers or 'auto'} workers",
+            [sys.executable, "-m", "app.server"],
+            {"SERVER_HOST": "127.0.0.1", "SERVER_PORT": str(args.port), "SERVER_WORKERS": str(workers)},
+        ))
+
+    results = []
+    for label, command, env in runs:
+        with run_server(command, args.port, env=env) as base_url:
+            url = f"{base_url}{args.path}"
+            drive(label, url, args.concurrency, args.warmup)
+            results.append(drive(label, url, args.concurrency, args.duration))
+
+    print(f"\nGET {args.path} - {args.concurrency} concurrent clients, {args.duration:.0f}s")
+    for result in results:
+        print(result.row())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Thundering herd on a cold catalog cache: with vs without single-flight.
+
+Simulates the moment the "courses" entry expires under load: N callers
+hit GET /courses' service method at once against an empty cache, each
+with its own database session, first with coalescing disabled (every
+miss runs the query path) and then with the default single-flight.
+Runs both the threadpool path (CourseService, one thread per caller) and
+the event-loop path (AsyncCourseService, one task per caller). Requires a
+migrated and seeded database reachable through DATABASE_URL.
+
+For each run it reports wall time, per-caller latency, how many times the
+loader ran and how many SQL statements reached the database.
+
+Usage (from Backend/):
+    python benchmarks/bench_thundering_herd.py --callers 200 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+
+from app.core.cache import LocalCache, TwoTierCache  # noqa: E402
+from app.db.base import AsyncSessionLocal, SessionLocal, async_engine, engine  # noqa: E402
+from app.services.async_course_service import AsyncCourseService  # noqa: E402
+from app.services.course_service import CourseService  # noqa: E402
+
+
+class NoFlight:
+    """Coalescing disabled: every caller runs its own load."""
+
+    def do(self, key, fn):
+        return fn()
+
+    def __len__(self):
+        return 0
+
+
+class AsyncNoFlight(NoFlight):
+    async def do(self, key, fn):
+        return await fn()
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def __call__(self, *args) -> None:
+        with self._lock:
+            self.count += 1
+
+
+def cold_cache(coalesce: bool) -> TwoTierCache:
+    cache = TwoTierCache(LocalCache(4096), ttls={"courses": 30, "rating_stats": 30})
+    if not coalesce:
+        cache.flights = NoFlight()
+        cache.async_flights = AsyncNoFlight()
+    return cache
+
+
+def run_sync(cache: TwoTierCache, callers: int) -> List[float]:
+    barrier = threading.Barrier(callers)
+
+    def call() -> float:
+        db = SessionLocal()
+        try:
+            barrier.wait()
+            start = time.perf_counter()
+            CourseService(db, cache=cache).get_all_courses()
+            return (time.perf_counter() - start) * 1000
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        return list(executor.map(lambda _: call(), range(callers)))
+
+
+async def run_async(cache: TwoTierCache, callers: int) -> List[float]:
+    ready = asyncio.Event()
+
+    async def call() -> float:
+        async with AsyncSessionLocal() as db:
+            await ready.wait()
+            start = time.perf_counter()
+            await AsyncCourseService(db, cache=cache).get_all_courses()
+            return (time.perf_counter() - start) * 1000
+
+    tasks = [asyncio.ensure_future(call()) for _ in range(callers)]
+    await asyncio.sleep(0)
+    ready.set()
+    return await asyncio.gather(*tasks)
+
+
+def measure(label: str, run: Callable[[TwoTierCache], List[float]], coalesce: bool, rounds: int) -> Tuple:
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    latencies: List[float] = []
+    loads = walls = 0.0
+    try:
+        for _ in range(rounds):
+            cache = cold_cache(coalesce)
+            start = time.perf_counter()
+            latencies.extend(run(cache))
+            walls += (time.perf_counter() - start) * 1000
+            loads += cache.stats.loads
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+        event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+    ordered = sorted(latencies)
+    return (
+        label,
+        walls / rounds,
+        statistics.median(ordered),
+        ordered[int(0.99 * (len(ordered) - 1))],
+        loads / rounds,
+        counter.count / rounds,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--callers", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    runs = [
+        ("sync, no coalescing", lambda cache: run_sync(cache, args.callers), False),
+        ("sync, single-flight", lambda cache: run_sync(cache, args.callers), True),
+        ("async, no coalescing", lambda cache: loop.run_until_complete(run_async(cache, args.callers)), False),
+        ("async, single-flight", lambda cache: loop.run_until_complete(run_async(cache, args.callers)), True),
+    ]
+    # Calentar pools y planes antes de medir
+    measure("warmup", runs[1][1], True, 1)
+    measure("warmup", runs[3][1], True, 1)
+
+    rows = [measure(label, run, coalesce, args.rounds) for label, run, coalesce in runs]
+    loop.run_until_complete(async_engine.dispose())
+    loop.close()
+
+    print(f"\nCold 'courses' cache, {args.callers} concurrent callers, mean of {args.rounds} rounds")
+    print(f"{'':<22} {'wall ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'loads':>8} {'queries':>9}")
+    for label, wall, p50, p99, loads, queries in rows:
+        print(f"{label:<22} {wall:>9.1f} {p50:>9.1f} {p99:>9.1f} {loads:>8.1f} {queries:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()